@@ -1,40 +1,44 @@
-from multiversx_sdk.network_providers.proxy_network_provider import ProxyNetworkProvider
-
-PROXY_PUBLIC_TESTNET = "https://testnet-gateway.multiversx.com"
-PROXY_PUBLIC_DEVNET = "https://devnet-gateway.multiversx.com"
-PROXY_DO_AMS = "http://188.166.13.136:8080"
-PROXY_OVH_P03 = "http://51.89.62.133:8080"
-PROXY_OVH_P04 = "http://51.89.62.131:8080"
-PROXY_OVH_P06 = "http://51.89.16.187:8080"
-PROXY_MVX_FRA = "http://49.51.171.106:8080"
-
-PROXY_CHAIN_SIMULATOR = "http://localhost:8085"
-
-
-# Change this for other network
-PROXY_URL = PROXY_CHAIN_SIMULATOR
-DEFAULT_PROXY = PROXY_CHAIN_SIMULATOR
-# Get Chain ID
-provider = ProxyNetworkProvider(PROXY_URL)
-# CHAIN_ID = "1" # Internal Test Network
-CHAIN_ID = "chain"  # Chain Simulator
-
-
-# TEMP
-OBSERVER_META = "http://localhost:55802"
-
-try:
-    proxy_default = ProxyNetworkProvider(DEFAULT_PROXY)
-except:
-    Exception
-
-# config for cli flags for starting chain simulator
+from config.settings import NETWORK_PROFILES, LazyProvider, settings
+from config.topology import DEFAULT_TOPOLOGY, TOPOLOGY_PROFILES
+
+PROXY_PUBLIC_TESTNET = NETWORK_PROFILES["testnet"].proxy_url
+PROXY_PUBLIC_DEVNET = NETWORK_PROFILES["devnet"].proxy_url
+PROXY_DO_AMS = NETWORK_PROFILES["do-ams"].proxy_url
+PROXY_OVH_P03 = NETWORK_PROFILES["ovh-p03"].proxy_url
+PROXY_OVH_P04 = NETWORK_PROFILES["ovh-p04"].proxy_url
+PROXY_OVH_P06 = NETWORK_PROFILES["ovh-p06"].proxy_url
+PROXY_MVX_FRA = NETWORK_PROFILES["mvx-fra"].proxy_url
+
+PROXY_CHAIN_SIMULATOR = NETWORK_PROFILES["simulator"].proxy_url
+
+# The network is selected through config.settings (NETWORK=<profile>, settings.json
+# or --network); PROXY_URL, DEFAULT_PROXY, OBSERVER_META and CHAIN_ID are read
+# from it when first imported.
+_settings_attributes = {
+    "PROXY_URL": "proxy_url",
+    "DEFAULT_PROXY": "proxy_url",
+    "OBSERVER_META": "observer_url",
+    "CHAIN_ID": "chain_id",
+}
+
+# built on first use
+provider = LazyProvider()
+proxy_default = LazyProvider()
+
+# config for cli flags for starting chain simulator; the node layout comes from
+# the topology profiles in config.topology, these are the default profile values
 log_level = '"*:DEBUG,process:TRACE"'
-num_validators_per_shard = "10"
-num_validators_meta = "10"
-num_waiting_validators_per_shard = "6"
-num_waiting_validators_meta = "6"
-# real config after staking v4 full activation: eligible = 10 *4 , waiting = (6-2) *4, qualified =  2*4
-# qualified nodes from auction will stay in wiating 2 epochs
-
-rounds_per_epoch = "50"
+_default_topology = TOPOLOGY_PROFILES[DEFAULT_TOPOLOGY]
+num_validators_per_shard = str(_default_topology.num_validators_per_shard)
+num_validators_meta = str(_default_topology.num_validators_meta)
+num_waiting_validators_per_shard = str(
+    _default_topology.num_waiting_validators_per_shard
+)
+num_waiting_validators_meta = str(_default_topology.num_waiting_validators_meta)
+rounds_per_epoch = str(_default_topology.rounds_per_epoch)
+
+
+def __getattr__(name):
+    if name in _settings_attributes:
+        return getattr(settings, _settings_attributes[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
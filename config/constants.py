@@ -1,32 +1,11 @@
 import os
 
-# Chain Simulator Environment variable or default path
-chain_simulator_build_path = os.getenv("CHAIN_SIMULATOR_BUILD_PATH")
-if chain_simulator_build_path:
-    chain_simulator_build_path = os.path.expanduser(chain_simulator_build_path)
-
-if (
-    chain_simulator_build_path
-    and os.path.exists(chain_simulator_build_path)
-    and os.listdir(chain_simulator_build_path)
-):
-    CHAIN_SIMULATOR_FOLDER = chain_simulator_build_path
-else:
-    # Fallback to another specific path
-    specific_path = os.path.expanduser(
-        "~/multiversX/mx-chain-simulator-go/cmd/chainsimulator"
-    )
-    if os.path.exists(specific_path) and os.listdir(specific_path):
-        CHAIN_SIMULATOR_FOLDER = specific_path
-    else:
-        raise ValueError(
-            "Both CHAIN_SIMULATOR_BUILD_PATH and the fallback path are invalid or empty"
-        )
-
 # Project Paths
 PROJECT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 WALLETS_FOLDER = os.path.join(PROJECT_FOLDER, "data", "wallets")
 VALIDATOR_KEYS_FOLDER = os.path.join(PROJECT_FOLDER, "data", "validator_keys")
+CASSETTES_FOLDER = os.path.join(PROJECT_FOLDER, "data", "cassettes")
+FUZZ_CORPUS_FOLDER = os.path.join(PROJECT_FOLDER, "data", "fuzz_corpus")
 # contracts
 VALIDATOR_CONTRACT = "erd1qqqqqqqqqqqqqqqpqqqqqqqqqqqqqqqqqqqqqqqqqqqqqqqplllst77y4l"
 SYSTEM_DELEGATION_MANAGER_CONTRACT = (
@@ -42,8 +21,30 @@ WAIT_UNTIL_API_REQUEST_IN_SEC = 0.5
 # chain
 MAX_NUM_OF_BLOCKS_UNTIL_TX_SHOULD_BE_EXECUTED = 20
 
+# bulk sending
+TX_BATCH_SIZE = 100
+MAX_CONCURRENT_REQUESTS = 16
+ADD_KEYS_BATCH_SIZE = 100
+# fitted gas limit = estimated gas units * margin
+GAS_LIMIT_MARGIN = 1.1
+
 # staking_v4
 EPOCH_WITH_STAKING_V3_5 = 3
 EPOCH_STAKING_QUEUE_BECOMES_AUCTION_LIST = 4
 EPOCH_SHUFFLING_FROM_ELIGIBLE_TO_AUCTION_LIST = 5
 EPOCH_STAKING_V4_FULLY_FUNCTIONAL = 6
+NODE_PRICE = 2500 * 10**18
+# soft auction config of the system smart contracts
+SOFT_AUCTION_TOP_UP_STEP = 10 * 10**18
+SOFT_AUCTION_MIN_TOP_UP = 1 * 10**18
+SOFT_AUCTION_MAX_TOP_UP = 32_000_000 * 10**18
+SOFT_AUCTION_MAX_ITERATIONS = 100_000
+
+
+def __getattr__(name):
+    # resolved on access, so importing the constants never touches the filesystem
+    if name == "CHAIN_SIMULATOR_FOLDER":
+        from config.settings import settings
+
+        return settings.chain_simulator_folder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
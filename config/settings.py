@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from multiversx_sdk.network_providers.proxy_network_provider import ProxyNetworkProvider
+
+from config.constants import PROJECT_FOLDER
+from config.topology import DEFAULT_TOPOLOGY
+
+DEFAULT_SETTINGS_FILE = os.path.join(PROJECT_FOLDER, "settings.json")
+DEFAULT_CHAIN_SIMULATOR_FOLDER = "~/multiversX/mx-chain-simulator-go/cmd/chainsimulator"
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    proxy_url: str
+    observer_url: str
+    chain_id: str
+
+
+NETWORK_PROFILES = {
+    "simulator": NetworkProfile(
+        "http://localhost:8085", "http://localhost:55802", "chain"
+    ),
+    "testnet": NetworkProfile(
+        "https://testnet-gateway.multiversx.com",
+        "https://testnet-gateway.multiversx.com",
+        "T",
+    ),
+    "devnet": NetworkProfile(
+        "https://devnet-gateway.multiversx.com",
+        "https://devnet-gateway.multiversx.com",
+        "D",
+    ),
+    # internal test network proxies
+    "do-ams": NetworkProfile(
+        "http://188.166.13.136:8080", "http://188.166.13.136:8080", "1"
+    ),
+    "ovh-p03": NetworkProfile(
+        "http://51.89.62.133:8080", "http://51.89.62.133:8080", "1"
+    ),
+    "ovh-p04": NetworkProfile(
+        "http://51.89.62.131:8080", "http://51.89.62.131:8080", "1"
+    ),
+    "ovh-p06": NetworkProfile(
+        "http://51.89.16.187:8080", "http://51.89.16.187:8080", "1"
+    ),
+    "mvx-fra": NetworkProfile(
+        "http://49.51.171.106:8080", "http://49.51.171.106:8080", "1"
+    ),
+}
+
+# setting name -> environment variable
+_ENV_VARIABLES = {
+    "network": "NETWORK",
+    "proxy_url": "PROXY_URL",
+    "observer_url": "OBSERVER_URL",
+    "chain_id": "CHAIN_ID",
+    "chain_simulator_build_path": "CHAIN_SIMULATOR_BUILD_PATH",
+    "topology": "TOPOLOGY",
+}
+
+
+class Settings:
+    """
+    Lazily resolved run settings.
+
+    Values are resolved on first access, from lowest to highest priority: the
+    defaults of the selected network profile, the JSON settings file
+    (SETTINGS_FILE, or settings.json in the project folder), environment
+    variables and finally overrides passed to configure() (e.g. from pytest
+    command line options). Nothing touches the filesystem or the network
+    until a value is read.
+    """
+
+    def __init__(self) -> None:
+        self._overrides = {}
+        self._values = None
+        self._providers = {}
+        self._lock = threading.RLock()
+
+    def configure(self, **overrides):
+        """Overrides settings and drops everything resolved so far."""
+        with self._lock:
+            self._overrides.update(
+                {name: value for name, value in overrides.items() if value is not None}
+            )
+            self._values = None
+            self._providers = {}
+
+    @contextmanager
+    def overridden(self, **overrides):
+        """Applies overrides like configure() and restores the previous ones on exit."""
+        with self._lock:
+            previous = dict(self._overrides)
+        self.configure(**overrides)
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._overrides = previous
+                self._values = None
+                self._providers = {}
+
+    def _read_file(self) -> dict:
+        path = os.getenv("SETTINGS_FILE", DEFAULT_SETTINGS_FILE)
+        if not os.path.isfile(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _resolve(self) -> dict:
+        with self._lock:
+            if self._values is not None:
+                return self._values
+            from_file = self._read_file()
+            from_env = {
+                name: os.environ[variable]
+                for name, variable in _ENV_VARIABLES.items()
+                if os.getenv(variable)
+            }
+            values = {"network": "simulator", "topology": DEFAULT_TOPOLOGY}
+            for source in (from_file, from_env, self._overrides):
+                values.update(
+                    {
+                        name: value
+                        for name, value in source.items()
+                        if name != "networks"
+                    }
+                )
+
+            profiles = dict(NETWORK_PROFILES)
+            for name, profile in from_file.get("networks", {}).items():
+                profiles[name] = NetworkProfile(**profile)
+            if values["network"] not in profiles:
+                raise ValueError(
+                    f"Unknown network profile '{values['network']}', "
+                    f"expected one of {sorted(profiles)}"
+                )
+            profile = profiles[values["network"]]
+            values.setdefault("proxy_url", profile.proxy_url)
+            values.setdefault("observer_url", profile.observer_url)
+            values.setdefault("chain_id", profile.chain_id)
+            self._values = values
+            return values
+
+    @property
+    def network(self) -> str:
+        return self._resolve()["network"]
+
+    @property
+    def proxy_url(self) -> str:
+        return self._resolve()["proxy_url"]
+
+    @property
+    def observer_url(self) -> str:
+        return self._resolve()["observer_url"]
+
+    @property
+    def chain_id(self) -> str:
+        return self._resolve()["chain_id"]
+
+    @property
+    def topology(self) -> str:
+        """Name of the default chain simulator topology profile."""
+        return self._resolve()["topology"]
+
+    @property
+    def chain_simulator_folder(self) -> str:
+        """
+        The chain simulator build folder: CHAIN_SIMULATOR_BUILD_PATH if it exists
+        and is not empty, otherwise the default checkout location.
+        """
+        build_path = self._resolve().get("chain_simulator_build_path")
+        for path in (build_path, DEFAULT_CHAIN_SIMULATOR_FOLDER):
+            if path:
+                path = os.path.expanduser(path)
+                if os.path.exists(path) and os.listdir(path):
+                    return path
+        raise ValueError(
+            "Both CHAIN_SIMULATOR_BUILD_PATH and the fallback path are invalid or empty"
+        )
+
+    def provider(self, url: str = None):
+        """Returns the ProxyNetworkProvider of a url (default: the proxy), built on first use."""
+        url = url or self.proxy_url
+        with self._lock:
+            if url not in self._providers:
+                self._providers[url] = ProxyNetworkProvider(url)
+            return self._providers[url]
+
+
+class LazyProvider:
+    """
+    Stands in for a ProxyNetworkProvider and builds the real one on first use,
+    following the current settings.
+    """
+
+    def __init__(self, url_setting: str = "proxy_url") -> None:
+        self._url_setting = url_setting
+
+    def __getattr__(self, name):
+        return getattr(settings.provider(getattr(settings, self._url_setting)), name)
+
+
+settings = Settings()
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TopologyProfile:
+    """Chain simulator node layout and epoch length."""
+
+    name: str
+    num_validators_per_shard: int
+    num_validators_meta: int
+    num_waiting_validators_per_shard: int
+    num_waiting_validators_meta: int
+    rounds_per_epoch: int
+
+    def command_flags(self) -> list[str]:
+        return [
+            f"--rounds-per-epoch {self.rounds_per_epoch}",
+            f"-num-validators-per-shard {self.num_validators_per_shard}",
+            f"-num-waiting-validators-per-shard {self.num_waiting_validators_per_shard}",
+            f"-num-validators-meta {self.num_validators_meta}",
+            f"-num-waiting-validators-meta {self.num_waiting_validators_meta}",
+        ]
+
+    def key(self) -> tuple:
+        """Identifies chains started with the same layout, e.g. to reuse or snapshot them."""
+        return (
+            self.num_validators_per_shard,
+            self.num_validators_meta,
+            self.num_waiting_validators_per_shard,
+            self.num_waiting_validators_meta,
+            self.rounds_per_epoch,
+        )
+
+
+MINIMAL = "minimal"
+STAKING_V4_REALISTIC = "staking-v4-realistic"
+LARGE_AUCTION = "large-auction"
+
+TOPOLOGY_PROFILES = {
+    # one validator per shard and short epochs, for tests that don't look at shuffling
+    MINIMAL: TopologyProfile(MINIMAL, 1, 1, 0, 0, 20),
+    # real config after staking v4 full activation: eligible = 10 *4 , waiting = (6-2) *4, qualified =  2*4
+    # qualified nodes from auction will stay in waiting 2 epochs
+    STAKING_V4_REALISTIC: TopologyProfile(STAKING_V4_REALISTIC, 10, 10, 6, 6, 50),
+    # more waiting nodes, so more of them are shuffled out to the auction list
+    LARGE_AUCTION: TopologyProfile(LARGE_AUCTION, 10, 10, 12, 12, 50),
+}
+DEFAULT_TOPOLOGY = STAKING_V4_REALISTIC
+
+_active = None
+
+
+def get_topology(name: str) -> TopologyProfile:
+    if name not in TOPOLOGY_PROFILES:
+        raise ValueError(
+            f"Unknown topology profile '{name}', expected one of {sorted(TOPOLOGY_PROFILES)}"
+        )
+    return TOPOLOGY_PROFILES[name]
+
+
+def set_active_topology(topology: TopologyProfile):
+    """Records the layout of the chain that is currently running."""
+    global _active
+    _active = topology
+
+
+def active_topology() -> TopologyProfile:
+    """The layout of the running chain, or the configured default before any chain is started."""
+    if _active is not None:
+        return _active
+    from config.settings import settings
+
+    return get_topology(settings.topology)
@@ -1,16 +1,23 @@
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
-from config.config import DEFAULT_PROXY, rounds_per_epoch
+from config.config import DEFAULT_PROXY
 from config.constants import *
+from config.topology import active_topology
 from core.get_transaction_info import get_status_of_tx
-from utils.logger import logger
+from utils.logger import get_logger
+from utils.read_cache import cached_read, invalidate_read_cache
+from utils.timing import timed
 
+logger = get_logger(__name__)
 
+
+@timed
 def send_egld_to_address(egld_amount, erd_address):
-    logger.info(f"Sending {egld_amount} to address {erd_address}")
+    logger.info("Sending %s to address %s", egld_amount, erd_address)
     details = {"address": f"{erd_address}", "balance": f"{egld_amount}"}
 
     details_list = [details]
@@ -18,51 +25,76 @@ def send_egld_to_address(egld_amount, erd_address):
     response = requests.post(
         f"{DEFAULT_PROXY}/simulator/set-state", data=json_structure
     )
+    invalidate_read_cache("set-state")
     response.raise_for_status()
     response_data = response.json()
     logger.info(
-        f"Transfer response: {response_data.get('message', 'Balance updated successfully')}"
+        "Transfer response: %s",
+        response_data.get("message", "Balance updated successfully"),
     )
     return response.text
 
 
+@timed
 def add_blocks(nr_of_blocks):
-    logger.info(f"Requesting generation of {nr_of_blocks} blocks")
+    logger.info("Requesting generation of %s blocks", nr_of_blocks)
     response = requests.post(
         f"{DEFAULT_PROXY}/simulator/generate-blocks/{nr_of_blocks}"
     )
+    invalidate_read_cache("generate-blocks")
     response.raise_for_status()
     logger.info(
-        f"Generated {nr_of_blocks} blocks; Response status: {response.status_code}"
+        "Generated %s blocks; Response status: %s", nr_of_blocks, response.status_code
     )
     return response.text
 
 
+@timed
 def get_block() -> int:
+    nonce = cached_read("network/status", (0,), _fetch_block_nonce)
+    logger.info("Current block nonce: %s", nonce)
+    return nonce
+
+
+def _fetch_block_nonce() -> int:
     response = requests.get(f"{DEFAULT_PROXY}/network/status/0")
     response.raise_for_status()
     parsed = response.json()
 
     general_data = parsed.get("data")
     general_status = general_data.get("status")
-    nonce = general_status.get("erd_nonce")
-    logger.info(f"Current block nonce: {nonce}")
-    return nonce
+    return general_status.get("erd_nonce")
+
 
+@timed
+def get_epoch() -> int:
+    epoch = cached_read("network/status", ("epoch",), _fetch_epoch)
+    logger.info("Current epoch: %s", epoch)
+    return epoch
 
+
+def _fetch_epoch() -> int:
+    response = requests.get(f"{DEFAULT_PROXY}/network/status/4294967295")
+    response.raise_for_status()
+    return response.json()["data"]["status"]["erd_epoch_number"]
+
+
+@timed
 def add_blocks_until_epoch_reached(epoch_to_be_reached: int):
-    logger.info(f"Generating blocks until epoch {epoch_to_be_reached} is reached")
+    logger.info("Generating blocks until epoch %s is reached", epoch_to_be_reached)
     req = requests.post(
         f"{DEFAULT_PROXY}/simulator/generate-blocks-until-epoch-reached/{str(epoch_to_be_reached)}"
     )
+    invalidate_read_cache("generate-blocks-until-epoch-reached")
     req.raise_for_status()
     add_blocks(1)
-    logger.info(f"Epoch {epoch_to_be_reached} reached")
+    logger.info("Epoch %s reached", epoch_to_be_reached)
     return req.text
 
 
+@timed
 def add_blocks_until_tx_fully_executed(tx_hash) -> str:
-    logger.info(f"Checking status of transaction {tx_hash}")
+    logger.info("Checking status of transaction %s", tx_hash)
     counter = 0
 
     while counter < MAX_NUM_OF_BLOCKS_UNTIL_TX_SHOULD_BE_EXECUTED:
@@ -72,15 +104,75 @@ def add_blocks_until_tx_fully_executed(tx_hash) -> str:
         time.sleep(WAIT_UNTIL_API_REQUEST_IN_SEC)
         tx_status = get_status_of_tx(tx_hash)
         if tx_status == "pending":
-            logger.info(f"Transaction {tx_hash} still pending after {counter} blocks")
+            logger.info(
+                "Transaction %s still pending after %s blocks", tx_hash, counter
+            )
         else:
-            logger.info(f"Transaction {tx_hash} executed after {counter} blocks")
+            logger.info("Transaction %s executed after %s blocks", tx_hash, counter)
             return tx_status
     raise Exception(
         f"Transaction {tx_hash} not executed within {MAX_NUM_OF_BLOCKS_UNTIL_TX_SHOULD_BE_EXECUTED} blocks."
     )
 
 
+@timed
+def add_blocks_until_txs_fully_executed(tx_hashes: list[str]) -> dict[str, str]:
+    """
+    Generates blocks until none of the given transactions is pending anymore.
+
+    All statuses are checked after every generated block, so a batch of
+    transactions is confirmed with a single block-generation loop. Large batches
+    may need many blocks to fit in, therefore the limit of
+    MAX_NUM_OF_BLOCKS_UNTIL_TX_SHOULD_BE_EXECUTED applies to consecutive blocks
+    without any progress, not to the whole loop.
+
+    Args:
+        tx_hashes (list[str]): The hashes of the transactions to wait for.
+
+    Returns:
+        dict[str, str]: The final status for each transaction hash.
+    """
+    logger.info("Checking status of %s transactions", len(tx_hashes))
+    statuses = {}
+    pending = list(dict.fromkeys(tx_hashes))
+    blocks_without_progress = 0
+    total_blocks = 0
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        while pending:
+            if blocks_without_progress >= MAX_NUM_OF_BLOCKS_UNTIL_TX_SHOULD_BE_EXECUTED:
+                raise Exception(
+                    f"{len(pending)} transactions not executed within "
+                    f"{MAX_NUM_OF_BLOCKS_UNTIL_TX_SHOULD_BE_EXECUTED} blocks without progress."
+                )
+            add_blocks(1)
+            total_blocks += 1
+
+            time.sleep(WAIT_UNTIL_API_REQUEST_IN_SEC)
+            still_pending = []
+            for tx_hash, tx_status in zip(
+                pending, executor.map(get_status_of_tx, pending)
+            ):
+                if tx_status == "pending":
+                    still_pending.append(tx_hash)
+                else:
+                    statuses[tx_hash] = tx_status
+
+            if len(still_pending) < len(pending):
+                blocks_without_progress = 0
+            else:
+                blocks_without_progress += 1
+            pending = still_pending
+            logger.info(
+                "%s transactions executed, %s still pending after %s blocks",
+                len(statuses),
+                len(pending),
+                total_blocks,
+            )
+    return statuses
+
+
+@timed
 def is_chain_online() -> bool:
     while True:
         time.sleep(1)
@@ -92,10 +184,11 @@ def is_chain_online() -> bool:
         except requests.exceptions.ConnectionError as e:
             logger.warning("Chain not started yet: ConnectionError")
         except Exception as e:
-            logger.error(f"Unexpected error when checking chain status: {str(e)}")
+            logger.error("Unexpected error when checking chain status: %s", e)
             raise
 
 
+@timed
 def add_blocks_until_last_block_of_current_epoch() -> str:
     response = requests.get(f"{DEFAULT_PROXY}/network/status/4294967295")
     response.raise_for_status()
@@ -105,10 +198,13 @@ def add_blocks_until_last_block_of_current_epoch() -> str:
     status = general_data.get("status")
     passed_nonces = status.get("erd_nonces_passed_in_current_epoch")
 
-    blocks_to_be_added = int(rounds_per_epoch) - passed_nonces
+    rounds_per_epoch = status.get(
+        "erd_rounds_per_epoch", active_topology().rounds_per_epoch
+    )
+    blocks_to_be_added = rounds_per_epoch - passed_nonces
     logger.info(
-        f"Adding {blocks_to_be_added} blocks to reach the end of the current epoch"
+        "Adding %s blocks to reach the end of the current epoch", blocks_to_be_added
     )
     response_from_add_blocks = add_blocks(blocks_to_be_added)
-    logger.info(f"Reached the last block of the current epoch")
+    logger.info("Reached the last block of the current epoch")
     return response_from_add_blocks
@@ -9,7 +9,9 @@ from config.constants import GAS_PRICE
 from core.chain_commander import add_blocks_until_epoch_reached
 from models.wallet import Wallet
 from utils.helpers import log_transaction
-from utils.logger import logger
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 config = TransactionsFactoryConfig(CHAIN_ID)
 transaction_computer = TransactionComputer()
@@ -57,11 +59,66 @@ def create_and_sign_esdt_tx(
         transaction_computer.compute_bytes_for_signing(issue_estd_tx)
     )
     logger.info(
-        f"Created and signed ESDT tx with sender {sender_wallet.public_address()}."
+        "Created and signed ESDT tx with sender %s.", sender_wallet.public_address()
     )
     return issue_estd_tx
 
 
+def create_and_sign_esdt_txs(
+    sender_wallet: Wallet,
+    receiver_wallet: str,
+    data_list: list[bytes],
+    nonces: list[int],
+    value: int = 0,
+    gas_limit: int = 60000000,
+    gas_price: int = GAS_PRICE,
+) -> list[Transaction]:
+    """
+    Creates and signs a batch of ESDT transactions from the same sender.
+
+    Unlike create_and_sign_esdt_tx, the epoch activation check and the signer
+    loading are done once for the whole batch.
+
+    Args:
+        sender_wallet (Wallet): The wallet initiating the transactions.
+        receiver_wallet (str): The recipient's address.
+        data_list (list[bytes]): The data of each transaction.
+        nonces (list[int]): The sender nonce of each transaction.
+        value (int, optional): The amount of EGLD to transfer with each transaction. Defaults to 0.
+        gas_limit (int, optional): The gas limit for each transaction. Defaults to 60000000.
+        gas_price (int, optional): The gas price for each transaction. Defaults to GAS_PRICE.
+
+    Returns:
+        list[Transaction]: The created and signed transactions.
+    """
+    signer_sender = sender_wallet.get_signer()
+    assert "success" in add_blocks_until_epoch_reached(7)
+
+    transactions = []
+    for data, nonce in zip(data_list, nonces):
+        tx = Transaction(
+            sender=sender_wallet.public_address(),
+            receiver=receiver_wallet,
+            value=value,
+            gas_limit=gas_limit,
+            gas_price=gas_price,
+            chain_id=CHAIN_ID,
+            nonce=nonce,
+            data=data,
+        )
+        tx.signature = signer_sender.sign(
+            transaction_computer.compute_bytes_for_signing(tx)
+        )
+        transactions.append(tx)
+
+    logger.info(
+        "Created and signed %s ESDT txs with sender %s.",
+        len(transactions),
+        sender_wallet.public_address(),
+    )
+    return transactions
+
+
 def create_and_sign_esdt_inner_tx(
     sender_wallet: Wallet,
     receiver_wallet: str,
@@ -87,7 +144,7 @@ def create_and_sign_esdt_inner_tx(
     issue_estd_tx.relayer = relayer_wallet.public_address()
     # issue_estd_tx.nonce = nonce
     logger.info(
-        f"Relayer {relayer_wallet.public_address()} added to Inner ESDT transaction"
+        "Relayer %s added to Inner ESDT transaction", relayer_wallet.public_address()
     )
     log_transaction(
         issue_estd_tx, f"Created and signed Inner ESDT tx with data: {data}"
@@ -98,6 +155,7 @@ def create_and_sign_esdt_inner_tx(
         transaction_computer.compute_bytes_for_signing(issue_estd_tx)
     )
     logger.info(
-        f"Created and signed Inner ESDT tx with sender {sender_wallet.public_address()}."
+        "Created and signed Inner ESDT tx with sender %s.",
+        sender_wallet.public_address(),
     )
     return issue_estd_tx
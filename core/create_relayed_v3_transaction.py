@@ -1,18 +1,28 @@
+import json
+
+import requests
+from multiversx_sdk.converters.transactions_converter import TransactionsConverter
 from multiversx_sdk.core.transaction import Transaction
 from multiversx_sdk.core.transaction_computer import TransactionComputer
 from multiversx_sdk.core.transactions_factories.transactions_factory_config import (
     TransactionsFactoryConfig,
 )
 
-from config.config import CHAIN_ID, provider
-from config.constants import GAS_PRICE
+from config.config import CHAIN_ID, DEFAULT_PROXY, provider
+from config.constants import GAS_PRICE, TX_BATCH_SIZE
 from core.chain_commander import (
     add_blocks_until_epoch_reached,
     add_blocks_until_tx_fully_executed,
+    add_blocks_until_txs_fully_executed,
 )
+from core.get_transaction_info import check_if_error_is_present_in_tx
+from core.transaction_preflight import check_for_fail_without_execution
 from models.wallet import Wallet
 from utils.helpers import log_transaction
-from utils.logger import logger
+from utils.logger import get_logger
+from utils.timing import timed
+
+logger = get_logger(__name__)
 
 config = TransactionsFactoryConfig(CHAIN_ID)
 transaction_computer = TransactionComputer()
@@ -50,7 +60,7 @@ def create_and_sign_inner_transfer_tx(
     tx.relayer = relayer_wallet.public_address()
     tx.nonce = nonce
     logger.info(
-        f"Relayer {relayer_wallet.public_address()} added to transfer transaction"
+        "Relayer %s added to transfer transaction", relayer_wallet.public_address()
     )
     log_transaction(tx, "Created and signed Native Transfer transaction")
     signer_sender = sender_wallet.get_signer()
@@ -58,7 +68,10 @@ def create_and_sign_inner_transfer_tx(
         transaction_computer.compute_bytes_for_signing(tx)
     )
     logger.info(
-        f"Created and signed transfer transaction from {sender_wallet.public_address()} to {receiver_wallet.public_address()} for amount {native_amount}."
+        "Created and signed transfer transaction from %s to %s for amount %s.",
+        sender_wallet.public_address(),
+        receiver_wallet.public_address(),
+        native_amount,
     )
     return tx
 
@@ -98,11 +111,13 @@ def create_and_sign_relayed_v3_transaction(
         transaction_computer.compute_bytes_for_signing(relayed_v3_tx)
     )
     logger.info(
-        f"Created and signed relayed v3 transaction with relayer {relayer_wallet.public_address()}."
+        "Created and signed relayed v3 transaction with relayer %s.",
+        relayer_wallet.public_address(),
     )
     return relayed_v3_tx
 
 
+@timed
 def send_transaction_and_check_for_success(transaction):
     """
     Sends a transaction and checks for its success.
@@ -115,21 +130,114 @@ def send_transaction_and_check_for_success(transaction):
     """
     tx_hash = provider.send_transaction(transaction)
     assert add_blocks_until_tx_fully_executed(tx_hash) == "success"
-    logger.info(f"Transaction sent successfully with hash: {tx_hash}")
+    logger.info("Transaction sent successfully with hash: %s", tx_hash)
     return tx_hash
 
 
-def send_transaction_and_check_for_fail(transaction):
+@timed
+def send_transaction_and_check_for_fail(
+    transaction, preflight: bool = False, error: str = None
+):
     """
     Sends a transaction and checks for its fail.
 
     Args:
         transaction (Transaction): The transaction to send.
+        preflight (bool): Only simulate the transaction and check the predicted
+            fail, skipping block generation; the transaction is not sent.
+        error (str, optional): A text the (predicted) error must contain.
 
     Returns:
-        str: The transaction hash.
+        str: The transaction hash, or None with preflight, since nothing is sent.
     """
+    if preflight:
+        check_for_fail_without_execution(transaction, error)
+        return None
     tx_hash = provider.send_transaction(transaction)
     assert add_blocks_until_tx_fully_executed(tx_hash) == "fail"
-    logger.info(f"Transaction failed with hash: {tx_hash}")
+    if error is not None:
+        assert check_if_error_is_present_in_tx(error, tx_hash), error
+    logger.info("Transaction failed with hash: %s", tx_hash)
     return tx_hash
+
+
+@timed
+def send_transactions(transactions: list, batch_size: int = TX_BATCH_SIZE) -> list:
+    """
+    Sends already signed transactions in batches through /transaction/send-multiple.
+
+    Args:
+        transactions (list): The transactions to send, in nonce order per sender.
+        batch_size (int): How many transactions are posted in one request.
+
+    Returns:
+        list: The transaction hashes, aligned with the given transactions.
+            None is used for transactions rejected by the proxy.
+    """
+    transaction_converter = TransactionsConverter()
+    tx_hashes = []
+    for start in range(0, len(transactions), batch_size):
+        batch = transactions[start : start + batch_size]
+        payload = [transaction_converter.transaction_to_dictionary(tx) for tx in batch]
+        response = requests.post(
+            f"{DEFAULT_PROXY}/transaction/send-multiple", data=json.dumps(payload)
+        )
+        response.raise_for_status()
+        sent_hashes = response.json().get("data", {}).get("txsHashes", {})
+        tx_hashes.extend(sent_hashes.get(str(index)) for index in range(len(batch)))
+        logger.info(
+            "Sent batch of %s transactions, accepted: %s", len(batch), len(sent_hashes)
+        )
+    return tx_hashes
+
+
+@timed
+def send_transactions_and_wait_for_execution(
+    transactions: list, batch_size: int = TX_BATCH_SIZE, wallets: list = None
+) -> list:
+    """
+    Sends transactions in batches and confirms them with one block-generation loop.
+
+    A sender's transactions after the first one the proxy rejected wait behind its
+    nonce and never execute, so they are not waited for, and the sender's wallet
+    is resynced: its locally allocated nonces now have gaps.
+
+    Args:
+        transactions (list): The signed transactions to send, in nonce order per sender.
+        batch_size (int): How many transactions are posted in one request.
+        wallets (list, optional): The sender wallet of each transaction, whose
+            nonce is fetched again on next use after a rejection.
+
+    Returns:
+        list: A list of (tx_hash, status) tuples, aligned with the given transactions.
+            Transactions rejected by the proxy are reported as (None, "rejected"),
+            the ones a sender sent after its first rejected one as
+            (tx_hash, "skipped").
+    """
+    tx_hashes = send_transactions(transactions, batch_size)
+    stalled_senders = set()
+    stalled = []
+    for transaction, tx_hash in zip(transactions, tx_hashes):
+        if tx_hash is None:
+            stalled_senders.add(transaction.sender)
+        stalled.append(transaction.sender in stalled_senders)
+    statuses = add_blocks_until_txs_fully_executed(
+        [tx_hash for tx_hash, skip in zip(tx_hashes, stalled) if not skip]
+    )
+    results = []
+    for tx_hash, skip in zip(tx_hashes, stalled):
+        if tx_hash is None:
+            results.append((None, "rejected"))
+        elif skip:
+            results.append((tx_hash, "skipped"))
+        else:
+            results.append((tx_hash, statuses[tx_hash]))
+    for wallet in wallets or []:
+        if wallet.public_address() in stalled_senders:
+            wallet.nonce = None
+    if stalled_senders:
+        logger.info(
+            "Proxy rejected transactions of %s senders, skipped their later ones",
+            len(stalled_senders),
+        )
+    return results
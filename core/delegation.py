@@ -1,14 +1,17 @@
 from multiversx_sdk.core import Transaction, TransactionComputer
-from multiversx_sdk.wallet.validator_pem import ValidatorPEM
-from multiversx_sdk.wallet.validator_signer import ValidatorSigner
 
 from config.config import CHAIN_ID
 from config.constants import *
 from models.validatorKey import *
 from models.wallet import *
 from utils.helpers import decimal_to_hex
+from utils.logger import get_logger
+from utils.timing import timed
 
+logger = get_logger(__name__)
 
+
+@timed
 def create_new_delegation_contract(
     owner: Wallet,
     AMOUNT="1250000000000000000000",
@@ -37,10 +40,11 @@ def create_new_delegation_contract(
     # send tx
     tx_hash = proxy_default.send_transaction(tx)
 
-    logger.info(f"New delegation contract created, transaction hash: {tx_hash}")
+    logger.info("New delegation contract created, transaction hash: %s", tx_hash)
     return tx_hash
 
 
+@timed
 def make_new_contract_from_validator_data(
     owner: Wallet, SERVICE_FEE="00", DELEGATION_CAP="00"
 ) -> str:
@@ -69,11 +73,12 @@ def make_new_contract_from_validator_data(
     tx_hash = proxy_default.send_transaction(tx)
 
     logger.info(
-        f"New contract from validator data created, transaction hash: {tx_hash}"
+        "New contract from validator data created, transaction hash: %s", tx_hash
     )
     return tx_hash
 
 
+@timed
 def whitelist_for_merge(
     old_owner: Wallet, new_owner: Wallet, delegation_sc_address: str
 ) -> str:
@@ -101,10 +106,11 @@ def whitelist_for_merge(
     # send tx
     tx_hash = proxy_default.send_transaction(tx)
 
-    logger.info(f"Whitelist for merge processed, transaction hash: {tx_hash}")
+    logger.info("Whitelist for merge processed, transaction hash: %s", tx_hash)
     return tx_hash
 
 
+@timed
 def merge_validator_to_delegation_with_whitelist(
     new_owner: Wallet, delegation_sc_address: str
 ):
@@ -133,11 +139,12 @@ def merge_validator_to_delegation_with_whitelist(
     tx_hash = proxy_default.send_transaction(tx)
 
     logger.info(
-        f"Validator merged to delegation with whitelist, transaction hash: {tx_hash}"
+        "Validator merged to delegation with whitelist, transaction hash: %s", tx_hash
     )
     return tx_hash
 
 
+@timed
 def merge_validator_to_delegation_same_owner(owner: Wallet, delegation_sc_address: str):
     delegation_sc_address_as_hex = Address.from_bech32(delegation_sc_address).to_hex()
 
@@ -166,22 +173,21 @@ def merge_validator_to_delegation_same_owner(owner: Wallet, delegation_sc_addres
     tx_hash = proxy_default.send_transaction(tx)
 
     logger.info(
-        f"Validator merged to delegation with the same owner, transaction hash: {tx_hash}"
+        "Validator merged to delegation with the same owner, transaction hash: %s",
+        tx_hash,
     )
     return tx_hash
 
 
+@timed
 def add_nodes(
     owner: Wallet, delegation_sc_address: str, validatorKeys: list[ValidatorKey]
 ) -> str:
     # load needed data for stake transactions signatures
     stake_signature_and_public_key = ""
     for key in validatorKeys:
-        pem_file = ValidatorPEM.from_file(key.path)
         public_key = key.public_address()
-
-        validator_signer = ValidatorSigner(pem_file.secret_key)
-        signed_message = validator_signer.sign(owner.get_address().pubkey).hex()
+        signed_message = key.stake_signature(owner.get_address().pubkey)
 
         stake_signature_and_public_key += f"@{public_key}@{signed_message}"
 
@@ -207,10 +213,11 @@ def add_nodes(
     # send tx
     tx_hash = proxy_default.send_transaction(tx)
 
-    logger.info(f"Nodes added to delegation, transaction hash: {tx_hash}")
+    logger.info("Nodes added to delegation, transaction hash: %s", tx_hash)
     return tx_hash
 
 
+@timed
 def stake_nodes(
     owner: Wallet, delegation_sc_address: str, validatorKeys: list[ValidatorKey]
 ):
@@ -241,10 +248,11 @@ def stake_nodes(
     # send tx
     tx_hash = proxy_default.send_transaction(tx)
 
-    logger.info(f"Nodes staked in delegation, transaction hash: {tx_hash}")
+    logger.info("Nodes staked in delegation, transaction hash: %s", tx_hash)
     return tx_hash
 
 
+@timed
 def delegate(sender: Wallet, delegation_sc_address: str, amount: int):
     # compute tx
     tx = Transaction(
@@ -267,7 +275,7 @@ def delegate(sender: Wallet, delegation_sc_address: str, amount: int):
 
     # send tx
     tx_hash = proxy_default.send_transaction(tx)
-    logger.info(f"Funds are delegated, transaction hash: {tx_hash}")
+    logger.info("Funds are delegated, transaction hash: %s", tx_hash)
     return tx_hash
 
 
@@ -300,7 +308,9 @@ def create_and_sign_inner_delegation_tx(
 
     # send tx
     logger.info(
-        f"Created and signed delegate transaction from {sender_wallet.public_address()} with amount {amount}."
+        "Created and signed delegate transaction from %s with amount %s.",
+        sender_wallet.public_address(),
+        amount,
     )
     return tx
 
@@ -336,7 +346,10 @@ def create_and_sign_new_inner_delegation_contract_tx(
     tx.signature = signature
 
     logger.info(
-        f"Created and signed createNewDelegationContract transaction from {sender_wallet.public_address()} to {SYSTEM_DELEGATION_MANAGER_CONTRACT} with amount {amount}."
+        "Created and signed createNewDelegationContract transaction from %s to %s with amount %s.",
+        sender_wallet.public_address(),
+        SYSTEM_DELEGATION_MANAGER_CONTRACT,
+        amount,
     )
     return tx
 
@@ -371,6 +384,8 @@ def create_and_sign_inner_un_delegation_tx(
 
     # send tx
     logger.info(
-        f"Created and signed unDelegate transaction from {sender_wallet.public_address()} with amount {amount}."
+        "Created and signed unDelegate transaction from %s with amount %s.",
+        sender_wallet.public_address(),
+        amount,
     )
     return tx
@@ -1,7 +1,10 @@
 import requests
 
 from config.config import DEFAULT_PROXY
-from utils.logger import logger
+from utils.logger import get_logger
+from utils.read_cache import cached_read
+
+logger = get_logger(__name__)
 
 
 def get_nonce(address: str) -> int:
@@ -13,12 +16,12 @@ def get_nonce(address: str) -> int:
 
     Returns:
         int: The nonce of the address.
+
+    Served from the read cache until the next block is generated.
     """
-    logger.info(f"Checking Nonce for Address: {address}")
-    response = requests.get(f"{DEFAULT_PROXY}/address/{address}/nonce")
-    response.raise_for_status()
-    nonce = response.json()["data"]["nonce"]
-    logger.info(f"Address Nonce: {nonce}")
+    logger.info("Checking Nonce for Address: %s", address)
+    nonce = cached_read("address/nonce", (address,), lambda: _fetch_nonce(address))
+    logger.info("Address Nonce: %s", nonce)
     return nonce
 
 
@@ -31,12 +34,14 @@ def get_balance(address: str) -> str:
 
     Returns:
         str: The balance of the address.
+
+    Served from the read cache until the next block is generated.
     """
-    logger.info(f"Checking Balance for Address: {address}")
-    response = requests.get(f"{DEFAULT_PROXY}/address/{address}/balance")
-    response.raise_for_status()
-    balance = response.json()["data"]["balance"]
-    logger.info(f"Address Balance: {balance}")
+    logger.info("Checking Balance for Address: %s", address)
+    balance = cached_read(
+        "address/balance", (address,), lambda: _fetch_balance(address)
+    )
+    logger.info("Address Balance: %s", balance)
     return balance
 
 
@@ -50,9 +55,21 @@ def get_address_details(address: str) -> dict:
     Returns:
         dict: A dictionary containing the address details.
     """
-    logger.info(f"Checking Details for Address: {address}")
+    logger.info("Checking Details for Address: %s", address)
     response = requests.get(f"{DEFAULT_PROXY}/address/{address}")
     response.raise_for_status()
     response_json = response.json()
-    logger.info(f"Address Details: {response_json}")
+    logger.info("Address Details: %s", response_json)
     return response_json
+
+
+def _fetch_nonce(address: str) -> int:
+    response = requests.get(f"{DEFAULT_PROXY}/address/{address}/nonce")
+    response.raise_for_status()
+    return response.json()["data"]["nonce"]
+
+
+def _fetch_balance(address: str) -> str:
+    response = requests.get(f"{DEFAULT_PROXY}/address/{address}/balance")
+    response.raise_for_status()
+    return response.json()["data"]["balance"]
@@ -1,67 +1,38 @@
-import requests
-from multiversx_sdk.core.address import Address
+from core.get_transaction_info import get_transaction_events
+from utils.logger import get_logger
 
-from config.config import DEFAULT_PROXY
-from utils.helpers import base64_to_hex
-from utils.logger import logger
+logger = get_logger(__name__)
 
 
 def get_delegation_contract_address_from_tx(tx_hash):
-    logger.info(f"Fetching transaction details for hash: {tx_hash}")
-    response = requests.get(f"{DEFAULT_PROXY}/transaction/{tx_hash}?withResults=True")
-    response.raise_for_status()
-    parsed = response.json()
+    events = get_transaction_events(tx_hash)
 
-    logger.debug("Parsing transaction data")
-    general_data = parsed.get("data")
-    transaction_data = general_data.get("transaction")
-    logs_data = transaction_data.get("logs")
-    events_data = logs_data.get("events")
-    first_set_of_events = events_data[0]
-    topics = first_set_of_events.get("topics")
-    delegation_contract_address = topics[1]
+    logger.debug("Looking up new delegation contract in transaction events")
+    if not events.system_contract_addresses:
+        error_message = "Delegation contract address not found in transaction logs."
+        logger.error(error_message)
+        raise ValueError(error_message)
 
-    delegation_contract_address = base64_to_hex(delegation_contract_address)
-    delegation_contract_address = Address.from_hex(
-        delegation_contract_address, "erd"
-    ).to_bech32()
-    logger.info(f"Delegation contract address obtained: {delegation_contract_address}")
+    delegation_contract_address = events.system_contract_addresses[0]
+    logger.info("Delegation contract address obtained: %s", delegation_contract_address)
     return delegation_contract_address
 
 
 def get_delegation_sc_address_from_sc_results_using_inner_tx(tx_hash):
-    logger.info(f"Fetching transaction details for hash: {tx_hash}")
-    response = requests.get(f"{DEFAULT_PROXY}/transaction/{tx_hash}?withResults=True")
-    response.raise_for_status()
-    parsed = response.json()
+    events = get_transaction_events(tx_hash)
+
+    logger.debug("Looking up new delegation contract in smart contract results")
+    for delegation_contract_address in events.system_contract_addresses:
+        if any(
+            event.source != "logs"
+            for event in events.mentioning(delegation_contract_address)
+        ):
+            logger.info(
+                "Delegation contract address obtained for inner tx: %s",
+                delegation_contract_address,
+            )
+            return delegation_contract_address
 
-    logger.debug("Parsing transaction data")
-    transaction_data = parsed.get("data", {}).get("transaction", {})
-    sc_results = transaction_data.get("smartContractResults", [])
-
-    for sc_result in sc_results:
-        logs_data = sc_result.get("logs")
-        if logs_data:
-            events_data = logs_data.get("events")
-            if events_data:
-                for event in events_data:
-                    topics = event.get("topics")
-                    for topic in topics:
-                        try:
-                            possible_address = base64_to_hex(topic)
-                            delegation_contract_address = Address.from_hex(
-                                possible_address, "erd"
-                            ).to_bech32()
-                            logger.info(
-                                f"Delegation contract address obtained for inner tx: {delegation_contract_address}"
-                            )
-                            return delegation_contract_address
-                        except Exception as e:
-                            logger.debug(
-                                f"Failed to convert topic to address: {str(e)}"
-                            )
-                            continue
     error_message = "Delegation contract address not found in transaction results."
     logger.error(error_message)
     raise ValueError(error_message)
-    return None
@@ -1,7 +1,10 @@
 import requests
 
 from config.config import DEFAULT_PROXY
-from utils.logger import logger
+from models.esdt_holdings import get_esdt_holdings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 def get_esdt_roles(address: str) -> list:
@@ -14,7 +17,7 @@ def get_esdt_roles(address: str) -> list:
     Returns:
         list: A list of roles found, or an empty list if none are found.
     """
-    logger.info(f"Retrieving roles for Address: {address}")
+    logger.info("Retrieving roles for Address: %s", address)
     response = requests.get(f"{DEFAULT_PROXY}/address/{address}/esdts/roles")
     response.raise_for_status()
     roles_dict = response.json().get("data", {}).get("roles", {})
@@ -22,9 +25,9 @@ def get_esdt_roles(address: str) -> list:
     for role_list in roles_dict.values():
         roles.extend(role_list)
     if not roles:
-        logger.error(f"No roles found for Address: {address}")
+        logger.error("No roles found for Address: %s", address)
     else:
-        logger.info(f"Roles found for Address {address}: {roles}")
+        logger.info("Roles found for Address %s: %s", address, roles)
     return roles
 
 
@@ -32,6 +35,9 @@ def get_single_esdt_details(address: str, token_identifier: str) -> dict:
     """
     Retrieves the ESDT details for a given address and token identifier.
 
+    The exact identifier is looked up first. If the identifier is a collection
+    (e.g. NFT-abcdef), the details of its lowest-nonce token are returned.
+
     Args:
         address (str): The address to query.
         token_identifier (str): The token identifier to look for.
@@ -40,26 +46,30 @@ def get_single_esdt_details(address: str, token_identifier: str) -> dict:
         dict: A dictionary containing the ESDT details.
     """
     logger.info(
-        f"Retrieving ESDT details for Address: {address} and Token Identifier: {token_identifier}"
+        "Retrieving ESDT details for Address: %s and Token Identifier: %s",
+        address,
+        token_identifier,
     )
-    response = requests.get(f"{DEFAULT_PROXY}/address/{address}/esdt")
-    response.raise_for_status()
+    holdings = get_esdt_holdings(address)
 
-    esdts = response.json().get("data", {}).get("esdts", {})
-    esdt_details = {}
-
-    for key, value in esdts.items():
-        if token_identifier in key:
-            esdt_details = value
-            break
+    esdt_details = holdings.get(token_identifier)
+    if not esdt_details:
+        collection_tokens = holdings.get_collection(token_identifier)
+        if collection_tokens:
+            esdt_details = collection_tokens[0]
 
     if not esdt_details:
         logger.error(
-            f"No ESDT details found for Token Identifier: {token_identifier} and Address: {address}"
+            "No ESDT details found for Token Identifier: %s and Address: %s",
+            token_identifier,
+            address,
         )
     else:
         logger.info(
-            f"ESDT details for Address {address} and Token Identifier {token_identifier}: {esdt_details}"
+            "ESDT details for Address %s and Token Identifier %s: %s",
+            address,
+            token_identifier,
+            esdt_details,
         )
 
     return esdt_details
@@ -67,39 +77,36 @@ def get_single_esdt_details(address: str, token_identifier: str) -> dict:
 
 def get_multiple_esdt_details(address: str, token_identifier: str) -> list:
     """
-    Retrieves the ESDT details for a given address and a list of token identifiers.
+    Retrieves the ESDT details of all tokens of a collection held by an address.
 
     Args:
         address (str): The address to query.
-        token_identifier (str): The token identifier to look for.
+        token_identifier (str): The collection identifier to look for.
 
     Returns:
         list: A list of dictionaries, each containing the ESDT details for a matching token.
     """
     logger.info(
-        f"Retrieving ESDT details for Address: {address} and Token Identifiers: {token_identifier}"
+        "Retrieving ESDT details for Address: %s and Token Identifiers: %s",
+        address,
+        token_identifier,
     )
 
-    response = requests.get(f"{DEFAULT_PROXY}/address/{address}/esdt")
-    response.raise_for_status()
-
-    esdts = response.json().get("data", {}).get("esdts", {})
-    matching_esdts = []
-
-    for key, value in esdts.items():
-        if key.startswith(token_identifier):
-            matching_esdts.append(value)
-            logger.info(
-                f"Found ESDT details for Token Identifier: {key} at Address: {address}"
-            )
+    holdings = get_esdt_holdings(address)
+    matching_esdts = list(holdings.get_collection(token_identifier))
 
     if not matching_esdts:
         logger.error(
-            f"No ESDT details found for Token Identifier Prefix: {token_identifier} at Address: {address}"
+            "No ESDT details found for Token Identifier Prefix: %s at Address: %s",
+            token_identifier,
+            address,
         )
     else:
         logger.info(
-            f"Retrieved ESDT details for Address {address} with Token Identifier Prefix: {token_identifier}"
+            "Retrieved %s ESDT details for Address %s with Token Identifier Prefix: %s",
+            len(matching_esdts),
+            address,
+            token_identifier,
         )
 
     return matching_esdts
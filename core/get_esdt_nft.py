@@ -1,7 +1,9 @@
 import requests
 
 from config.config import DEFAULT_PROXY
-from utils.logger import logger
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 def has_nft_token(address: str) -> bool:
@@ -14,10 +16,12 @@ def has_nft_token(address: str) -> bool:
     Returns:
         bool: True if tokens are present, otherwise False.
     """
-    logger.info(f"Validating nft tokens for Address: {address}")
+    logger.info("Validating nft tokens for Address: %s", address)
     response = requests.get(f"{DEFAULT_PROXY}/address/{address}/registered-nfts")
     response.raise_for_status()
     tokens = response.json().get("data", {}).get("tokens", [])
     has_tokens = bool(tokens)
-    logger.info(f"NFT Tokens: {tokens} present for Address: {address}: {has_tokens}")
+    logger.info(
+        "NFT Tokens: %s present for Address: %s: %s", tokens, address, has_tokens
+    )
     return has_tokens
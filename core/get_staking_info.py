@@ -1,123 +1,155 @@
-import json
-
-import requests
 from multiversx_sdk.core.address import Address
 
-from config.config import DEFAULT_PROXY
 from config.constants import VALIDATOR_CONTRACT
+from core.vm_query import VmQuery, run_vm_queries
 from models.wallet import Wallet
-from utils.helpers import base64_to_decimal, base64_to_string
-from utils.logger import logger
+from utils.logger import get_logger
+from utils.timing import timed
 
+logger = get_logger(__name__)
 
-def get_total_staked(owner: str):
-    logger.info(f"Fetching total staked for owner: {owner}")
 
-    address_in_hex = Address.from_bech32(owner).to_hex()
-    post_body = {
-        "scAddress": VALIDATOR_CONTRACT,
-        "funcName": "getTotalStaked",
-        "args": [address_in_hex],
-    }
+def _get_total_staked_query(owner: str) -> VmQuery:
+    return VmQuery(
+        VALIDATOR_CONTRACT,
+        "getTotalStaked",
+        [Address.from_bech32(owner).to_hex()],
+        returns=["string"],
+    )
+
 
-    json_structure = json.dumps(post_body)
-    logger.debug(f"Query payload prepared: {json_structure}")
+def _get_delegator_query(
+    func_name: str, address: str, delegation_sc_address: str, returns
+) -> VmQuery:
+    return VmQuery(
+        delegation_sc_address,
+        func_name,
+        [Address.from_bech32(address).to_hex()],
+        returns=returns,
+    )
 
-    response = requests.post(f"{DEFAULT_PROXY}/vm-values/query", data=json_structure)
-    response.raise_for_status()
-    parsed = response.json()
 
-    general_data = parsed.get("data")
-    tx_response_data = general_data.get("data")
-    total_staked_list = tx_response_data.get("returnData")
-    total_staked = total_staked_list[0]
+@timed
+def get_total_staked(owner: str):
+    logger.info("Fetching total staked for owner: %s", owner)
 
-    total_staked = base64_to_string(total_staked)
-    logger.info(f"Total staked for owner {owner}: {total_staked}")
+    [result] = run_vm_queries([_get_total_staked_query(owner)])
+    total_staked = result.value()
+
+    logger.info("Total staked for owner %s: %s", owner, total_staked)
     return total_staked
 
 
+@timed
+def get_total_staked_for_owners(owners: list[str]) -> dict[str, str]:
+    """
+    Fetches getTotalStaked for many owners with one concurrent batch of queries.
+
+    Args:
+        owners (list[str]): The bech32 addresses of the owners.
+
+    Returns:
+        dict[str, str]: The total staked amount for each owner.
+    """
+    logger.info("Fetching total staked for %s owners", len(owners))
+    results = run_vm_queries([_get_total_staked_query(owner) for owner in owners])
+    return {owner: result.value() for owner, result in zip(owners, results)}
+
+
+@timed
 def get_user_active_stake(wallet: Wallet, delegation_sc_address: str):
-    logger.info(f"Fetching user active stake for wallet: {wallet.public_address()}")
-
-    address_in_hex = Address.from_bech32(wallet.public_address()).to_hex()
-    post_body = {
-        "scAddress": delegation_sc_address,
-        "funcName": "getUserActiveStake",
-        "args": [address_in_hex],
-    }
-
-    json_structure = json.dumps(post_body)
-    logger.debug(f"Query payload prepared: {json_structure}")
-
-    response = requests.post(f"{DEFAULT_PROXY}/vm-values/query", data=json_structure)
-    response.raise_for_status()
-    parsed = response.json()
-
-    general_data = parsed.get("data")
-    tx_response_data = general_data.get("data")
-    active_staked_list = tx_response_data.get("returnData")
-    active_staked = active_staked_list[0]
-    active_staked = base64_to_decimal(active_staked)
-    logger.info(f"Active stake wallet {wallet.public_address()}: {active_staked}")
+    logger.info("Fetching user active stake for wallet: %s", wallet.public_address())
+
+    [result] = run_vm_queries(
+        [
+            _get_delegator_query(
+                "getUserActiveStake",
+                wallet.public_address(),
+                delegation_sc_address,
+                ["bigint"],
+            )
+        ]
+    )
+    active_staked = result.value()
+    logger.info("Active stake wallet %s: %s", wallet.public_address(), active_staked)
     return active_staked
 
 
+@timed
+def get_users_active_stake(
+    addresses: list[str], delegation_sc_address: str
+) -> dict[str, int]:
+    """
+    Fetches getUserActiveStake for many delegators with one concurrent batch of queries.
+
+    Args:
+        addresses (list[str]): The bech32 addresses of the delegators.
+        delegation_sc_address (str): The delegation contract.
+
+    Returns:
+        dict[str, int]: The active stake of each delegator.
+    """
+    logger.info(
+        "Fetching active stake for %s delegators of %s",
+        len(addresses),
+        delegation_sc_address,
+    )
+    results = run_vm_queries(
+        [
+            _get_delegator_query(
+                "getUserActiveStake", address, delegation_sc_address, ["bigint"]
+            )
+            for address in addresses
+        ]
+    )
+    return {address: result.value() for address, result in zip(addresses, results)}
+
+
+@timed
 def get_user_un_delegated_list(wallet: Wallet, delegation_sc_address: str):
     logger.info(
-        f"Fetching undelegated stake list for wallet: {wallet.public_address()}"
+        "Fetching undelegated stake list for wallet: %s", wallet.public_address()
     )
 
-    address_in_hex = Address.from_bech32(wallet.public_address()).to_hex()
-    post_body = {
-        "scAddress": delegation_sc_address,
-        "funcName": "getUserUnDelegatedList",
-        "args": [address_in_hex],
-    }
-
-    json_structure = json.dumps(post_body)
-    logger.debug(f"Query payload prepared: {json_structure}")
-
-    response = requests.post(f"{DEFAULT_PROXY}/vm-values/query", data=json_structure)
-    response.raise_for_status()
-    parsed = response.json()
-
-    general_data = parsed.get("data")
-    tx_response_data = general_data.get("data")
-    undelegated_stake_list = tx_response_data.get("returnData")
-    undelegated_stake = undelegated_stake_list[0]
-    undelegated_stake = base64_to_decimal(undelegated_stake)
+    [result] = run_vm_queries(
+        [
+            _get_delegator_query(
+                "getUserUnDelegatedList",
+                wallet.public_address(),
+                delegation_sc_address,
+                ["bigint"],
+            )
+        ]
+    )
+    undelegated_stake = result.value()
     logger.info(
-        f"Undelegated stake values for wallet {wallet.public_address()}: {undelegated_stake}"
+        "Undelegated stake values for wallet %s: %s",
+        wallet.public_address(),
+        undelegated_stake,
     )
     return undelegated_stake
 
 
+@timed
 def get_delegators_un_staked_funds_data(wallet: Wallet, delegation_sc_address: str):
     logger.info(
-        f"Fetching  un-staked stake for delegator wallet: {wallet.public_address()}"
+        "Fetching  un-staked stake for delegator wallet: %s", wallet.public_address()
     )
 
-    address_in_hex = Address.from_bech32(wallet.public_address()).to_hex()
-    post_body = {
-        "scAddress": delegation_sc_address,
-        "funcName": "getDelegatorFundsData",
-        "args": [address_in_hex],
-    }
-
-    json_structure = json.dumps(post_body)
-    logger.debug(f"Query payload prepared: {json_structure}")
-
-    response = requests.post(f"{DEFAULT_PROXY}/vm-values/query", data=json_structure)
-    response.raise_for_status()
-    parsed = response.json()
-
-    general_data = parsed.get("data")
-    tx_response_data = general_data.get("data")
-    un_staked_amount_list = tx_response_data.get("returnData")
-    un_staked_amount = un_staked_amount_list[2]
-    un_staked_amount = base64_to_decimal(un_staked_amount)
+    [result] = run_vm_queries(
+        [
+            _get_delegator_query(
+                "getDelegatorFundsData",
+                wallet.public_address(),
+                delegation_sc_address,
+                ("repeat", "bigint"),
+            )
+        ]
+    )
+    un_staked_amount = result.value(2)
     logger.info(
-        f"Un-staked for delegator wallet {wallet.public_address()}: {un_staked_amount}"
+        "Un-staked for delegator wallet %s: %s",
+        wallet.public_address(),
+        un_staked_amount,
     )
     return un_staked_amount
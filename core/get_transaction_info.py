@@ -1,14 +1,15 @@
-import base64
-
 import requests
 
 from config.config import DEFAULT_PROXY
 from utils.helpers import string_to_base64
-from utils.logger import logger
+from utils.logger import get_logger
+from utils.tx_events import TxEventIndex, index_transaction_events
+
+logger = get_logger(__name__)
 
 
 def get_status_of_tx(tx_hash: str) -> str:
-    logger.info(f"Checking transaction status for hash: {tx_hash}")
+    logger.info("Checking transaction status for hash: %s", tx_hash)
     response = requests.get(f"{DEFAULT_PROXY}/transaction/{tx_hash}/process-status")
     response.raise_for_status()
     parsed = response.json()
@@ -18,24 +19,24 @@ def get_status_of_tx(tx_hash: str) -> str:
 
     general_data = parsed.get("data")
     status = general_data.get("status")
-    logger.info(f"Transaction status: {status} for tx_hash: {tx_hash}")
+    logger.info("Transaction status: %s for tx_hash: %s", status, tx_hash)
     return status
 
 
 def check_if_error_is_present_in_tx(error, tx_hash) -> bool:
-    logger.info(f"Checking for error in transaction {tx_hash}")
+    logger.info("Checking for error in transaction %s", tx_hash)
     error_bytes = string_to_base64(error)
 
     response = requests.get(f"{DEFAULT_PROXY}/transaction/{tx_hash}?withResults=True")
     response.raise_for_status()
     error_present = error_bytes.decode() in response.text or error in response.text
-    logger.info(f"Error presence: {error_present} | in tx_hash: {tx_hash}")
+    logger.info("Error presence: %s | in tx_hash: %s", error_present, tx_hash)
 
     return error_present
 
 
 def get_gas_used_from_tx(tx_hash: str) -> str:
-    logger.info(f"Fetching gas used for transaction {tx_hash}")
+    logger.info("Fetching gas used for transaction %s", tx_hash)
     response = requests.get(f"{DEFAULT_PROXY}/transaction/{tx_hash}?withResults=true")
     response.raise_for_status()
     parsed = response.json()
@@ -44,52 +45,75 @@ def get_gas_used_from_tx(tx_hash: str) -> str:
     transaction = general_data.get("transaction")
     gas_used = transaction.get("fee")
 
-    logger.info(f"Gas used: {gas_used} for tx_hash: {tx_hash}")
+    logger.info("Gas used: %s for tx_hash: %s", gas_used, tx_hash)
     return gas_used
 
 
+def get_transaction_cost(tx_hash: str) -> tuple[int, int]:
+    """Returns the gas used and the fee of an executed transaction."""
+    response = requests.get(f"{DEFAULT_PROXY}/transaction/{tx_hash}?withResults=true")
+    response.raise_for_status()
+    transaction = response.json().get("data", {}).get("transaction", {})
+    return int(transaction.get("gasUsed") or 0), int(transaction.get("fee") or 0)
+
+
+def get_transaction_events(tx_hash: str) -> TxEventIndex:
+    """
+    Fetches a transaction with its results and indexes all its log events.
+
+    Args:
+        tx_hash (str): The hash of the transaction.
+
+    Returns:
+        TxEventIndex: The decoded events of the transaction and of its smart contract results.
+    """
+    logger.info("Fetching events for tx: %s", tx_hash)
+    response = requests.get(f"{DEFAULT_PROXY}/transaction/{tx_hash}?withResults=true")
+    response.raise_for_status()
+    transaction = response.json().get("data", {}).get("transaction", {})
+    return index_transaction_events(transaction)
+
+
 def get_token_identifier_from_esdt_tx(tx_hash: str) -> str:
-    logger.info(f"Fetching token identifier from tx: {tx_hash}")
+    logger.info("Fetching token identifier from tx: %s", tx_hash)
     try:
-        response = requests.get(
-            f"{DEFAULT_PROXY}/transaction/{tx_hash}?withResults=true"
-        )
-        response.raise_for_status()
-        parsed = response.json()
-
-        transaction = parsed.get("data", {}).get("transaction", {})
-        logs = transaction.get("logs", {}).get("events", [])
-        scrs = transaction.get("smartContractResults", [])
-
-        def extract_token_identifier(events):
-            for event in events:
-                if event.get("identifier") in ["issueNonFungible", "issue"]:
-                    topics = event.get("topics", [])
-                    if topics:
-                        encoded_identifier = topics[0]
-                        return base64.b64decode(encoded_identifier).decode("utf-8")
-            return None
-
-        token_identifier = extract_token_identifier(logs)
-
-        if not token_identifier:
-            for scr in scrs:
-                events = scr.get("logs", {}).get("events", [])
-                token_identifier = extract_token_identifier(events)
-                if token_identifier:
-                    break
-
-        if token_identifier:
-            logger.info(
-                f"Token identifier found: {token_identifier} for tx_hash: {tx_hash}"
-            )
-        else:
-            logger.error(f"No token identifier found for tx_hash: {tx_hash}")
-
-        return token_identifier
-
+        events = get_transaction_events(tx_hash)
     except requests.RequestException as e:
         logger.error(
-            f"Failed to fetch transaction details for tx_hash: {tx_hash} due to {e}"
+            "Failed to fetch transaction details for tx_hash: %s due to %s", tx_hash, e
+        )
+        return None
+
+    # an NFT collection issue also logs a plain issue event, the specific one wins
+    event = events.first("issueNonFungible") or events.first("issue")
+    token_identifier = event.fields.get("token_identifier") if event else None
+
+    if token_identifier:
+        logger.info(
+            "Token identifier found: %s for tx_hash: %s", token_identifier, tx_hash
         )
+    else:
+        logger.error("No token identifier found for tx_hash: %s", tx_hash)
+
+    return token_identifier
+
+
+def get_created_nft_nonce_from_tx(tx_hash: str) -> int:
+    """
+    Retrieves the nonce assigned to the token created by an ESDTNFTCreate transaction.
+
+    Args:
+        tx_hash (str): The hash of the ESDTNFTCreate transaction.
+
+    Returns:
+        int: The nonce of the created token, or None if no ESDTNFTCreate event is found.
+    """
+    logger.info("Fetching created NFT nonce from tx: %s", tx_hash)
+    event = get_transaction_events(tx_hash).first("ESDTNFTCreate")
+    if event is None or not event.fields.get("token_nonce"):
+        logger.error("No ESDTNFTCreate event found for tx_hash: %s", tx_hash)
         return None
+
+    token_nonce = event.fields["token_nonce"]
+    logger.info("Created NFT nonce: %s for tx_hash: %s", token_nonce, tx_hash)
+    return token_nonce
@@ -1,80 +1,95 @@
-import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 import requests
 from multiversx_sdk.core.address import Address
 
-from config.config import DEFAULT_PROXY, OBSERVER_META
+from config.config import OBSERVER_META
 from config.constants import STAKING_CONTRACT, VALIDATOR_CONTRACT
+from core.vm_query import VmQuery, run_vm_queries
 from utils.caching import force_reset_validator_statistics
-from utils.helpers import base64_to_hex, base64_to_string
-from utils.logger import logger
+from utils.logger import get_logger
+from utils.read_cache import cached_read
+from utils.timing import timed
 
+logger = get_logger(__name__)
 
-def get_bls_key_status(owner_public_key_in_hex: list[str]):
-    logger.info(f"Fetching BLS key status for public keys")
-    key_status_pair = {}
 
-    post_body = {
-        "scAddress": "erd1qqqqqqqqqqqqqqqpqqqqqqqqqqqqqqqqqqqqqqqqqqqqqqqplllst77y4l",
-        "funcName": "getBlsKeysStatus",
-        "args": owner_public_key_in_hex,
-    }
+def _get_bls_keys_status_query(owner_public_key_in_hex: list[str]) -> VmQuery:
+    return VmQuery(
+        VALIDATOR_CONTRACT,
+        "getBlsKeysStatus",
+        owner_public_key_in_hex,
+        returns=("pairs", "hex", "string"),
+    )
 
-    json_structure = json.dumps(post_body)
-    response = requests.post(f"{DEFAULT_PROXY}/vm-values/query", data=json_structure)
-    response.raise_for_status()
-    parsed = response.json()
 
-    if '"returnData":null' in response.text:
+@timed
+def get_bls_key_status(owner_public_key_in_hex: list[str]):
+    logger.info("Fetching BLS key status for public keys")
+
+    [result] = run_vm_queries([_get_bls_keys_status_query(owner_public_key_in_hex)])
+
+    if not result.has_data:
         logger.warning("No return data available for BLS keys status")
         return None
 
-    general_data = parsed.get("data")
-    tx_response_data = general_data.get("data")
-    key_status_temp_list = tx_response_data.get("returnData")
+    logger.info("Successfully retrieved BLS key statuses")
+    return result.values
+
+
+@timed
+def get_bls_keys_status_for_owners(owners: list[str]) -> dict[str, dict]:
+    """
+    Fetches getBlsKeysStatus for many owners with one concurrent batch of queries.
 
-    # convert all elements from list to hex and add to final dict:
-    for i in range(0, len(key_status_temp_list), 2):
-        bls_decoded = base64_to_hex(key_status_temp_list[i])
-        status_decoded = base64_to_string(key_status_temp_list[i + 1])
+    Args:
+        owners (list[str]): The bech32 addresses of the owners.
+
+    Returns:
+        dict[str, dict]: The status of each BLS key, per owner. Owners without
+            keys map to an empty dict.
+    """
+    logger.info("Fetching BLS key status for %s owners", len(owners))
+    results = run_vm_queries(
+        [
+            _get_bls_keys_status_query([Address.from_bech32(owner).to_hex()])
+            for owner in owners
+        ]
+    )
+    return {
+        owner: (result.values if result.has_data else {})
+        for owner, result in zip(owners, results)
+    }
 
-        key_status_pair[bls_decoded] = status_decoded
 
-    logger.info(f"Successfully retrieved BLS key statuses")
-    return key_status_pair
+def _get_owner_query(public_validator_key: list[str]) -> VmQuery:
+    return VmQuery(
+        STAKING_CONTRACT,
+        "getOwner",
+        public_validator_key,
+        returns=["address"],
+        caller=VALIDATOR_CONTRACT,
+    )
 
 
+@timed
 def get_owner(public_validator_key: list[str]) -> str:
-    logger.info(f"Fetching owner for public validator key")
-    post_body = {
-        "scAddress": STAKING_CONTRACT,
-        "funcName": "getOwner",
-        "caller": VALIDATOR_CONTRACT,
-        "args": public_validator_key,
-    }
+    logger.info("Fetching owner for public validator key")
 
-    json_structure = json.dumps(post_body)
-    response = requests.post(f"{DEFAULT_PROXY}/vm-values/query", data=json_structure)
-    response.raise_for_status()
-    parsed = response.json()
+    [result] = run_vm_queries([_get_owner_query(public_validator_key)])
 
-    if '"returnMessage":"owner address is nil"' in response.text:
+    if result.return_message == "owner address is nil":
         logger.warning("No owner address found for given validator key")
         return "validatorKey not staked"
 
-    general_data = parsed.get("data")
-    tx_response_data = general_data.get("data")
-    address_list = tx_response_data.get("returnData")
-    address = address_list[0]
-
-    address = base64_to_hex(address)
-    address = Address.from_hex(address, "erd").to_bech32()
-
-    logger.info(f"Owner address successfully retrieved: {address}")
+    address = result.value()
+    logger.info("Owner address successfully retrieved: %s", address)
     return address
 
 
 # using validator/statistics
+@timed
 def get_keys_state(keys: list) -> list[str]:
     logger.info("Fetching states for validator keys")
     states = []
@@ -95,13 +110,14 @@ def get_keys_state(keys: list) -> list[str]:
             state = key_data.get("validatorStatus")
             states.append(state)
 
-    logger.info(f"Successfully retrieved states for {len(states)} keys")
+    logger.info("Successfully retrieved states for %s keys", len(states))
     return states
 
 
+@timed
 def get_keys_from_validator_auction(isQualified=True) -> list[str]:
     logger.info(
-        f"Fetching keys from validator auction with qualification status {isQualified}"
+        "Fetching keys from validator auction with qualification status %s", isQualified
     )
 
     keys = []
@@ -122,14 +138,15 @@ def get_keys_from_validator_auction(isQualified=True) -> list[str]:
                 keys.append(node_list.get("blsKey"))
 
     logger.info(
-        f"Successfully retrieved {len(keys)} qualified keys from validator auction"
+        "Successfully retrieved %s qualified keys from validator auction", len(keys)
     )
     return keys
 
 
+@timed
 def get_keys_from_validator_statistics(needed_state: str) -> list[str]:
     logger.info(
-        f"Fetching keys from validator statistics with needed state: {needed_state}"
+        "Fetching keys from validator statistics with needed state: %s", needed_state
     )
     keys = []
 
@@ -149,6 +166,136 @@ def get_keys_from_validator_statistics(needed_state: str) -> list[str]:
             keys.append(dict)
 
     logger.info(
-        f"Successfully retrieved {len(keys)} keys with state '{needed_state}' from validator statistics"
+        "Successfully retrieved %s keys with state '%s' from validator statistics",
+        len(keys),
+        needed_state,
     )
     return keys
+
+
+def _fetch_validator_route(route: str, field: str):
+    response = requests.get(f"{OBSERVER_META}/validator/{route}")
+    response.raise_for_status()
+    return response.json().get("data", {}).get(field)
+
+
+@dataclass
+class ValidatorKeyState:
+    """The state of one BLS key, joined from all sources."""
+
+    key: str
+    # getOwner, None if the key is not staked
+    owner: str = None
+    # getBlsKeysStatus of the owner, e.g. staked, queued, jailed, unStaked
+    status: str = None
+    # validatorStatus of /validator/statistics, e.g. eligible, waiting, auction, jailed
+    state: str = None
+    # whether the key is in the auction list of /validator/auction
+    in_auction: bool = False
+    qualified: bool = None
+    auction_owner: str = None
+
+
+@timed
+def get_validator_states(
+    keys: list[str], reset: bool = True
+) -> dict[str, ValidatorKeyState]:
+    """
+    Fetches the state of many BLS keys from getOwner, getBlsKeysStatus,
+    /validator/statistics and /validator/auction in one pass and joins them.
+
+    The statistics and auction routes are read once per block through the
+    read cache, the VM queries run as concurrent batches: one getOwner per key,
+    then one getBlsKeysStatus per owner.
+
+    Args:
+        keys (list[str]): The hex BLS keys.
+        reset (bool): Force a validator statistics reset first (adds a block),
+            as the single-key helpers do.
+
+    Returns:
+        dict[str, ValidatorKeyState]: The state of each key.
+    """
+    logger.info("Fetching validator states of %s keys", len(keys))
+    if reset:
+        force_reset_validator_statistics()
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        statistics = executor.submit(
+            cached_read,
+            "validator/statistics",
+            (),
+            lambda: _fetch_validator_route("statistics", "statistics"),
+        )
+        auction_list = executor.submit(
+            cached_read,
+            "validator/auction",
+            (),
+            lambda: _fetch_validator_route("auction", "auctionList"),
+        )
+        owners = executor.submit(
+            run_vm_queries, [_get_owner_query([key]) for key in keys]
+        )
+        statistics = statistics.result() or {}
+        auction_list = auction_list.result() or []
+        owner_results = owners.result()
+
+    states = {key: ValidatorKeyState(key) for key in keys}
+    for state, result in zip(states.values(), owner_results):
+        if result.has_data and result.return_message != "owner address is nil":
+            state.owner = result.value()
+        key_statistics = statistics.get(state.key)
+        if key_statistics is not None:
+            state.state = key_statistics.get("validatorStatus")
+
+    for entry in auction_list:
+        for node in entry.get("nodes") or []:
+            state = states.get(node.get("blsKey"))
+            if state is not None:
+                state.in_auction = True
+                state.qualified = node.get("qualified")
+                state.auction_owner = entry.get("owner")
+
+    owners = sorted({state.owner for state in states.values() if state.owner})
+    for owner, bls_keys_status in get_bls_keys_status_for_owners(owners).items():
+        for key, status in bls_keys_status.items():
+            if key in states and states[key].owner == owner:
+                states[key].status = status
+
+    return states
+
+
+def validator_state_inconsistencies(states: dict[str, ValidatorKeyState]) -> list[str]:
+    """
+    Lists the contradictions between the sources of get_validator_states, one
+    message per finding. An empty list means all sources agree.
+    """
+    findings = []
+    for key, state in states.items():
+        if state.in_auction and state.state not in (None, "auction"):
+            findings.append(
+                f"{key}: in the auction list but {state.state} in the statistics"
+            )
+        if state.state == "auction" and not state.in_auction:
+            findings.append(
+                f"{key}: auction in the statistics but not in the auction list"
+            )
+        if state.auction_owner and state.auction_owner != state.owner:
+            findings.append(
+                f"{key}: auction list owner {state.auction_owner} but getOwner {state.owner}"
+            )
+        if state.owner and state.status is None:
+            findings.append(
+                f"{key}: owned by {state.owner} but missing from its getBlsKeysStatus"
+            )
+        if state.owner is None and state.state in ("eligible", "waiting", "auction"):
+            findings.append(f"{key}: {state.state} in the statistics but has no owner")
+        if state.status == "queued" and state.state in ("eligible", "waiting"):
+            findings.append(
+                f"{key}: queued in the validator contract but {state.state}"
+            )
+        if (state.status == "jailed") != (state.state == "jailed") and state.state:
+            findings.append(
+                f"{key}: {state.status} in the validator contract but {state.state} in the statistics"
+            )
+    return findings
@@ -1,30 +1,39 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from multiversx_sdk.core import Transaction, TransactionComputer
-from multiversx_sdk.wallet.validator_pem import ValidatorPEM
-from multiversx_sdk.wallet.validator_signer import ValidatorSigner
 
 from config.config import CHAIN_ID
 from config.constants import *
-from models.validatorKey import ValidatorKey
+from core.create_relayed_v3_transaction import send_transactions_and_wait_for_execution
+from core.get_staking_info import get_total_staked_for_owners
+from core.get_validator_info import get_bls_keys_status_for_owners
+from models.validatorKey import ValidatorKey, initialize_bls
 from models.wallet import *
 from utils.helpers import *
+from utils.logger import get_logger
+from utils.timing import timed
 
+logger = get_logger(__name__)
 
-def stake(wallet: Wallet, validatorKeys: list[ValidatorKey]):
+
+def _stake_data(wallet: Wallet, validatorKeys: list[ValidatorKey]) -> str:
     # nr of nodes staked
-    nr_of_nodes_staked = len(validatorKeys)
-    nr_of_nodes_staked = decimal_to_hex(nr_of_nodes_staked)
+    nr_of_nodes_staked = decimal_to_hex(len(validatorKeys))
 
     # load needed data for stake transactions signatures
     stake_signature_and_public_key = ""
     for key in validatorKeys:
-        pem_file = ValidatorPEM.from_file(key.path)
         public_key = key.public_address()
-
-        validator_signer = ValidatorSigner(pem_file.secret_key)
-        signed_message = validator_signer.sign(wallet.get_address().pubkey).hex()
+        signed_message = key.stake_signature(wallet.get_address().pubkey)
 
         stake_signature_and_public_key += f"@{public_key}@{signed_message}"
 
+    return f"stake@{nr_of_nodes_staked}{stake_signature_and_public_key}"
+
+
+@timed
+def stake(wallet: Wallet, validatorKeys: list[ValidatorKey]):
     # compute value of tx
     amount = str(len(validatorKeys) * 2500) + "000000000000000000"
 
@@ -39,7 +48,7 @@ def stake(wallet: Wallet, validatorKeys: list[ValidatorKey]):
         value=int(amount),
     )
 
-    tx.data = (f"stake@{nr_of_nodes_staked}{stake_signature_and_public_key}").encode()
+    tx.data = _stake_data(wallet, validatorKeys).encode()
 
     # prepare signature
     tx_comp = TransactionComputer()
@@ -51,10 +60,11 @@ def stake(wallet: Wallet, validatorKeys: list[ValidatorKey]):
     # send tx
     tx_hash = proxy_default.send_transaction(tx)
 
-    logger.info(f"Staking transaction sent, transaction hash: {tx_hash}")
+    logger.info("Staking transaction sent, transaction hash: %s", tx_hash)
     return tx_hash
 
 
+@timed
 def malicious_stake(
     wallet: Wallet,
     validatorKeys: list[ValidatorKey],
@@ -68,11 +78,8 @@ def malicious_stake(
     # load needed data for stake transactions signatures
     stake_signature_and_public_key = ""
     for key in validatorKeys:
-        pem_file = ValidatorPEM.from_file(key.path)
         public_key = key.public_address()
-
-        validator_signer = ValidatorSigner(pem_file.secret_key)
-        signed_message = validator_signer.sign(wallet.get_address().pubkey).hex()
+        signed_message = key.stake_signature(wallet.get_address().pubkey)
 
         stake_signature_and_public_key += f"@{public_key}@{signed_message}"
 
@@ -111,10 +118,11 @@ def malicious_stake(
     # send tx
     tx_hash = proxy_default.send_transaction(tx)
 
-    logger.info(f"Malicious staking transaction sent, transaction hash: {tx_hash}")
+    logger.info("Malicious staking transaction sent, transaction hash: %s", tx_hash)
     return tx_hash
 
 
+@timed
 def unStake(wallet: Wallet, validator_key: ValidatorKey) -> str:
     # create transaction
     tx = Transaction(
@@ -140,11 +148,14 @@ def unStake(wallet: Wallet, validator_key: ValidatorKey) -> str:
     tx_hash = proxy_default.send_transaction(tx)
 
     logger.info(
-        f"Unstaking transaction sent for key {validator_key.public_address()}, transaction hash: {tx_hash}"
+        "Unstaking transaction sent for key %s, transaction hash: %s",
+        validator_key.public_address(),
+        tx_hash,
     )
     return tx_hash
 
 
+@timed
 def unBondNodes(wallet: Wallet, validator_key: ValidatorKey) -> str:
     # create transaction
     tx = Transaction(
@@ -170,7 +181,9 @@ def unBondNodes(wallet: Wallet, validator_key: ValidatorKey) -> str:
     tx_hash = proxy_default.send_transaction(tx)
 
     logger.info(
-        f"Un-bonding nodes transaction sent for key {validator_key.public_address()}, transaction hash: {tx_hash}"
+        "Un-bonding nodes transaction sent for key %s, transaction hash: %s",
+        validator_key.public_address(),
+        tx_hash,
     )
     return tx_hash
 
@@ -190,11 +203,8 @@ def create_and_sign_relayed_staking_tx(
     # load needed data for stake transactions signatures
     stake_signature_and_public_key = ""
     for key in validator_keys:
-        pem_file = ValidatorPEM.from_file(key.path)
         public_key = key.public_address()
-
-        validator_signer = ValidatorSigner(pem_file.secret_key)
-        signed_message = validator_signer.sign(sender_wallet.get_address().pubkey).hex()
+        signed_message = key.stake_signature(sender_wallet.get_address().pubkey)
 
         stake_signature_and_public_key += f"@{public_key}@{signed_message}"
 
@@ -221,7 +231,103 @@ def create_and_sign_relayed_staking_tx(
     tx.signature = signature
 
     logger.info(
-        f"Created and signed staking transaction from {sender_wallet.public_address()} to {VALIDATOR_CONTRACT} for amount {amount}."
+        "Created and signed staking transaction from %s to %s for amount %s.",
+        sender_wallet.public_address(),
+        VALIDATOR_CONTRACT,
+        amount,
     )
 
     return tx
+
+
+@timed
+def stake_wave(
+    stakes: list[tuple[Wallet, list[ValidatorKey], int]],
+    batch_size: int = TX_BATCH_SIZE,
+) -> list[dict]:
+    """
+    Stakes for many owners at once: all stake transactions are signed upfront,
+    sent in batches and confirmed with one block-generation loop.
+
+    Args:
+        stakes (list[tuple]): (owner wallet, keys, top-up) tuples; the top-up is
+            staked on top of the node price of the keys. An owner may appear more
+            than once, its transactions get consecutive nonces.
+        batch_size (int): How many transactions are posted in one request.
+
+    Returns:
+        list[dict]: One row per tuple with owner, keys, top_up, tx_hash, status
+            ("skipped" after a rejected transaction of the same owner), and the owner's total_staked (getTotalStaked) and bls_keys_status
+            (getBlsKeysStatus) after the wave.
+    """
+    logger.info("Staking wave for %s owners", len(stakes))
+    wallets = list(
+        {wallet.public_address(): wallet for wallet, _, _ in stakes}.values()
+    )
+
+    # stake signatures, nonces and signers are prepared concurrently
+    initialize_bls()
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(
+            executor.map(
+                lambda pair: pair[1].stake_signature(pair[0]),
+                [
+                    (wallet.get_address().pubkey, key)
+                    for wallet, keys, _ in stakes
+                    for key in keys
+                ],
+            )
+        )
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        list(executor.map(lambda wallet: wallet.get_nonce(), wallets))
+    signers = {wallet.public_address(): wallet.get_signer() for wallet in wallets}
+
+    tx_comp = TransactionComputer()
+    transactions = []
+    for wallet, keys, top_up in stakes:
+        tx = Transaction(
+            sender=wallet.public_address(),
+            receiver=VALIDATOR_CONTRACT,
+            nonce=wallet.get_nonce_and_increment(),
+            gas_price=GAS_PRICE,
+            gas_limit=200000000,
+            chain_id=CHAIN_ID,
+            value=len(keys) * NODE_PRICE + top_up,
+        )
+        tx.data = _stake_data(wallet, keys).encode()
+        tx.signature = signers[wallet.public_address()].sign(
+            tx_comp.compute_bytes_for_signing(tx)
+        )
+        transactions.append(tx)
+
+    outcomes = send_transactions_and_wait_for_execution(
+        transactions, batch_size, [wallet for wallet, _, _ in stakes]
+    )
+
+    owners = [wallet.public_address() for wallet in wallets]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        total_staked = executor.submit(get_total_staked_for_owners, owners)
+        bls_keys_status = executor.submit(get_bls_keys_status_for_owners, owners)
+        total_staked = total_staked.result()
+        bls_keys_status = bls_keys_status.result()
+
+    table = []
+    for (wallet, keys, top_up), (tx_hash, status) in zip(stakes, outcomes):
+        owner = wallet.public_address()
+        table.append(
+            {
+                "owner": owner,
+                "keys": [key.public_address() for key in keys],
+                "top_up": top_up,
+                "tx_hash": tx_hash,
+                "status": status,
+                "total_staked": total_staked[owner],
+                "bls_keys_status": bls_keys_status[owner],
+            }
+        )
+    logger.info(
+        "Staking wave done: %s of %s transactions successful",
+        sum(row["status"] == "success" for row in table),
+        len(table),
+    )
+    return table
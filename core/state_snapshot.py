@@ -0,0 +1,90 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from config.config import DEFAULT_PROXY
+from config.constants import MAX_CONCURRENT_REQUESTS
+from utils.http_client import session
+from utils.logger import get_logger
+from utils.read_cache import invalidate_read_cache
+from utils.timing import timed
+
+logger = get_logger(__name__)
+
+# account fields accepted back by /simulator/set-state
+_ACCOUNT_FIELDS = (
+    "nonce",
+    "balance",
+    "code",
+    "codeHash",
+    "rootHash",
+    "codeMetadata",
+    "ownerAddress",
+    "developerReward",
+)
+
+
+def _capture_account(address: str) -> dict:
+    response = session.get(f"{DEFAULT_PROXY}/address/{address}")
+    response.raise_for_status()
+    account = response.json().get("data", {}).get("account", {})
+
+    response = session.get(f"{DEFAULT_PROXY}/address/{address}/keys")
+    response.raise_for_status()
+    keys = response.json().get("data", {}).get("pairs") or {}
+
+    state = {"address": address}
+    for field in _ACCOUNT_FIELDS:
+        if account.get(field) not in (None, ""):
+            state[field] = account[field]
+    state["keys"] = keys
+    return state
+
+
+@timed
+def capture_state(addresses: list[str]) -> list[dict]:
+    """
+    Reads the account fields and the whole storage of many accounts concurrently,
+    in the format of /simulator/set-state.
+
+    Args:
+        addresses (list[str]): The bech32 addresses, system contracts included.
+
+    Returns:
+        list[dict]: One set-state entry per address.
+    """
+    logger.info("Capturing the state of %s accounts", len(addresses))
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        return list(executor.map(_capture_account, addresses))
+
+
+@timed
+def restore_state(accounts: list[dict], overwrite: bool = True) -> str:
+    """
+    Writes captured accounts back with one request.
+
+    Args:
+        accounts (list[dict]): Entries returned by capture_state.
+        overwrite (bool): Replace the accounts, dropping storage keys written
+            after the capture, instead of merging into them.
+
+    Returns:
+        str: The response text.
+    """
+    route = "set-state-overwrite" if overwrite else "set-state"
+    logger.info("Restoring the state of %s accounts", len(accounts))
+    response = session.post(
+        f"{DEFAULT_PROXY}/simulator/{route}", data=json.dumps(accounts)
+    )
+    invalidate_read_cache(route)
+    response.raise_for_status()
+    return response.text
+
+
+def save_snapshot(accounts: list[dict], path: str):
+    with open(path, "w") as f:
+        json.dump(accounts, f)
+
+
+def load_snapshot(path: str) -> list[dict]:
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,195 @@
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from multiversx_sdk.converters.transactions_converter import TransactionsConverter
+
+from config.config import DEFAULT_PROXY
+from config.constants import GAS_LIMIT_MARGIN, MAX_CONCURRENT_REQUESTS
+from utils.http_client import session
+from utils.logger import get_logger
+from utils.timing import timed
+from utils.tx_events import index_transaction_events
+
+logger = get_logger(__name__)
+
+transaction_converter = TransactionsConverter()
+
+
+@dataclass
+class PreflightResult:
+    # "success", "fail", or "rejected" when the proxy refuses the transaction
+    status: str
+    error: str
+    # gas units estimated by /transaction/cost, None when not estimated
+    gas_units: int
+    # hash of the simulated transaction, which is not on chain
+    tx_hash: str
+
+
+def _simulation_outcome(result: dict) -> tuple[str, str]:
+    # cross-shard transactions are simulated in both shards, the sender shard first
+    if "senderShard" in result:
+        status, error = _simulation_outcome(result["senderShard"])
+        if status != "success" or not result.get("receiverShard"):
+            return status, error
+        return _simulation_outcome(result["receiverShard"])
+
+    if result.get("failReason"):
+        return "fail", result["failReason"]
+    scrs = list((result.get("scResults") or {}).values())
+    events = index_transaction_events(
+        {"logs": result.get("logs"), "smartContractResults": scrs}
+    )
+    event = events.first("signalError")
+    if event is not None:
+        return "fail", event.fields.get("message") or event.data.decode(
+            errors="replace"
+        )
+    for scr in scrs:
+        if scr.get("returnMessage"):
+            return "fail", scr["returnMessage"]
+    return result.get("status", "success"), ""
+
+
+def _parse(response, endpoint: str) -> dict:
+    try:
+        return response.json()
+    except ValueError:
+        # e.g. the HTML error page of a gateway in front of the proxy
+        response.raise_for_status()
+        raise ValueError(
+            f"Malformed {endpoint} response (HTTP {response.status_code}): "
+            f"{response.text[:200]!r}"
+        )
+
+
+def _simulate(payload: dict, check_signature: bool) -> PreflightResult:
+    response = session.post(
+        f"{DEFAULT_PROXY}/transaction/simulate",
+        params=None if check_signature else {"checkSignature": "false"},
+        data=json.dumps(payload),
+    )
+    parsed = _parse(response, "/transaction/simulate")
+    if not response.ok or parsed.get("error"):
+        return PreflightResult(
+            "rejected", parsed.get("error", response.text), None, None
+        )
+    result = parsed.get("data", {}).get("result", {})
+    status, error = _simulation_outcome(result)
+    return PreflightResult(status, error, None, result.get("hash"))
+
+
+def _cost(payload: dict) -> tuple[int, str]:
+    response = session.post(
+        f"{DEFAULT_PROXY}/transaction/cost", data=json.dumps(payload)
+    )
+    parsed = _parse(response, "/transaction/cost")
+    if not response.ok or parsed.get("error"):
+        return None, parsed.get("error", response.text)
+    data = parsed.get("data", {})
+    return int(data.get("txGasUnits") or 0), data.get("returnMessage", "")
+
+
+def _preflight(payload: dict, check_signature: bool, estimate_gas: bool):
+    result = _simulate(payload, check_signature)
+    if estimate_gas and result.status != "rejected":
+        result.gas_units, return_message = _cost(payload)
+        if return_message and result.status == "success":
+            result.status, result.error = "fail", return_message
+    return result
+
+
+@timed
+def preflight_transactions(
+    transactions: list, check_signature: bool = True, estimate_gas: bool = True
+) -> list[PreflightResult]:
+    """
+    Runs transactions through the proxy's simulate and cost endpoints, without
+    sending them or generating blocks.
+
+    The proxy simulates one transaction per request, so the requests are made
+    MAX_CONCURRENT_REQUESTS at a time over the pooled session. Transactions of
+    the same sender are simulated against the current account state, not after
+    each other, so only the first one of a nonce sequence is accurate.
+
+    Args:
+        transactions (list): The transactions, signed unless check_signature is False.
+        check_signature (bool): Let the proxy verify the signatures.
+        estimate_gas (bool): Also estimate the gas units with /transaction/cost.
+
+    Returns:
+        list[PreflightResult]: The predicted status, error and gas units,
+            aligned with the given transactions.
+    """
+    payloads = [
+        transaction_converter.transaction_to_dictionary(tx) for tx in transactions
+    ]
+    logger.info("Pre-flight of %s transactions", len(payloads))
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        return list(
+            executor.map(
+                lambda payload: _preflight(payload, check_signature, estimate_gas),
+                payloads,
+            )
+        )
+
+
+def fit_gas_limit(gas_units: int, margin: float = GAS_LIMIT_MARGIN) -> int:
+    return math.ceil(gas_units * margin)
+
+
+@timed
+def fit_gas_limits(transactions: list, margin: float = GAS_LIMIT_MARGIN) -> list[int]:
+    """
+    Estimates the gas limits of unsigned transactions, instead of hardcoding them.
+
+    Set the limits on the transactions before signing them; transactions whose
+    cost cannot be estimated keep their own gas limit.
+
+    Args:
+        transactions (list): The transactions, signatures are not needed.
+        margin (float): Multiplier applied to the estimated gas units.
+
+    Returns:
+        list[int]: The fitted gas limits, aligned with the given transactions.
+    """
+    payloads = [
+        transaction_converter.transaction_to_dictionary(tx) for tx in transactions
+    ]
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        costs = list(executor.map(_cost, payloads))
+    return [
+        fit_gas_limit(gas_units, margin) if gas_units else tx.gas_limit
+        for tx, (gas_units, _) in zip(transactions, costs)
+    ]
+
+
+@timed
+def check_for_fail_without_execution(transaction, error: str = None) -> PreflightResult:
+    """
+    Asserts that a transaction would fail, optionally with an error, by simulating
+    it instead of sending it and generating blocks until it is executed. A
+    transaction rejected by the proxy does not count as failed.
+
+    Args:
+        transaction (Transaction): The signed transaction.
+        error (str, optional): A text the predicted error must contain.
+
+    Returns:
+        PreflightResult: The prediction.
+    """
+    [result] = preflight_transactions([transaction], estimate_gas=False)
+    logger.info(
+        "Pre-flight status: %s, error: %s for tx_hash: %s",
+        result.status,
+        result.error,
+        result.tx_hash,
+    )
+    # a rejection means the transaction itself is malformed, not the failure under test
+    assert result.status != "rejected", f"Transaction rejected: {result.error}"
+    assert result.status == "fail", f"Transaction would not fail: {result}"
+    if error is not None:
+        assert error in result.error, result
+    return result
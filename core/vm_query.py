@@ -0,0 +1,185 @@
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from multiversx_sdk.core.address import Address
+
+from config.config import DEFAULT_PROXY
+from config.constants import MAX_CONCURRENT_REQUESTS
+from core.chain_commander import get_block
+from utils.http_client import session
+from utils.logger import get_logger
+from utils.read_cache import (
+    get_cached,
+    read_cache_enabled,
+    read_generation,
+    store_cached,
+)
+from utils.timing import timed
+
+logger = get_logger(__name__)
+
+_CACHE_ENDPOINT = "vm-values/query"
+
+_return_data_decoders = {
+    "bigint": lambda raw: int.from_bytes(raw, "big"),
+    "string": lambda raw: raw.decode("utf-8"),
+    "address": lambda raw: Address.from_hex(raw.hex(), "erd").to_bech32(),
+    "hex": lambda raw: raw.hex(),
+    "base64": lambda raw: base64.b64encode(raw).decode(),
+}
+
+
+class VmQuery:
+    """
+    A /vm-values/query call together with the schema of its returnData.
+
+    The schema (returns) can be:
+        - a list of kinds, decoding returnData positionally ("bigint", "string",
+          "address", "hex", "base64"); extra return values are dropped,
+        - ("repeat", kind) to decode every return value with the same kind,
+        - ("pairs", key_kind, value_kind) to decode a flat key/value list into a dict.
+    """
+
+    def __init__(
+        self,
+        sc_address: str,
+        func_name: str,
+        args: list[str] = None,
+        returns=("repeat", "base64"),
+        caller: str = None,
+    ) -> None:
+        self.sc_address = sc_address
+        self.func_name = func_name
+        self.args = list(args or [])
+        self.returns = returns
+        self.caller = caller
+
+    def cache_key(self) -> tuple:
+        return (self.sc_address, self.func_name, tuple(self.args), self.caller)
+
+    def to_payload(self) -> dict:
+        payload = {
+            "scAddress": self.sc_address,
+            "funcName": self.func_name,
+            "args": self.args,
+        }
+        if self.caller:
+            payload["caller"] = self.caller
+        return payload
+
+    def decode(self, return_data: list):
+        raw_values = [base64.b64decode(value or "") for value in return_data]
+        if self.returns[0] == "repeat":
+            decoder = _return_data_decoders[self.returns[1]]
+            return [decoder(raw) for raw in raw_values]
+        if self.returns[0] == "pairs":
+            key_decoder = _return_data_decoders[self.returns[1]]
+            value_decoder = _return_data_decoders[self.returns[2]]
+            return {
+                key_decoder(raw_values[i]): value_decoder(raw_values[i + 1])
+                for i in range(0, len(raw_values) - 1, 2)
+            }
+        return [
+            _return_data_decoders[kind](raw)
+            for kind, raw in zip(self.returns, raw_values)
+        ]
+
+
+class VmQueryResult:
+    def __init__(self, query: VmQuery, response_data: dict) -> None:
+        self.query = query
+        self.return_code = response_data.get("returnCode", "")
+        self.return_message = response_data.get("returnMessage", "")
+        self.raw_return_data = response_data.get("returnData")
+        self.values = (
+            query.decode(self.raw_return_data)
+            if self.raw_return_data is not None
+            else None
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.return_code == "ok"
+
+    @property
+    def has_data(self) -> bool:
+        return bool(self.raw_return_data)
+
+    def value(self, index: int = 0):
+        """Returns one decoded return value, or None if the query returned no data."""
+        if not self.values or index >= len(self.values):
+            return None
+        return self.values[index]
+
+
+def run_vm_query(query: VmQuery) -> VmQueryResult:
+    logger.debug("Running vm query %s on %s", query.func_name, query.sc_address)
+    response = session.post(
+        f"{DEFAULT_PROXY}/vm-values/query", data=json.dumps(query.to_payload())
+    )
+    response.raise_for_status()
+    response_data = response.json().get("data", {}).get("data") or {}
+    return VmQueryResult(query, response_data)
+
+
+@timed
+def run_vm_queries(
+    queries: list[VmQuery], use_cache: bool = True, block_nonce: int = None
+) -> list[VmQueryResult]:
+    """
+    Runs a batch of VM queries concurrently over the pooled session.
+
+    Results are kept in the read cache per (contract, function, args, caller)
+    and tagged with the current block nonce, so they are dropped as soon as a
+    block is generated or the state is changed.
+
+    Args:
+        queries (list[VmQuery]): The queries to run.
+        use_cache (bool): Reuse results obtained at the same block nonce; ignored
+            when the read cache is disabled, i.e. outside of the simulator.
+        block_nonce (int, optional): The current block nonce, if already known.
+
+    Returns:
+        list[VmQueryResult]: The results, aligned with the given queries.
+    """
+    results = [None] * len(queries)
+    to_run = list(range(len(queries)))
+
+    # the block nonce is only needed to key cache entries
+    use_cache = use_cache and read_cache_enabled()
+    if use_cache:
+        generation = read_generation()
+        if block_nonce is None:
+            block_nonce = get_block()
+        to_run = []
+        for index, query in enumerate(queries):
+            cached = get_cached(_CACHE_ENDPOINT, (query.cache_key(), block_nonce))
+            if cached is None:
+                to_run.append(index)
+            else:
+                results[index] = VmQueryResult(query, cached)
+
+    if to_run:
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            fetched = executor.map(run_vm_query, [queries[i] for i in to_run])
+            for index, result in zip(to_run, fetched):
+                results[index] = result
+                if use_cache:
+                    store_cached(
+                        _CACHE_ENDPOINT,
+                        (result.query.cache_key(), block_nonce),
+                        {
+                            "returnCode": result.return_code,
+                            "returnMessage": result.return_message,
+                            "returnData": result.raw_return_data,
+                        },
+                        generation,
+                    )
+
+    logger.info(
+        "Ran %s vm queries, %s served from cache",
+        len(to_run),
+        len(queries) - len(to_run),
+    )
+    return results
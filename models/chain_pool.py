@@ -0,0 +1,48 @@
+from config.topology import TopologyProfile, set_active_topology
+from core.chain_commander import get_epoch, is_chain_online
+from models.chain_simulator import ChainSimulator
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ChainPool:
+    """
+    Keeps a running chain simulator between tests that can share chain
+    progression, keyed by topology.
+
+    A test asking for an epoch that the chain has already passed gets a fresh
+    chain. Only one simulator can serve the proxy port, so asking for another
+    topology stops the running chain first.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.topology_key = None
+        self.chain = None
+        self.started_chains = 0
+
+    def acquire(self, topology: TopologyProfile, epoch: int = None) -> ChainSimulator:
+        if self.chain is not None and self.topology_key != topology.key():
+            logger.info("Chain pool: switching topology to %s", topology.name)
+            self.release()
+        elif self.chain is not None and epoch is not None and get_epoch() > epoch:
+            logger.info("Chain pool: chain is past epoch %s, starting a new one", epoch)
+            self.release()
+
+        if self.chain is None:
+            self.chain = ChainSimulator(self.path, topology)
+            self.chain.start()
+            is_chain_online()
+            self.topology_key = topology.key()
+            self.started_chains += 1
+        else:
+            set_active_topology(topology)
+            logger.info("Chain pool: reusing the %s chain", topology.name)
+        return self.chain
+
+    def release(self):
+        if self.chain is not None:
+            self.chain.stop()
+        self.chain = None
+        self.topology_key = None
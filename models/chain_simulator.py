@@ -4,54 +4,43 @@ import subprocess
 import threading
 from pathlib import Path
 
-from config.config import (
-    log_level,
-    num_validators_meta,
-    num_validators_per_shard,
-    num_waiting_validators_meta,
-    num_waiting_validators_per_shard,
-    rounds_per_epoch,
-)
-from config.constants import CHAIN_SIMULATOR_FOLDER
-from utils.logger import logger
+from config.config import log_level
+from config.topology import TopologyProfile, active_topology, set_active_topology
+from utils.logger import get_logger
+from utils.read_cache import invalidate_read_cache
+
+logger = get_logger(__name__)
 
 
 class ChainSimulator:
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, topology: TopologyProfile = None) -> None:
         self.path = path
         self.log_level = log_level
-        self.num_validators_per_shard = num_validators_per_shard
-        self.num_validators_meta = num_validators_meta
-        self.num_waiting_validators_per_shard = num_waiting_validators_per_shard
-        self.num_waiting_validators_meta = num_waiting_validators_meta
-        self.rounds_per_epoch = rounds_per_epoch
+        self.topology = topology or active_topology()
+        self.num_validators_per_shard = self.topology.num_validators_per_shard
+        self.num_validators_meta = self.topology.num_validators_meta
+        self.num_waiting_validators_per_shard = (
+            self.topology.num_waiting_validators_per_shard
+        )
+        self.num_waiting_validators_meta = self.topology.num_waiting_validators_meta
+        self.rounds_per_epoch = self.topology.rounds_per_epoch
         self.process = None
         logger.info(
-            f"Trying to Initialize ChainSimulator with configuration at {path}\n"
+            "Trying to Initialize ChainSimulator with configuration at %s\n", path
         )
 
         # Check if the ChainSimulator binary exists in the specified path
-        if not os.path.exists(CHAIN_SIMULATOR_FOLDER + "/chainsimulator"):
+        if not os.path.exists(os.path.join(self.path, "chainsimulator")):
             logger.error("ChainSimulator binary not found at the specified path.")
             raise FileNotFoundError(
                 "ChainSimulator binary not found at the specified path."
             )
 
     def start(self):
-        command = f"./chainsimulator --rounds-per-epoch {rounds_per_epoch}\
-                                    -num-validators-per-shard {self.num_validators_per_shard} \
-                                    -num-waiting-validators-per-shard {num_waiting_validators_per_shard} \
-                                    -num-validators-meta {num_validators_meta} \
-                                    -num-waiting-validators-meta {num_waiting_validators_meta}"
-        command = " ".join(command.split())
-
-        flag = True
-        while flag:
-            if "  " in command:
-                command = command.replace("  ", " ")
-            else:
-                flag = False
-        logger.info(f"Starting ChainSimulator with command: {command}")
+        command = " ".join(["./chainsimulator"] + self.topology.command_flags())
+        logger.info("Starting ChainSimulator with command: %s", command)
+        invalidate_read_cache("chain simulator start")
+        set_active_topology(self.topology)
 
         self.process = subprocess.Popen(
             command,
@@ -59,7 +48,7 @@ class ChainSimulator:
             stderr=subprocess.PIPE,
             shell=True,
             preexec_fn=os.setsid,
-            cwd=CHAIN_SIMULATOR_FOLDER,
+            cwd=self.path,
         )
 
         stdout_thread = threading.Thread(
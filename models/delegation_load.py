@@ -0,0 +1,253 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from multiversx_sdk.core import Transaction, TransactionComputer
+
+from config.config import CHAIN_ID
+from config.constants import GAS_PRICE, MAX_CONCURRENT_REQUESTS, TX_BATCH_SIZE
+from core.create_relayed_v3_transaction import send_transactions_and_wait_for_execution
+from core.get_staking_info import get_users_active_stake
+from core.get_transaction_info import get_transaction_cost
+from models.wallet import Wallet, generate_wallets, set_balances
+from utils.helpers import decimal_to_hex
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DELEGATE = "delegate"
+UN_DELEGATE = "unDelegate"
+WITHDRAW = "withdraw"
+CLAIM_REWARDS = "claimRewards"
+
+OPERATION_GAS_LIMITS = {
+    DELEGATE: 12000000,
+    UN_DELEGATE: 12000000,
+    WITHDRAW: 12000000,
+    CLAIM_REWARDS: 6000000,
+}
+
+
+class DelegationLoad:
+    """
+    Drives many delegators against one delegation contract in waves.
+
+    Every wave signs all its transactions upfront, sends them in batches and
+    confirms them with one block-generation loop. The active stake each
+    delegator should have is tracked from the successful operations, so it
+    can be checked against getUserActiveStake in one concurrent batch.
+    """
+
+    def __init__(self, delegation_sc_address: str, delegators: list[Wallet]) -> None:
+        self.delegation_sc_address = delegation_sc_address
+        self.delegators = delegators
+        self.expected_active_stake = {
+            wallet.public_address(): 0 for wallet in delegators
+        }
+        self.reports = []
+        self._signers = {}
+        self._tx_computer = TransactionComputer()
+
+    @classmethod
+    def provision(
+        cls,
+        delegation_sc_address: str,
+        count: int,
+        egld_amount,
+        seed: int = 0,
+        output_dir: str = None,
+    ) -> "DelegationLoad":
+        """Generates count delegator wallets and funds all of them with one set-state request."""
+        delegators = generate_wallets(count, seed, output_dir)
+        set_balances(delegators, egld_amount)
+        return cls(delegation_sc_address, delegators)
+
+    def _signer(self, wallet: Wallet):
+        address = wallet.public_address()
+        if address not in self._signers:
+            self._signers[address] = wallet.get_signer()
+        return self._signers[address]
+
+    def _build(self, wallet: Wallet, operation: str, amount: int) -> Transaction:
+        value = 0
+        data = operation
+        if operation == DELEGATE:
+            value = amount
+        elif operation == UN_DELEGATE:
+            data = f"{UN_DELEGATE}@{decimal_to_hex(amount)}"
+        elif operation not in OPERATION_GAS_LIMITS:
+            raise ValueError(f"Unknown delegation operation: {operation}")
+
+        tx = Transaction(
+            sender=wallet.public_address(),
+            receiver=self.delegation_sc_address,
+            nonce=wallet.get_nonce_and_increment(),
+            gas_price=GAS_PRICE,
+            gas_limit=OPERATION_GAS_LIMITS[operation],
+            chain_id=CHAIN_ID,
+            value=value,
+            data=data.encode(),
+        )
+        tx.signature = self._signer(wallet).sign(
+            self._tx_computer.compute_bytes_for_signing(tx)
+        )
+        return tx
+
+    def run_wave(
+        self,
+        operations: list[tuple[Wallet, str, int]],
+        batch_size: int = TX_BATCH_SIZE,
+    ) -> dict:
+        """
+        Runs one wave of delegation operations.
+
+        Args:
+            operations (list[tuple]): (delegator, operation, amount) tuples, the
+                operation being delegate, unDelegate, withdraw or claimRewards;
+                the amount is ignored by withdraw and claimRewards.
+            batch_size (int): How many transactions are posted in one request.
+
+        Returns:
+            dict: The wave report, per operation: count, success, fail, rejected,
+                skipped (sent after a rejected one of the same delegator), gas_used,
+                fee and their averages, plus duration and throughput (successful
+                transactions per second) of the whole wave.
+        """
+        senders = {wallet.public_address(): wallet for wallet, _, _ in operations}
+        unsynced = [wallet for wallet in senders.values() if wallet.nonce is None]
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            list(executor.map(lambda wallet: wallet.get_nonce(), unsynced))
+
+        started = time.perf_counter()
+        transactions = [
+            self._build(wallet, operation, amount)
+            for wallet, operation, amount in operations
+        ]
+        outcomes = send_transactions_and_wait_for_execution(
+            transactions, batch_size, [wallet for wallet, _, _ in operations]
+        )
+        duration = time.perf_counter() - started
+
+        executed = [
+            tx_hash
+            for tx_hash, status in outcomes
+            if status not in ("rejected", "skipped")
+        ]
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            costs = dict(zip(executed, executor.map(get_transaction_cost, executed)))
+
+        per_operation = {}
+        for (wallet, operation, amount), (tx_hash, status) in zip(operations, outcomes):
+            stats = per_operation.setdefault(
+                operation,
+                {
+                    "count": 0,
+                    "success": 0,
+                    "fail": 0,
+                    "rejected": 0,
+                    "skipped": 0,
+                    "gas_used": 0,
+                    "fee": 0,
+                },
+            )
+            stats["count"] += 1
+            if status in ("rejected", "skipped"):
+                stats[status] += 1
+                continue
+            gas_used, fee = costs.get(tx_hash, (0, 0))
+            stats["gas_used"] += gas_used
+            stats["fee"] += fee
+            if status != "success":
+                stats["fail"] += 1
+                continue
+            stats["success"] += 1
+            address = wallet.public_address()
+            if operation == DELEGATE:
+                self.expected_active_stake[address] += amount
+            elif operation == UN_DELEGATE:
+                self.expected_active_stake[address] -= amount
+
+        for stats in per_operation.values():
+            executed_count = stats["count"] - stats["rejected"] - stats["skipped"]
+            stats["avg_gas_used"] = (
+                stats["gas_used"] // executed_count if executed_count else 0
+            )
+            stats["avg_fee"] = stats["fee"] // executed_count if executed_count else 0
+
+        succeeded = sum(stats["success"] for stats in per_operation.values())
+        report = {
+            "transactions": len(operations),
+            "success": succeeded,
+            "duration": round(duration, 3),
+            "throughput": round(succeeded / duration, 2) if duration else None,
+            "operations": per_operation,
+        }
+        self.reports.append(report)
+        logger.info(
+            "Delegation wave: %s of %s transactions successful in %.2fs",
+            succeeded,
+            len(operations),
+            duration,
+        )
+        return report
+
+    def mixed_wave(
+        self,
+        amount: int,
+        weights: dict[str, float] = None,
+        delegators: list[Wallet] = None,
+        seed: int = None,
+        batch_size: int = TX_BATCH_SIZE,
+    ) -> dict:
+        """
+        Runs a wave with one random operation per delegator.
+
+        Args:
+            amount (int): The amount of delegate and unDelegate operations.
+            weights (dict[str, float], optional): Relative weight of each operation,
+                only delegate by default. Delegators whose tracked active stake is
+                below the amount delegate instead of undelegating.
+            delegators (list[Wallet], optional): A subset of the delegators.
+            seed (int, optional): Seed of the operation mix.
+            batch_size (int): How many transactions are posted in one request.
+
+        Returns:
+            dict: The wave report of run_wave.
+        """
+        weights = weights or {DELEGATE: 1}
+        rng = random.Random(seed)
+        names = list(weights)
+        operations = []
+        for wallet in delegators or self.delegators:
+            [operation] = rng.choices(names, [weights[name] for name in names])
+            if (
+                operation == UN_DELEGATE
+                and self.expected_active_stake[wallet.public_address()] < amount
+            ):
+                operation = DELEGATE
+            operations.append((wallet, operation, amount))
+        return self.run_wave(operations, batch_size)
+
+    def verify_stakes(self) -> dict[str, tuple[int, int]]:
+        """
+        Compares the tracked active stake of every delegator with getUserActiveStake.
+
+        Returns:
+            dict[str, tuple[int, int]]: (expected, actual) for each mismatching
+                delegator; empty when everything matches.
+        """
+        actual = get_users_active_stake(
+            list(self.expected_active_stake), self.delegation_sc_address
+        )
+        mismatches = {
+            address: (expected, actual[address] or 0)
+            for address, expected in self.expected_active_stake.items()
+            if expected != (actual[address] or 0)
+        }
+        if mismatches:
+            logger.warning(
+                "%s of %s delegators have an unexpected active stake",
+                len(mismatches),
+                len(self.expected_active_stake),
+            )
+        return mismatches
@@ -0,0 +1,196 @@
+from dataclasses import dataclass, field
+
+from config.config import proxy_default
+from config.constants import (
+    NODE_PRICE,
+    STAKING_CONTRACT,
+    SYSTEM_DELEGATION_MANAGER_CONTRACT,
+    VALIDATOR_CONTRACT,
+)
+from core.chain_commander import (
+    add_blocks_until_epoch_reached,
+    add_blocks_until_tx_fully_executed,
+)
+from core.delegation import (
+    add_nodes,
+    create_new_delegation_contract,
+    delegate,
+    make_new_contract_from_validator_data,
+    merge_validator_to_delegation_with_whitelist,
+    stake_nodes,
+    whitelist_for_merge,
+)
+from core.get_delegation_info import get_delegation_contract_address_from_tx
+from core.staking import stake
+from core.state_snapshot import capture_state, restore_state
+from models.key_management import generate_validator_keys
+from models.validatorKey import ValidatorKey
+from models.wallet import Wallet, generate_wallets, set_balances
+from utils.logger import get_logger
+from utils.timing import step
+
+logger = get_logger(__name__)
+
+PLAIN = "plain"
+FROM_VALIDATOR_DATA = "from-validator-data"
+MERGED_WITH_WHITELIST = "merged-whitelist"
+
+# what createNewDelegationContract requires as initial delegation
+INITIAL_DELEGATION = 1250 * 10**18
+OWNER_BALANCE = 10000 * 10**18
+
+
+class SnapshotEpochMismatch(Exception):
+    pass
+
+
+@dataclass
+class DelegationTopology:
+    """
+    A delegation contract with staked nodes, and the snapshot of the accounts
+    it lives in: the contract, its owners and the system contracts.
+
+    Restoring writes back balances, nonces and contract storage, which is what
+    delegation and staking queries read. The validator statistics, i.e. which
+    nodes are eligible, waiting or in the auction, are not part of the snapshot.
+    """
+
+    kind: str
+    contract_address: str
+    owners: list[Wallet]
+    keys: list[ValidatorKey]
+    epoch: int
+    accounts: list[dict] = field(default_factory=list, repr=False)
+
+    def addresses(self) -> list[str]:
+        return [
+            self.contract_address,
+            *(owner.public_address() for owner in self.owners),
+            SYSTEM_DELEGATION_MANAGER_CONTRACT,
+            VALIDATOR_CONTRACT,
+            STAKING_CONTRACT,
+        ]
+
+    def snapshot(self):
+        self.accounts = capture_state(self.addresses())
+
+    def restore(self):
+        """
+        Moves the running chain to the epoch of the snapshot and writes it back.
+
+        Raises:
+            SnapshotEpochMismatch: The chain is already past the snapshot epoch;
+                the unbonding periods and rewards in the restored storage would
+                not match it, so the topology has to be built again.
+        """
+        current_epoch = proxy_default.get_network_status().epoch_number
+        if current_epoch < self.epoch:
+            add_blocks_until_epoch_reached(self.epoch)
+            current_epoch = proxy_default.get_network_status().epoch_number
+        if current_epoch != self.epoch:
+            raise SnapshotEpochMismatch(
+                f"{self.kind} delegation snapshot was taken in epoch {self.epoch}, "
+                f"the chain is in epoch {current_epoch}"
+            )
+        restore_state(self.accounts)
+        for owner in self.owners:
+            owner.nonce = None
+
+
+def _confirm(tx_hash: str, action: str):
+    status = add_blocks_until_tx_fully_executed(tx_hash)
+    if status != "success":
+        raise Exception(f"{action} failed with status {status}, tx {tx_hash}")
+
+
+def _build_plain(owners, keys) -> str:
+    owner = owners[0]
+    tx_hash = create_new_delegation_contract(owner, AMOUNT=str(INITIAL_DELEGATION))
+    _confirm(tx_hash, "createNewDelegationContract")
+    contract_address = get_delegation_contract_address_from_tx(tx_hash)
+
+    _confirm(add_nodes(owner, contract_address, keys), "addNodes")
+    top_up = len(keys) * NODE_PRICE - INITIAL_DELEGATION
+    if top_up > 0:
+        _confirm(delegate(owner, contract_address, top_up), "delegate")
+    _confirm(stake_nodes(owner, contract_address, keys), "stakeNodes")
+    return contract_address
+
+
+def _build_from_validator_data(owners, keys) -> str:
+    owner = owners[0]
+    _confirm(stake(owner, keys), "stake")
+    tx_hash = make_new_contract_from_validator_data(owner)
+    _confirm(tx_hash, "makeNewContractFromValidatorData")
+    return get_delegation_contract_address_from_tx(tx_hash)
+
+
+def _build_merged_with_whitelist(owners, keys) -> str:
+    contract_owner, validator_owner = owners[:2]
+    tx_hash = create_new_delegation_contract(
+        contract_owner, AMOUNT=str(INITIAL_DELEGATION)
+    )
+    _confirm(tx_hash, "createNewDelegationContract")
+    contract_address = get_delegation_contract_address_from_tx(tx_hash)
+
+    _confirm(stake(validator_owner, keys), "stake")
+    _confirm(
+        whitelist_for_merge(contract_owner, validator_owner, contract_address),
+        "whitelistForMerge",
+    )
+    _confirm(
+        merge_validator_to_delegation_with_whitelist(validator_owner, contract_address),
+        "mergeValidatorToDelegationWithWhitelist",
+    )
+    return contract_address
+
+
+_BUILDERS = {
+    PLAIN: (1, _build_plain),
+    FROM_VALIDATOR_DATA: (1, _build_from_validator_data),
+    MERGED_WITH_WHITELIST: (2, _build_merged_with_whitelist),
+}
+
+
+def build_delegation_topology(
+    kind: str, num_keys: int = 1, seed: int = 0, snapshot: bool = True
+) -> DelegationTopology:
+    """
+    Builds a delegation contract on the running chain, confirming every step.
+
+    Args:
+        kind (str): plain (createNewDelegationContract, addNodes, stakeNodes),
+            from-validator-data (stake, makeNewContractFromValidatorData) or
+            merged-whitelist (a new contract that a staked validator of another
+            owner is merged into).
+        num_keys (int): How many nodes the contract stakes.
+        seed (int): Seed of the owner wallets and the keys; the same seed gives
+            the same addresses on every chain, so the snapshot fits them all.
+        snapshot (bool): Capture the accounts once built.
+
+    Returns:
+        DelegationTopology: The contract, its owners and keys.
+    """
+    if kind not in _BUILDERS:
+        raise ValueError(
+            f"Unknown delegation topology '{kind}', expected one of {sorted(_BUILDERS)}"
+        )
+    num_owners, builder = _BUILDERS[kind]
+    owners = generate_wallets(num_owners, seed)
+    keys = generate_validator_keys(num_keys, seed)
+    set_balances(owners, OWNER_BALANCE + num_keys * NODE_PRICE)
+
+    with step(f"build {kind} delegation"):
+        contract_address = builder(owners, keys)
+    logger.info("Built %s delegation contract %s", kind, contract_address)
+
+    topology = DelegationTopology(
+        kind,
+        contract_address,
+        owners,
+        keys,
+        proxy_default.get_network_status().epoch_number,
+    )
+    if snapshot:
+        topology.snapshot()
+    return topology
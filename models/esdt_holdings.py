@@ -0,0 +1,244 @@
+import codecs
+import json
+
+import requests
+
+from config.config import DEFAULT_PROXY
+from core.chain_commander import get_block
+from core.get_address_info import get_nonce
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+_ESDTS_MARKER = '"esdts"'
+
+_snapshots = {}
+
+
+def split_esdt_identifier(identifier: str) -> tuple[str, int]:
+    """
+    Splits a token identifier into its collection and token nonce.
+
+    Args:
+        identifier (str): A fungible identifier (TICKER-abcdef) or an NFT/SFT
+            identifier with the nonce in hex (TICKER-abcdef-0a).
+
+    Returns:
+        tuple[str, int]: The collection identifier and the token nonce (0 for fungible tokens).
+    """
+    parts = identifier.split("-")
+    if len(parts) > 2:
+        return "-".join(parts[:2]), int(parts[2], 16)
+    return identifier, 0
+
+
+def iter_esdt_entries(chunks):
+    """
+    Incrementally parses the "esdts" map of an /address/{addr}/esdt response.
+
+    Only one entry is decoded at a time, so very large responses never have to
+    be held as a whole parsed document.
+
+    Args:
+        chunks: An iterable of text chunks of the raw response body.
+
+    Yields:
+        tuple[str, dict]: Each (identifier, details) pair of the map.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    exhausted = False
+
+    def read_more():
+        nonlocal buffer, position, exhausted
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def skip(characters):
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in characters:
+                position += 1
+            if position < len(buffer) or not read_more():
+                return
+
+    def decode():
+        nonlocal position
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted or not read_more():
+                    raise
+                continue
+            # a value touching the end of the buffer might be truncated
+            if end == len(buffer) and not exhausted and read_more():
+                continue
+            position = end
+            return value
+
+    while True:
+        marker_index = buffer.find(_ESDTS_MARKER, position)
+        if marker_index >= 0:
+            position = marker_index + len(_ESDTS_MARKER)
+            break
+        position = max(0, len(buffer) - len(_ESDTS_MARKER))
+        if not read_more():
+            return
+
+    skip(" \t\r\n:")
+    if buffer[position : position + 1] == "n":
+        decode()  # null
+        return
+    if buffer[position : position + 1] != "{":
+        raise ValueError("Malformed esdt response: expected an object for 'esdts'")
+    position += 1
+
+    while True:
+        skip(" \t\r\n,")
+        if position >= len(buffer):
+            raise ValueError("Malformed esdt response: unexpected end of 'esdts'")
+        if buffer[position] == "}":
+            return
+        identifier = decode()
+        skip(" \t\r\n:")
+        details = decode()
+        yield identifier, details
+
+
+class EsdtHoldings:
+    """
+    Snapshot of all ESDT holdings of an address, indexed by exact identifier,
+    by collection and by (collection, nonce).
+    """
+
+    def __init__(self, address: str) -> None:
+        self.address = address
+        self.by_identifier = {}
+        self.by_collection = {}
+        self.by_collection_and_nonce = {}
+        self.address_nonce = None
+        self.block_nonce = None
+
+    def refresh(self, stream: bool = False, version: tuple = None) -> "EsdtHoldings":
+        """
+        Downloads and indexes the holdings of the address.
+
+        Args:
+            stream (bool): Parse the response incrementally instead of loading it
+                as one JSON document. Recommended for accounts holding thousands of tokens.
+            version (tuple, optional): The (address nonce, block nonce) pair already
+                fetched by the caller. Fetched here if not given.
+
+        Returns:
+            EsdtHoldings: The refreshed snapshot.
+        """
+        logger.info("Fetching ESDT holdings for Address: %s", self.address)
+        address_nonce, block_nonce = version or self.fetch_version()
+
+        url = f"{DEFAULT_PROXY}/address/{self.address}/esdt"
+        if stream:
+            with requests.get(url, stream=True) as response:
+                response.raise_for_status()
+                text_decoder = codecs.getincrementaldecoder("utf-8")()
+                chunks = (
+                    text_decoder.decode(chunk)
+                    for chunk in response.iter_content(STREAM_CHUNK_SIZE)
+                )
+                self._index(iter_esdt_entries(chunks))
+        else:
+            response = requests.get(url)
+            response.raise_for_status()
+            esdts = response.json().get("data", {}).get("esdts") or {}
+            self._index(esdts.items())
+
+        self.address_nonce = address_nonce
+        self.block_nonce = block_nonce
+        logger.info(
+            "Indexed %s ESDT holdings for Address: %s at block %s",
+            len(self.by_identifier),
+            self.address,
+            block_nonce,
+        )
+        return self
+
+    def is_stale(self) -> bool:
+        """
+        Checks whether the snapshot may be outdated.
+
+        Holdings can only change when the address sends a transaction (its nonce
+        changes) or when a block is generated (incoming transfers).
+
+        Returns:
+            bool: True if the snapshot was never loaded or the address nonce or block height changed.
+        """
+        if self.block_nonce is None:
+            return True
+        return self.fetch_version() != (self.address_nonce, self.block_nonce)
+
+    def get(self, identifier: str) -> dict:
+        """Returns the details for the exact token identifier, or an empty dict."""
+        return self.by_identifier.get(identifier, {})
+
+    def get_collection(self, collection: str) -> list[dict]:
+        """Returns the details of all held tokens of a collection, ordered by token nonce."""
+        return self.by_collection.get(collection, [])
+
+    def get_nft(self, collection: str, nonce: int) -> dict:
+        """Returns the details for a token of a collection by its nonce, or an empty dict."""
+        return self.by_collection_and_nonce.get((collection, nonce), {})
+
+    def identifiers(self) -> list[str]:
+        return list(self.by_identifier)
+
+    def fetch_version(self) -> tuple[int, int]:
+        """Returns the current (address nonce, block nonce) pair the snapshot is keyed on."""
+        return get_nonce(self.address), get_block()
+
+    def _index(self, entries):
+        by_identifier = {}
+        by_collection = {}
+        by_collection_and_nonce = {}
+        for identifier, details in entries:
+            collection, nonce = split_esdt_identifier(identifier)
+            nonce = details.get("nonce", nonce) or nonce
+            by_identifier[identifier] = details
+            by_collection.setdefault(collection, []).append((nonce, details))
+            by_collection_and_nonce[(collection, nonce)] = details
+
+        self.by_identifier = by_identifier
+        self.by_collection = {
+            collection: [details for _, details in sorted(items, key=lambda x: x[0])]
+            for collection, items in by_collection.items()
+        }
+        self.by_collection_and_nonce = by_collection_and_nonce
+
+
+def get_esdt_holdings(address: str, stream: bool = False) -> EsdtHoldings:
+    """
+    Returns the holdings snapshot of an address, refreshing it only if it is stale.
+
+    Args:
+        address (str): The address to query.
+        stream (bool): Use the incremental parser when a refresh is needed.
+
+    Returns:
+        EsdtHoldings: An up-to-date snapshot.
+    """
+    snapshot = _snapshots.get(address)
+    if snapshot is None:
+        snapshot = _snapshots[address] = EsdtHoldings(address)
+    version = snapshot.fetch_version()
+    if version != (snapshot.address_nonce, snapshot.block_nonce):
+        snapshot.refresh(stream=stream, version=version)
+    else:
+        logger.info("Reusing ESDT holdings snapshot for Address: %s", address)
+    return snapshot
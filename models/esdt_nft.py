@@ -1,6 +1,15 @@
-from config.constants import ESDT_CONTRACT
-from core.create_esdt_transaction import create_and_sign_esdt_tx
-from core.create_relayed_v3_transaction import send_transaction_and_check_for_success
+from concurrent.futures import ThreadPoolExecutor
+
+from config.constants import ESDT_CONTRACT, MAX_CONCURRENT_REQUESTS, TX_BATCH_SIZE
+from core.create_esdt_transaction import (
+    create_and_sign_esdt_tx,
+    create_and_sign_esdt_txs,
+)
+from core.create_relayed_v3_transaction import (
+    send_transaction_and_check_for_success,
+    send_transactions_and_wait_for_execution,
+)
+from core.get_transaction_info import get_created_nft_nonce_from_tx
 from utils.esdt_helpers import (
     convert_create_esdt_nft_tx_to_hex,
     convert_esdt_nft_props_to_hex,
@@ -12,6 +21,9 @@ from utils.esdt_helpers import (
     convert_roles_assigning_to_hex,
     convert_set_new_uris_to_hex,
 )
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class NFT:
@@ -178,3 +190,111 @@ class NFT:
         )
         tx_hash = send_transaction_and_check_for_success(recreate_metadata_tx)
         return tx_hash
+
+    def create_nfts(self, specs, batch_size=TX_BATCH_SIZE):
+        """
+        Creates many NFTs with one pipelined send and a single confirmation loop.
+
+        Args:
+            specs (list of dict): One dict per NFT with the keyword arguments of
+                create_nft (token_identifier, nft_name, quantity, royalties,
+                hash_value, attributes) and optionally uri and additional_uri.
+            batch_size (int): How many transactions are posted in one request.
+
+        Returns:
+            list of dict: One result per spec with 'tx_hash', 'status' and the
+                assigned 'token_nonce' (None if the creation did not succeed).
+        """
+        data_list = [
+            convert_create_esdt_nft_tx_to_hex(**spec).encode() for spec in specs
+        ]
+        results = self._send_many(data_list, batch_size=batch_size)
+
+        succeeded = [result for result in results if result["status"] == "success"]
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            token_nonces = executor.map(
+                get_created_nft_nonce_from_tx,
+                [result["tx_hash"] for result in succeeded],
+            )
+            for result, token_nonce in zip(succeeded, token_nonces):
+                result["token_nonce"] = token_nonce
+
+        for result in results:
+            result.setdefault("token_nonce", None)
+        return results
+
+    def transfer_many(self, transfers, batch_size=TX_BATCH_SIZE):
+        """
+        Sends many single NFT transfers with one pipelined send and a single confirmation loop.
+
+        Args:
+            transfers (list of dict): One dict per transfer with the keyword
+                arguments of transfer_single_nft (nft_holder_wallet,
+                token_identifier, nonce, quantity).
+            batch_size (int): How many transactions are posted in one request.
+
+        Returns:
+            list of dict: One result per transfer with 'tx_hash' and 'status'; status is
+                "skipped" for transactions sent after one the proxy rejected.
+        """
+        data_list = [
+            convert_esdt_nft_transfer_to_hex(
+                token_identifier=transfer["token_identifier"],
+                nonce=transfer["nonce"],
+                quantity=transfer["quantity"],
+                destination_address=transfer["nft_holder_wallet"].get_address().hex(),
+            ).encode()
+            for transfer in transfers
+        ]
+        return self._send_many(data_list, batch_size=batch_size)
+
+    def modify_many(self, modifications, batch_size=TX_BATCH_SIZE):
+        """
+        Applies many NFT modifications with one pipelined send and a single confirmation loop.
+
+        Args:
+            modifications (list of dict): One dict per modification. The 'action'
+                key selects the operation and the remaining keys are its arguments:
+                - "royalties": token_identifier, nonce, new_royalty
+                - "uris": token_identifier, nonce, uris
+                - "creator": token_identifier, nonce
+                - "metadata": the arguments of recreate_metadata
+            batch_size (int): How many transactions are posted in one request.
+
+        Returns:
+            list of dict: One result per modification with 'tx_hash' and 'status'; status is
+                "skipped" for transactions sent after one the proxy rejected.
+        """
+        converters = {
+            "royalties": convert_modify_royalties_to_hex,
+            "uris": convert_set_new_uris_to_hex,
+            "creator": convert_modify_creator_to_hex,
+            "metadata": convert_recreate_metadata_to_hex,
+        }
+        data_list = []
+        for modification in modifications:
+            arguments = dict(modification)
+            action = arguments.pop("action")
+            if action not in converters:
+                raise ValueError(f"Unknown NFT modification action: {action}")
+            data_list.append(converters[action](**arguments).encode())
+        return self._send_many(data_list, batch_size=batch_size)
+
+    def _send_many(self, data_list, gas_limit=60000000, batch_size=TX_BATCH_SIZE):
+        nonces = [self.wallet.get_nonce_and_increment() for _ in data_list]
+        transactions = create_and_sign_esdt_txs(
+            sender_wallet=self.wallet,
+            receiver_wallet=self.wallet.public_address(),
+            data_list=data_list,
+            nonces=nonces,
+            gas_limit=gas_limit,
+        )
+        results = [
+            {"tx_hash": tx_hash, "status": status}
+            for tx_hash, status in send_transactions_and_wait_for_execution(
+                transactions, batch_size, [self.wallet] * len(transactions)
+            )
+        ]
+        succeeded = sum(1 for result in results if result["status"] == "success")
+        logger.info("%s of %s NFT transactions succeeded", succeeded, len(results))
+        return results
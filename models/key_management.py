@@ -1,26 +1,109 @@
+import hashlib
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from multiversx_sdk.wallet.validator_keys import ValidatorSecretKey
 
 from config.config import DEFAULT_PROXY, proxy_default
+from config.constants import ADD_KEYS_BATCH_SIZE
 from core.chain_commander import add_blocks, add_blocks_until_epoch_reached
-from models.validatorKey import ValidatorKey
-from utils.logger import logger
+from models.validatorKey import ValidatorKey, initialize_bls
+from utils.logger import get_logger
+from utils.read_cache import invalidate_read_cache
+from utils.timing import timed
 
+logger = get_logger(__name__)
 
-def add_key(keys: list[ValidatorKey]) -> str:
-    logger.info("Adding keys to simulator")
-    private_keys = []
-    for key in keys:
-        private_keys.append(key.get_private_key())
 
-    post_body = {"privateKeysBase64": private_keys}
+def seeded_secret_key(seed: int, index: int) -> ValidatorSecretKey:
+    """The index-th BLS secret key of a seed, the same on every run."""
+    buffer = bytearray(hashlib.sha256(f"bls:{seed}:{index}".encode()).digest())
+    # the key is a little-endian scalar, clearing the top bits keeps it below the curve order
+    buffer[-1] &= 0x3F
+    return ValidatorSecretKey(bytes(buffer))
 
-    json_structure = json.dumps(post_body)
-    req = requests.post(f"{DEFAULT_PROXY}/simulator/add-keys", data=json_structure)
+
+def _generate_key(
+    seed: int, index: int, owner_pubkey: bytes, output_dir: str
+) -> ValidatorKey:
+    path = None
+    if output_dir:
+        path = os.path.join(output_dir, f"validatorKey_{seed}_{index}.pem")
+        if os.path.isfile(path):
+            key = ValidatorKey(path)
+        else:
+            key = ValidatorKey.from_secret_key(seeded_secret_key(seed, index))
+            key.save(path)
+    else:
+        key = ValidatorKey.from_secret_key(seeded_secret_key(seed, index))
+    key.public_address()
+    if owner_pubkey is not None:
+        key.stake_signature(owner_pubkey)
+    return key
+
+
+@timed
+def generate_validator_keys(
+    count: int,
+    seed: int = 0,
+    owner_pubkey: bytes = None,
+    output_dir: str = None,
+    workers: int = None,
+) -> list[ValidatorKey]:
+    """
+    Generates BLS validator keys from a seed, in parallel.
+
+    Args:
+        count (int): How many keys to generate.
+        seed (int): Same seed, same keys; use different seeds for disjoint key sets.
+        owner_pubkey (bytes, optional): Owner whose stake signatures are computed
+            upfront, e.g. wallet.get_address().pubkey.
+        output_dir (str, optional): Folder where the keys are saved as PEM files.
+            Keys already saved there are loaded instead of generated again.
+        workers (int, optional): Generating threads, the CPU count by default.
+
+    Returns:
+        list[ValidatorKey]: The keys, in-memory unless output_dir is given.
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    logger.info("Generating %s validator keys with seed %s", count, seed)
+    # the BLS library is called through ctypes, which releases the GIL
+    initialize_bls()
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        return list(
+            executor.map(
+                lambda index: _generate_key(seed, index, owner_pubkey, output_dir),
+                range(count),
+            )
+        )
+
+
+@timed
+def add_key(keys: list[ValidatorKey], batch_size: int = ADD_KEYS_BATCH_SIZE) -> str:
+    """
+    Adds validator keys to the simulator nodes, batch_size keys per request.
+
+    Returns:
+        str: The response of the last request.
+    """
+    logger.info("Adding %s keys to simulator", len(keys))
+    response_text = None
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start : start + batch_size]
+        post_body = {"privateKeysBase64": [key.get_private_key() for key in batch]}
+
+        json_structure = json.dumps(post_body)
+        req = requests.post(f"{DEFAULT_PROXY}/simulator/add-keys", data=json_structure)
+        req.raise_for_status()
+        response_text = req.text
+        invalidate_read_cache("add-keys")
+        logger.info("Added batch of %s keys", len(batch))
 
     logger.info("Keys added successfully")
-    return req.text
+    return response_text
 
 
 def add_blocks_until_key_eligible(keys: list[ValidatorKey]) -> ValidatorKey:
@@ -39,5 +122,5 @@ def add_blocks_until_key_eligible(keys: list[ValidatorKey]) -> ValidatorKey:
                 add_blocks_until_epoch_reached(current_epoch + 1)
                 add_blocks(3)
 
-    logger.info(f"Key {eligible_key.get_public_key()} is now eligible")
+    logger.info("Key %s is now eligible", eligible_key.get_public_key())
     return eligible_key
@@ -0,0 +1,528 @@
+import base64
+import hashlib
+import json
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from config.topology import active_topology
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MIN_GAS_LIMIT = 50000
+GAS_PER_DATA_BYTE = 1500
+
+
+class MockChainState:
+    """
+    In-memory accounts, transactions and blocks backing the mock proxy.
+
+    Transactions are executed when blocks are generated: a pending transaction
+    runs once its nonce matches the sender's account nonce, and fails if the
+    sender cannot pay value plus fee.
+    """
+
+    def __init__(self, rounds_per_epoch: int = None) -> None:
+        self.lock = threading.RLock()
+        self.rounds_per_epoch = rounds_per_epoch or active_topology().rounds_per_epoch
+        self.block_nonce = 0
+        self.accounts = {}
+        self.transactions = {}
+        self.pending = []
+        self.max_txs_per_block = None
+        self.vm_query_responses = {}
+        self.validator_statistics = {}
+        self.auction_list = []
+        # (sender, nonce) -> reason, for transactions the proxy should refuse
+        self.rejections = {}
+
+    @property
+    def epoch(self) -> int:
+        return self.block_nonce // self.rounds_per_epoch
+
+    def get_account(self, address: str) -> dict:
+        return self.accounts.setdefault(
+            address,
+            {"address": address, "nonce": 0, "balance": "0", "esdts": {}, "keys": {}},
+        )
+
+    def set_state(self, entries: list[dict], overwrite: bool = False):
+        with self.lock:
+            for entry in entries:
+                if overwrite:
+                    self.accounts.pop(entry["address"], None)
+                account = self.get_account(entry["address"])
+                if "balance" in entry:
+                    account["balance"] = str(entry["balance"])
+                if "nonce" in entry:
+                    account["nonce"] = int(entry["nonce"])
+                account["keys"].update(entry.get("keys") or {})
+
+    @staticmethod
+    def transaction_hash(tx: dict) -> str:
+        return hashlib.blake2b(
+            json.dumps(tx, sort_keys=True).encode(), digest_size=32
+        ).hexdigest()
+
+    def rejection_reason(self, tx: dict) -> str:
+        """Why the proxy refuses to accept a transaction, or None if it accepts it."""
+        with self.lock:
+            rejection = self.rejections.get((tx["sender"], int(tx.get("nonce", 0))))
+            if rejection:
+                return rejection
+            if int(tx.get("nonce", 0)) < self.get_account(tx["sender"])["nonce"]:
+                return "lowerNonceInTransaction"
+            if int(tx.get("gasLimit", MIN_GAS_LIMIT)) < self.gas_units(tx):
+                return "insufficient gas limit in tx"
+            return None
+
+    def add_transaction(self, tx: dict) -> str:
+        with self.lock:
+            tx_hash = self.transaction_hash(tx)
+            if tx_hash not in self.transactions:
+                self.transactions[tx_hash] = {
+                    **tx,
+                    "hash": tx_hash,
+                    "status": "pending",
+                }
+                self.pending.append(tx_hash)
+            return tx_hash
+
+    def generate_blocks(self, count: int):
+        with self.lock:
+            for _ in range(count):
+                self.block_nonce += 1
+                self._execute_pending()
+
+    def generate_blocks_until_epoch(self, epoch: int):
+        with self.lock:
+            while self.epoch < epoch:
+                self.generate_blocks(1)
+
+    def _execute_pending(self):
+        executed = 0
+        progress = True
+        while progress:
+            progress = False
+            for tx_hash in list(self.pending):
+                if self.max_txs_per_block and executed >= self.max_txs_per_block:
+                    return
+                tx = self.transactions[tx_hash]
+                sender = self.get_account(tx["sender"])
+                if int(tx.get("nonce", 0)) != sender["nonce"]:
+                    continue
+                self._execute(tx, sender)
+                self.pending.remove(tx_hash)
+                executed += 1
+                progress = True
+
+    @staticmethod
+    def gas_units(tx: dict) -> int:
+        data = base64.b64decode(tx.get("data") or "")
+        return MIN_GAS_LIMIT + GAS_PER_DATA_BYTE * len(data)
+
+    def simulate(self, tx: dict) -> tuple[str, str]:
+        """Predicts the status and fail reason of a transaction without executing it."""
+        with self.lock:
+            sender = self.get_account(tx["sender"])
+            if int(tx.get("nonce", 0)) < sender["nonce"]:
+                return "rejected", "lowerNonceInTransaction"
+            gas_used = min(int(tx.get("gasLimit", MIN_GAS_LIMIT)), self.gas_units(tx))
+            fee = gas_used * int(tx.get("gasPrice", 1000000000))
+            if int(sender["balance"]) < int(tx.get("value", "0")) + fee:
+                return "fail", "insufficient funds"
+            return "success", ""
+
+    def _execute(self, tx: dict, sender: dict):
+        gas_limit = int(tx.get("gasLimit", MIN_GAS_LIMIT))
+        gas_used = min(gas_limit, self.gas_units(tx))
+        fee = gas_used * int(tx.get("gasPrice", 1000000000))
+        value = int(tx.get("value", "0"))
+
+        sender["nonce"] += 1
+        tx["blockNonce"] = self.block_nonce
+        tx["gasUsed"] = gas_used
+        tx["fee"] = str(fee)
+        if int(sender["balance"]) < value + fee:
+            tx["status"] = "fail"
+            sender["balance"] = str(max(0, int(sender["balance"]) - fee))
+            return
+
+        sender["balance"] = str(int(sender["balance"]) - value - fee)
+        receiver = self.get_account(tx["receiver"])
+        receiver["balance"] = str(int(receiver["balance"]) + value)
+        tx["status"] = "success"
+
+
+class _MockProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        logger.debug("Mock proxy: " + format, *args)
+
+    def _dispatch(self, method: str):
+        parsed_url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"null") if length else None
+
+        mock = self.server.mock_proxy
+        for route_method, pattern, template, handler in _routes:
+            match = pattern.fullmatch(parsed_url.path)
+            if route_method == method and match:
+                delay = mock.latency_for(template)
+                if delay:
+                    time.sleep(delay)
+                with mock.state.lock:
+                    status, payload = handler(mock.state, body, *match.groups())
+                self._respond(status, payload)
+                return
+        self._respond(404, _error(f"no mock route for {method} {parsed_url.path}"))
+
+    def _respond(self, status: int, payload: dict):
+        encoded = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+class _MockProxyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler) -> None:
+        super().__init__(address, handler)
+        self.connections = set()
+
+    def process_request(self, request, client_address):
+        self.connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request):
+        self.connections.discard(request)
+        super().shutdown_request(request)
+
+    def close_connections(self):
+        # keep-alive connections of the pooled session would otherwise keep the
+        # handler threads of a stopped mock proxy alive
+        for connection in list(self.connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def _ok(data: dict):
+    return 200, {"data": data, "error": "", "code": "successful"}
+
+
+def _error(message: str, code: str = "internal_issue"):
+    return {"data": None, "error": message, "code": code}
+
+
+def _set_state(state, body):
+    state.set_state(body or [])
+    return _ok({})
+
+
+def _set_state_overwrite(state, body):
+    state.set_state(body or [], overwrite=True)
+    return _ok({})
+
+
+def _generate_blocks(state, body, count):
+    state.generate_blocks(int(count))
+    return _ok({})
+
+
+def _generate_blocks_until_epoch(state, body, epoch):
+    state.generate_blocks_until_epoch(int(epoch))
+    return _ok({})
+
+
+def _noop(state, body, *args):
+    return _ok({})
+
+
+def _network_status(state, body, shard):
+    return _ok(
+        {
+            "status": {
+                "erd_nonce": state.block_nonce,
+                "erd_current_round": state.block_nonce,
+                "erd_epoch_number": state.epoch,
+                "erd_nonces_passed_in_current_epoch": state.block_nonce
+                % state.rounds_per_epoch,
+                "erd_highest_final_nonce": state.block_nonce,
+                "erd_round_at_epoch_start": state.epoch * state.rounds_per_epoch,
+                "erd_rounds_passed_in_current_epoch": state.block_nonce
+                % state.rounds_per_epoch,
+                "erd_rounds_per_epoch": state.rounds_per_epoch,
+            }
+        }
+    )
+
+
+def _send_transaction(state, body):
+    reason = state.rejection_reason(body)
+    if reason:
+        return 400, _error(f"transaction generation failed: {reason}", "bad_request")
+    return _ok({"txHash": state.add_transaction(body)})
+
+
+def _send_multiple(state, body):
+    # like the proxy, rejected transactions are left out of the hashes
+    hashes = {
+        str(index): state.add_transaction(tx)
+        for index, tx in enumerate(body)
+        if not state.rejection_reason(tx)
+    }
+    return _ok({"numOfSentTxs": len(hashes), "txsHashes": hashes})
+
+
+def _simulate(state, body):
+    status, fail_reason = state.simulate(body)
+    if status == "rejected":
+        return 400, _error(fail_reason, "bad_request")
+    return _ok(
+        {
+            "result": {
+                "status": status,
+                "failReason": fail_reason,
+                "hash": state.transaction_hash(body),
+                "scResults": {},
+                "logs": None,
+            }
+        }
+    )
+
+
+def _cost(state, body):
+    _, fail_reason = state.simulate(body)
+    return _ok(
+        {
+            "txGasUnits": state.gas_units(body),
+            "returnMessage": fail_reason,
+            "smartContractResults": {},
+        }
+    )
+
+
+def _transaction_process_status(state, body, tx_hash):
+    tx = state.transactions.get(tx_hash)
+    if tx is None:
+        # get_status_of_tx reads unknown hashes from the body, not the status code
+        return 200, _error("transaction not found")
+    return _ok({"status": tx["status"]})
+
+
+def _transaction(state, body, tx_hash):
+    tx = state.transactions.get(tx_hash)
+    if tx is None:
+        return 404, _error("transaction not found")
+    # logs and results can be set on the stored transaction by tests
+    return _ok(
+        {"transaction": {"logs": {"events": []}, "smartContractResults": [], **tx}}
+    )
+
+
+def _account(state, body, address):
+    account = state.get_account(address)
+    return _ok(
+        {
+            "account": {
+                "address": address,
+                "nonce": account["nonce"],
+                "balance": account["balance"],
+                "username": "",
+                "code": "",
+                "codeHash": None,
+                "rootHash": None,
+                "codeMetadata": None,
+                "developerReward": "0",
+                "ownerAddress": "",
+            },
+            "blockInfo": {"nonce": state.block_nonce},
+        }
+    )
+
+
+def _account_nonce(state, body, address):
+    return _ok({"nonce": state.get_account(address)["nonce"]})
+
+
+def _account_balance(state, body, address):
+    return _ok({"balance": state.get_account(address)["balance"]})
+
+
+def _account_keys(state, body, address):
+    return _ok(
+        {
+            "pairs": state.get_account(address)["keys"],
+            "blockInfo": {"nonce": state.block_nonce},
+        }
+    )
+
+
+def _account_esdts(state, body, address):
+    return _ok(
+        {
+            "esdts": state.get_account(address)["esdts"],
+            "blockInfo": {"nonce": state.block_nonce},
+        }
+    )
+
+
+def _vm_query(state, body):
+    key = (body.get("scAddress"), body.get("funcName"), tuple(body.get("args") or []))
+    response = state.vm_query_responses.get(key)
+    if response is None:
+        response = state.vm_query_responses.get(key[:2] + (None,))
+    if response is None:
+        response = {"returnData": None, "returnCode": "ok", "returnMessage": ""}
+    return _ok({"data": response})
+
+
+def _validator_statistics(state, body):
+    return _ok({"statistics": state.validator_statistics})
+
+
+def _validator_auction(state, body):
+    return _ok({"auctionList": state.auction_list})
+
+
+_route_table = [
+    ("POST", "/simulator/set-state", _set_state),
+    ("POST", "/simulator/set-state-overwrite", _set_state_overwrite),
+    ("POST", "/simulator/generate-blocks/{n}", _generate_blocks),
+    (
+        "POST",
+        "/simulator/generate-blocks-until-epoch-reached/{epoch}",
+        _generate_blocks_until_epoch,
+    ),
+    ("POST", "/simulator/force-reset-validator-statistics", _noop),
+    ("POST", "/simulator/add-keys", _noop),
+    ("GET", "/network/status/{shard}", _network_status),
+    ("POST", "/transaction/send", _send_transaction),
+    ("POST", "/transaction/send-multiple", _send_multiple),
+    ("POST", "/transaction/simulate", _simulate),
+    ("POST", "/transaction/cost", _cost),
+    ("GET", "/transaction/{hash}/process-status", _transaction_process_status),
+    ("GET", "/transaction/{hash}", _transaction),
+    ("GET", "/address/{address}", _account),
+    ("GET", "/address/{address}/nonce", _account_nonce),
+    ("GET", "/address/{address}/balance", _account_balance),
+    ("GET", "/address/{address}/esdt", _account_esdts),
+    ("GET", "/address/{address}/keys", _account_keys),
+    ("POST", "/vm-values/query", _vm_query),
+    ("GET", "/validator/statistics", _validator_statistics),
+    ("GET", "/validator/auction", _validator_auction),
+]
+
+_routes = [
+    (
+        method,
+        re.compile(re.sub(r"\{[^/]+\}", "([^/]+)", template)),
+        template,
+        handler,
+    )
+    for method, template, handler in _route_table
+]
+
+
+class MockProxy:
+    """
+    In-process stand-in for the chain simulator proxy and observer HTTP API.
+
+    Serves the routes used by core/ and models/ from a MockChainState, with
+    configurable per-route latency, so client-side logic can be exercised and
+    benchmarked without a chain simulator build. The proxy and the observer
+    listen on ephemeral ports of the host, so a running chain simulator is
+    never shadowed; their urls are proxy_url and observer_url once started.
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1") -> None:
+        self.state = MockChainState()
+        self.latency = latency
+        self.route_latency = {}
+        self.host = host
+        self.proxy_url = None
+        self.observer_url = None
+        self.servers = []
+        self.threads = []
+
+    def latency_for(self, template: str) -> float:
+        return self.route_latency.get(template, self.latency)
+
+    def set_route_latency(self, template: str, seconds: float):
+        """Sets the delay for one route template, e.g. "/transaction/{hash}"."""
+        self.route_latency[template] = seconds
+
+    def set_vm_query_response(
+        self,
+        sc_address: str,
+        func_name: str,
+        return_data: list[str],
+        args: list[str] = None,
+        return_code: str = "ok",
+        return_message: str = "",
+    ):
+        """
+        Registers the response of a VM query. Without args, the response is used
+        for any arguments not registered explicitly.
+        """
+        key = (sc_address, func_name, tuple(args) if args is not None else None)
+        self.state.vm_query_responses[key] = {
+            "returnData": return_data,
+            "returnCode": return_code,
+            "returnMessage": return_message,
+        }
+
+    def reject_transaction(
+        self, sender: str, nonce: int, reason: str = "invalid signature"
+    ):
+        """Makes the proxy refuse the transaction of a sender with the given nonce."""
+        self.state.rejections[(sender, nonce)] = reason
+
+    def start(self):
+        for _ in ("proxy", "observer"):
+            server = _MockProxyServer((self.host, 0), _MockProxyHandler)
+            server.mock_proxy = self
+            # a short poll interval keeps stop(), called after every test, fast
+            thread = threading.Thread(
+                target=server.serve_forever, args=(0.05,), daemon=True
+            )
+            thread.start()
+            self.servers.append(server)
+            self.threads.append(thread)
+        self.proxy_url, self.observer_url = (
+            f"http://{self.host}:{server.server_address[1]}" for server in self.servers
+        )
+        logger.info(
+            "Mock proxy listening on %s (observer %s)",
+            self.proxy_url,
+            self.observer_url,
+        )
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.close_connections()
+            server.server_close()
+        for thread in self.threads:
+            thread.join()
+        self.servers = []
+        self.threads = []
+        self.proxy_url = None
+        self.observer_url = None
+        logger.info("Mock proxy stopped")
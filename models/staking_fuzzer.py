@@ -0,0 +1,708 @@
+import json
+import multiprocessing
+import os
+import random
+import re
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from multiversx_sdk.core import Transaction, TransactionComputer
+from multiversx_sdk.wallet.user_signer import UserSigner
+
+from config.config import CHAIN_ID
+from config.constants import (
+    FUZZ_CORPUS_FOLDER,
+    GAS_PRICE,
+    MAX_CONCURRENT_REQUESTS,
+    NODE_PRICE,
+    TX_BATCH_SIZE,
+    VALIDATOR_CONTRACT,
+)
+from core.create_relayed_v3_transaction import send_transactions_and_wait_for_execution
+from core.get_transaction_info import get_transaction_events
+from models.delegation_load import (
+    CLAIM_REWARDS,
+    DELEGATE,
+    OPERATION_GAS_LIMITS,
+    UN_DELEGATE,
+    WITHDRAW,
+)
+from models.key_management import generate_validator_keys
+from models.validatorKey import ValidatorKey, initialize_bls
+from models.wallet import Wallet, generate_wallets, set_balances
+from utils.helpers import decimal_to_hex
+from utils.logger import get_logger
+from utils.timing import timed
+
+logger = get_logger(__name__)
+
+STAKE = "stake"
+UN_STAKE = "unStake"
+UN_BOND_NODES = "unBondNodes"
+STAKING_OPERATIONS = (STAKE, UN_STAKE, UN_BOND_NODES)
+DELEGATION_OPERATIONS = (DELEGATE, UN_DELEGATE, WITHDRAW, CLAIM_REWARDS)
+
+STAKING_GAS_LIMIT = 200000000
+DELEGATION_AMOUNT = 10 * 10**18
+SENDER_BALANCE = 1_000_000 * 10**18
+MAX_MUTATIONS = 3
+MINIMIZE_ROUNDS = 5
+# transactions handed to a signing process at once
+SIGN_CHUNK_SIZE = 256
+
+# characters a flipped position can take: hex digits, non-hex letters and separators
+_FLIP_CHARS = string.hexdigits + "gxzZ@-"
+_RANDOM_ARG_BYTES = (0, 1, 2, 31, 32, 33, 48, 96, 97, 200)
+
+
+def _argument(args: list[str], index: int) -> int:
+    # arguments only, the function name stays; None when there are none
+    if len(args) < 2:
+        return None
+    return 1 + index % (len(args) - 1)
+
+
+def _flip_char(args, value, params):
+    index = _argument(args, params["arg"])
+    if index is not None and args[index]:
+        arg = args[index]
+        position = params["position"] % len(arg)
+        args[index] = arg[:position] + params["char"] + arg[position + 1 :]
+    return args, value
+
+
+def _truncate_arg(args, value, params):
+    index = _argument(args, params["arg"])
+    if index is not None:
+        args[index] = args[index][: params["length"]]
+    return args, value
+
+
+def _extend_arg(args, value, params):
+    index = _argument(args, params["arg"])
+    if index is not None:
+        args[index] += params["suffix"]
+    return args, value
+
+
+def _replace_arg(args, value, params):
+    index = _argument(args, params["arg"])
+    if index is not None:
+        args[index] = params["value"]
+    return args, value
+
+
+def _drop_arg(args, value, params):
+    index = _argument(args, params["arg"])
+    if index is not None:
+        del args[index]
+    return args, value
+
+
+def _duplicate_arg(args, value, params):
+    index = _argument(args, params["arg"])
+    if index is not None:
+        args.insert(index, args[index])
+    return args, value
+
+
+def _swap_args(args, value, params):
+    first, second = _argument(args, params["first"]), _argument(args, params["second"])
+    if first is not None:
+        args[first], args[second] = args[second], args[first]
+    return args, value
+
+
+def _append_arg(args, value, params):
+    return args + [params["value"]], value
+
+
+def _set_value(args, value, params):
+    return args, params["value"]
+
+
+def _random_hex(rng: random.Random) -> str:
+    return rng.randbytes(rng.choice(_RANDOM_ARG_BYTES)).hex()
+
+
+def _pick_value(rng: random.Random, value: int) -> dict:
+    choices = [0, 1, value + 1, value * 2, rng.randrange(value * 2 + 1)]
+    if value:
+        choices += [value - 1, value // 2]
+    return {"value": rng.choice(choices)}
+
+
+# name -> (picks the parameters from the rng and the current payload, applies them)
+_MUTATIONS = {
+    "flip_char": (
+        lambda rng, args, value: {
+            "arg": rng.randrange(1 << 16),
+            "position": rng.randrange(1 << 16),
+            "char": rng.choice(_FLIP_CHARS),
+        },
+        _flip_char,
+    ),
+    "truncate_arg": (
+        lambda rng, args, value: {
+            "arg": rng.randrange(1 << 16),
+            "length": rng.randrange(max(len(max(args[1:] or [""], key=len)), 1)),
+        },
+        _truncate_arg,
+    ),
+    "extend_arg": (
+        lambda rng, args, value: {
+            "arg": rng.randrange(1 << 16),
+            "suffix": rng.choice(["0", "00", "ff", _random_hex(rng)]),
+        },
+        _extend_arg,
+    ),
+    "replace_arg": (
+        lambda rng, args, value: {
+            "arg": rng.randrange(1 << 16),
+            "value": _random_hex(rng),
+        },
+        _replace_arg,
+    ),
+    "drop_arg": (
+        lambda rng, args, value: {"arg": rng.randrange(1 << 16)},
+        _drop_arg,
+    ),
+    "duplicate_arg": (
+        lambda rng, args, value: {"arg": rng.randrange(1 << 16)},
+        _duplicate_arg,
+    ),
+    "swap_args": (
+        lambda rng, args, value: {
+            "first": rng.randrange(1 << 16),
+            "second": rng.randrange(1 << 16),
+        },
+        _swap_args,
+    ),
+    "append_arg": (
+        lambda rng, args, value: {"value": _random_hex(rng)},
+        _append_arg,
+    ),
+    "set_value": (lambda rng, args, value: _pick_value(rng, value), _set_value),
+}
+# mutations that still apply when the call has at most one argument to change
+_ARGUMENT_FREE_MUTATIONS = {"append_arg", "set_value"}
+
+
+def apply_mutations(
+    args: list[str], value: int, mutations: list[dict]
+) -> tuple[str, int]:
+    """
+    Applies recorded mutations to a payload, e.g. to replay or minimize a case.
+
+    Args:
+        args (list[str]): The function name followed by its hex arguments.
+        value (int): The transaction value.
+        mutations (list[dict]): {"name": ..., **params} entries, in order.
+
+    Returns:
+        tuple[str, int]: The mutated data field and value.
+    """
+    args = list(args)
+    for mutation in mutations:
+        params = {k: v for k, v in mutation.items() if k != "name"}
+        args, value = _MUTATIONS[mutation["name"]][1](args, value, params)
+    return "@".join(args), value
+
+
+def _normalize_message(message: str) -> str:
+    # keys, addresses and amounts differ between cases failing for the same reason
+    message = re.sub(r"erd1[0-9a-z]{58}", "<address>", message)
+    message = re.sub(r"[0-9a-fA-F]{16,}", "<hex>", message)
+    return re.sub(r"\d+", "<n>", message).strip()
+
+
+@dataclass
+class FuzzCase:
+    sender: int
+    operation: str
+    receiver: str
+    data: str
+    value: int
+    gas_limit: int
+    mutations: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class FuzzOutcome:
+    tx_hash: str
+    status: str
+    message: str = ""
+
+    def outcome_class(self, operation: str) -> str:
+        """The outcome class: operation, status and the normalized error message."""
+        return f"{operation}|{self.status}|{_normalize_message(self.message)}"
+
+
+def _error_message(tx_hash: str) -> str:
+    events = get_transaction_events(tx_hash)
+    event = events.first("signalError")
+    if event is not None:
+        return event.fields.get("message") or event.data.decode(errors="replace")
+    event = events.first("internalVMErrors")
+    if event is not None:
+        return event.data.decode(errors="replace")
+    return ""
+
+
+def _sign_chunk(pem_path: str, fields: list[dict]) -> list[bytes]:
+    signer = UserSigner.from_pem_file(Path(pem_path))
+    computer = TransactionComputer()
+    return [
+        signer.sign(computer.compute_bytes_for_signing(Transaction(**tx_fields)))
+        for tx_fields in fields
+    ]
+
+
+@timed
+def sign_transactions(
+    fields: list[dict], pem_paths: list[str], workers: int = None
+) -> list[Transaction]:
+    """
+    Builds and signs transactions with a pool of processes.
+
+    Args:
+        fields (list[dict]): Keyword arguments of Transaction, with data as bytes.
+        pem_paths (list[str]): The PEM file of the sender of each transaction.
+        workers (int, optional): Signing processes, the CPU count by default.
+
+    Returns:
+        list[Transaction]: The signed transactions, in the given order.
+    """
+    chunks = []
+    for start in range(len(fields)):
+        if (
+            not chunks
+            or chunks[-1][0] != pem_paths[start]
+            or len(chunks[-1][1]) >= SIGN_CHUNK_SIZE
+        ):
+            chunks.append((pem_paths[start], []))
+        chunks[-1][1].append(fields[start])
+
+    # spawned, not forked: the test process runs HTTP pools and the log listener thread
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        signatures = executor.map(
+            _sign_chunk, [path for path, _ in chunks], [chunk for _, chunk in chunks]
+        )
+        transactions = []
+        for (_, chunk), chunk_signatures in zip(chunks, signatures):
+            for tx_fields, signature in zip(chunk, chunk_signatures):
+                transactions.append(Transaction(**tx_fields, signature=signature))
+    return transactions
+
+
+class StakingFuzzer:
+    """
+    Seeded mutation fuzzer for staking and delegation transactions.
+
+    Every case is a valid stake, unStake, unBondNodes or delegation payload of
+    one sender with a few recorded mutations of its arguments and value; the
+    same seed gives the same corpus. Cases are signed by a process pool, sent in
+    bulk and classified by status and the error message of their logs. The first
+    case of every outcome class not seen before is minimized and can be saved as
+    a regression corpus to be replayed later.
+
+    Each sender has at most one transaction per block-generation loop, so a case
+    rejected by the proxy never leaves a nonce gap blocking the others.
+    """
+
+    def __init__(
+        self,
+        senders: list[Wallet],
+        seed: int = 0,
+        delegation_sc_address: str = None,
+        keys_per_stake: int = 1,
+    ) -> None:
+        self.senders = senders
+        self.seed = seed
+        self.delegation_sc_address = delegation_sc_address
+        self.keys_per_stake = keys_per_stake
+        self.known = set()
+        self._keys = None
+
+    @classmethod
+    def provision(
+        cls,
+        count: int,
+        seed: int = 0,
+        delegation_sc_address: str = None,
+        keys_per_stake: int = 1,
+        egld_amount=SENDER_BALANCE,
+        output_dir: str = None,
+    ) -> "StakingFuzzer":
+        """Generates count seeded senders and funds all of them with one set-state request."""
+        senders = generate_wallets(count, seed, output_dir)
+        set_balances(senders, egld_amount)
+        return cls(senders, seed, delegation_sc_address, keys_per_stake)
+
+    def _sender_keys(self, sender: int) -> list[ValidatorKey]:
+        if self._keys is None:
+            self._keys = generate_validator_keys(
+                len(self.senders) * self.keys_per_stake, self.seed
+            )
+        start = sender * self.keys_per_stake
+        return self._keys[start : start + self.keys_per_stake]
+
+    def _template(self, sender: int, operation: str) -> tuple[str, list[str], int, int]:
+        """The receiver, arguments, value and gas limit of the unmutated operation."""
+        if operation in DELEGATION_OPERATIONS:
+            if self.delegation_sc_address is None:
+                raise ValueError(f"{operation} needs a delegation contract address")
+            args, value = [operation], 0
+            if operation == DELEGATE:
+                value = DELEGATION_AMOUNT
+            elif operation == UN_DELEGATE:
+                args.append(decimal_to_hex(DELEGATION_AMOUNT))
+            return (
+                self.delegation_sc_address,
+                args,
+                value,
+                OPERATION_GAS_LIMITS[operation],
+            )
+
+        keys = self._sender_keys(sender)
+        if operation == STAKE:
+            owner_pubkey = self.senders[sender].get_address().pubkey
+            args = [STAKE, decimal_to_hex(len(keys))]
+            for key in keys:
+                args += [key.public_address(), key.stake_signature(owner_pubkey)]
+            return VALIDATOR_CONTRACT, args, len(keys) * NODE_PRICE, STAKING_GAS_LIMIT
+        if operation in (UN_STAKE, UN_BOND_NODES):
+            args = [operation] + [key.public_address() for key in keys]
+            return VALIDATOR_CONTRACT, args, 0, STAKING_GAS_LIMIT
+        raise ValueError(f"Unknown fuzzed operation: {operation}")
+
+    def case(self, sender: int, operation: str, mutations: list[dict]) -> FuzzCase:
+        receiver, args, value, gas_limit = self._template(sender, operation)
+        data, value = apply_mutations(args, value, mutations)
+        return FuzzCase(sender, operation, receiver, data, value, gas_limit, mutations)
+
+    @timed
+    def generate(
+        self,
+        count: int,
+        operations: list[str] = STAKING_OPERATIONS,
+        max_mutations: int = MAX_MUTATIONS,
+    ) -> list[FuzzCase]:
+        """
+        Generates a reproducible corpus of mutated cases.
+
+        Args:
+            count (int): How many cases to generate.
+            operations (list[str]): The operations to mutate, picked at random.
+            max_mutations (int): Every case gets 1 to max_mutations mutations.
+
+        Returns:
+            list[FuzzCase]: The cases, spread round-robin over the senders.
+        """
+        if STAKE in operations:
+            # stake signatures are BLS, compute them for all senders at once
+            initialize_bls()
+            self._sender_keys(0)
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                list(
+                    executor.map(
+                        lambda sender: self._template(sender, STAKE),
+                        range(len(self.senders)),
+                    )
+                )
+
+        cases = []
+        for index in range(count):
+            rng = random.Random(f"{self.seed}:{index}")
+            sender = index % len(self.senders)
+            operation = rng.choice(operations)
+            _, args, value, _ = self._template(sender, operation)
+            mutations = []
+            for _ in range(rng.randint(1, max_mutations)):
+                names = [
+                    name
+                    for name in _MUTATIONS
+                    if len(args) > 1 or name in _ARGUMENT_FREE_MUTATIONS
+                ]
+                name = rng.choice(names)
+                mutation = {"name": name, **_MUTATIONS[name][0](rng, args, value)}
+                args, value = _MUTATIONS[name][1](list(args), value, mutation)
+                mutations.append(mutation)
+            cases.append(self.case(sender, operation, mutations))
+        logger.info("Generated %s fuzz cases with seed %s", count, self.seed)
+        return cases
+
+    def _rounds(self, cases: list[FuzzCase]) -> list[list[int]]:
+        # the n-th case of every sender goes to the n-th round
+        rounds = []
+        seen = {}
+        for index, case in enumerate(cases):
+            position = seen.get(case.sender, 0)
+            seen[case.sender] = position + 1
+            if position == len(rounds):
+                rounds.append([])
+            rounds[position].append(index)
+        return rounds
+
+    @timed
+    def run(
+        self,
+        cases: list[FuzzCase],
+        batch_size: int = TX_BATCH_SIZE,
+        workers: int = None,
+    ) -> list[FuzzOutcome]:
+        """
+        Signs, sends and classifies cases.
+
+        Args:
+            cases (list[FuzzCase]): The cases to run.
+            batch_size (int): How many transactions are posted in one request.
+            workers (int, optional): Signing processes, the CPU count by default.
+
+        Returns:
+            list[FuzzOutcome]: The outcome of every case, aligned with the cases.
+                Cases rejected by the proxy have no hash and status "rejected".
+        """
+        outcomes = [None] * len(cases)
+        for indexes in self._rounds(cases):
+            senders = [self.senders[cases[index].sender] for index in indexes]
+            unsynced = [wallet for wallet in senders if wallet.nonce is None]
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+                list(executor.map(lambda wallet: wallet.get_nonce(), unsynced))
+
+            fields = []
+            for index, wallet in zip(indexes, senders):
+                case = cases[index]
+                fields.append(
+                    {
+                        "sender": wallet.public_address(),
+                        "receiver": case.receiver,
+                        "nonce": wallet.get_nonce_and_increment(),
+                        "gas_price": GAS_PRICE,
+                        "gas_limit": case.gas_limit,
+                        "chain_id": CHAIN_ID,
+                        "value": case.value,
+                        "data": case.data.encode(),
+                    }
+                )
+            transactions = sign_transactions(
+                fields, [str(wallet.get_pem_path()) for wallet in senders], workers
+            )
+            results = send_transactions_and_wait_for_execution(
+                transactions, batch_size, senders
+            )
+
+            failed = [
+                tx_hash
+                for tx_hash, status in results
+                if tx_hash is not None and status != "success"
+            ]
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+                messages = dict(zip(failed, executor.map(_error_message, failed)))
+            for index, (tx_hash, status) in zip(indexes, results):
+                outcomes[index] = FuzzOutcome(
+                    tx_hash, status, messages.get(tx_hash, "")
+                )
+        return outcomes
+
+    def classify(
+        self, cases: list[FuzzCase], outcomes: list[FuzzOutcome]
+    ) -> dict[str, list[int]]:
+        """Groups the case indexes by outcome class."""
+        classes = {}
+        for index, (case, outcome) in enumerate(zip(cases, outcomes)):
+            classes.setdefault(outcome.outcome_class(case.operation), []).append(index)
+        return classes
+
+    def interesting(
+        self, cases: list[FuzzCase], outcomes: list[FuzzOutcome]
+    ) -> list[int]:
+        """The first case of every outcome class not known yet, known ones being
+        those of the loaded or saved regressions."""
+        return [
+            indexes[0]
+            for outcome_class, indexes in self.classify(cases, outcomes).items()
+            if outcome_class not in self.known
+        ]
+
+    @timed
+    def minimize(
+        self,
+        cases: list[FuzzCase],
+        outcomes: list[FuzzOutcome],
+        rounds: int = MINIMIZE_ROUNDS,
+        batch_size: int = TX_BATCH_SIZE,
+    ) -> tuple[list[FuzzCase], list[FuzzOutcome]]:
+        """
+        Drops mutations of cases as long as their outcome class stays the same.
+
+        Every round runs all cases without one of their mutations, for all cases
+        at once, and keeps the first variant of each case with the same class.
+        The variants run against the live chain, so a variant that succeeds,
+        e.g. a stake, changes the state the next ones see.
+
+        Returns:
+            tuple[list[FuzzCase], list[FuzzOutcome]]: The minimized cases and
+                their outcomes.
+        """
+        cases, outcomes = list(cases), list(outcomes)
+        pending = [index for index, case in enumerate(cases) if case.mutations]
+        for _ in range(rounds):
+            owners, variants = [], []
+            for index in pending:
+                case = cases[index]
+                for dropped in range(len(case.mutations)):
+                    mutations = case.mutations[:dropped] + case.mutations[dropped + 1 :]
+                    variants.append(self.case(case.sender, case.operation, mutations))
+                    owners.append(index)
+            if not variants:
+                break
+
+            reduced = set()
+            expected = {
+                index: outcomes[index].outcome_class(cases[index].operation)
+                for index in pending
+            }
+            for index, variant, outcome in zip(
+                owners, variants, self.run(variants, batch_size)
+            ):
+                if index in reduced:
+                    continue
+                if outcome.outcome_class(variant.operation) == expected[index]:
+                    cases[index], outcomes[index] = variant, outcome
+                    reduced.add(index)
+            pending = [
+                index
+                for index in pending
+                if index in reduced and cases[index].mutations
+            ]
+            logger.info("Minimization round reduced %s cases", len(reduced))
+        return cases, outcomes
+
+    def _corpus_path(self, path: str = None) -> str:
+        return path or os.path.join(FUZZ_CORPUS_FOLDER, f"staking_{self.seed}.json")
+
+    def load_regressions(self, path: str = None) -> list[dict]:
+        """Loads a saved regression corpus and marks its outcome classes as known."""
+        path = self._corpus_path(path)
+        if not os.path.isfile(path):
+            return []
+        with open(path) as f:
+            entries = json.load(f)
+        self.known.update(entry["outcome_class"] for entry in entries)
+        return entries
+
+    def save_regressions(
+        self, cases: list[FuzzCase], outcomes: list[FuzzOutcome], path: str = None
+    ) -> str:
+        """Adds cases with new outcome classes to the regression corpus of the seed."""
+        path = self._corpus_path(path)
+        entries = []
+        if os.path.isfile(path):
+            with open(path) as f:
+                entries = json.load(f)
+        known = {entry["outcome_class"] for entry in entries}
+        for case, outcome in zip(cases, outcomes):
+            outcome_class = outcome.outcome_class(case.operation)
+            if outcome_class in known:
+                continue
+            known.add(outcome_class)
+            entries.append(
+                {
+                    "seed": self.seed,
+                    "case": asdict(case),
+                    "status": outcome.status,
+                    "message": outcome.message,
+                    "outcome_class": outcome_class,
+                }
+            )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(entries, f, indent=2)
+        self.known |= known
+        logger.info("Saved %s fuzz regressions to %s", len(entries), path)
+        return path
+
+    @timed
+    def replay(
+        self, path: str = None, batch_size: int = TX_BATCH_SIZE
+    ) -> list[tuple[dict, FuzzOutcome]]:
+        """
+        Runs a saved regression corpus again, with senders of the same seed.
+
+        Returns:
+            list[tuple[dict, FuzzOutcome]]: The entries whose outcome class
+                changed, with their new outcome; empty when all still match.
+        """
+        entries = self.load_regressions(path)
+        cases = [FuzzCase(**entry["case"]) for entry in entries]
+        changed = [
+            (entry, outcome)
+            for entry, case, outcome in zip(entries, cases, self.run(cases, batch_size))
+            if outcome.outcome_class(case.operation) != entry["outcome_class"]
+        ]
+        if changed:
+            logger.warning(
+                "%s of %s fuzz regressions changed their outcome",
+                len(changed),
+                len(entries),
+            )
+        return changed
+
+    def campaign(
+        self,
+        count: int,
+        operations: list[str] = STAKING_OPERATIONS,
+        max_mutations: int = MAX_MUTATIONS,
+        batch_size: int = TX_BATCH_SIZE,
+        save: bool = True,
+    ) -> dict:
+        """
+        Generates and runs a corpus, then minimizes and saves the interesting cases.
+
+        Returns:
+            dict: cases, duration, throughput (cases per second), the number of
+                cases per outcome class and the interesting minimized cases.
+        """
+        self.load_regressions()
+        started = time.perf_counter()
+        cases = self.generate(count, operations, max_mutations)
+        outcomes = self.run(cases, batch_size)
+        duration = time.perf_counter() - started
+
+        interesting = self.interesting(cases, outcomes)
+        minimized, minimized_outcomes = self.minimize(
+            [cases[index] for index in interesting],
+            [outcomes[index] for index in interesting],
+            batch_size=batch_size,
+        )
+        if save and minimized:
+            self.save_regressions(minimized, minimized_outcomes)
+
+        classes = self.classify(cases, outcomes)
+        logger.info(
+            "Fuzzed %s cases in %.2fs: %s outcome classes, %s new",
+            count,
+            duration,
+            len(classes),
+            len(interesting),
+        )
+        return {
+            "cases": count,
+            "duration": round(duration, 3),
+            "throughput": round(count / duration, 2) if duration else None,
+            "classes": {
+                outcome_class: len(indexes)
+                for outcome_class, indexes in classes.items()
+            },
+            "interesting": [
+                {**asdict(case), "status": outcome.status, "message": outcome.message}
+                for case, outcome in zip(minimized, minimized_outcomes)
+            ],
+        }
@@ -1,17 +1,72 @@
+import threading
+
+from multiversx_sdk.wallet.validator_keys import ValidatorSecretKey
+from multiversx_sdk.wallet.validator_pem import ValidatorPEM
+from multiversx_sdk.wallet.validator_signer import ValidatorSigner
+
 from config.config import OBSERVER_META
 from core.get_validator_info import get_bls_key_status, get_owner
 from models.wallet import *
 from utils.caching import force_reset_validator_statistics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_bls_lock = threading.Lock()
+_bls_initialized = False
+
+
+def initialize_bls():
+    """
+    Makes a first BLS call in the calling thread. The library initializes itself
+    on first use and crashes if that races with other threads, so call this
+    before signing or deriving keys concurrently.
+    """
+    global _bls_initialized
+    with _bls_lock:
+        if not _bls_initialized:
+            ValidatorSecretKey(bytes([1] + [0] * 31)).generate_public_key()
+            _bls_initialized = True
 
 
 class ValidatorKey:
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path = None, pem_text: str = None) -> None:
         self.path = path
-        logger.info(f"ValidatorKey initialized with path: {path}")
+        self._pem_text = pem_text
+        self._stake_signatures = {}
+        if path is not None:
+            logger.info("ValidatorKey initialized with path: %s", path)
+
+    @classmethod
+    def from_secret_key(cls, secret_key: ValidatorSecretKey) -> "ValidatorKey":
+        """An in-memory key, e.g. a generated one, that is not backed by a PEM file."""
+        label = secret_key.generate_public_key().hex()
+        return cls(pem_text=ValidatorPEM(label, secret_key).to_text())
+
+    def pem_text(self) -> str:
+        if self._pem_text is None:
+            with open(self.path) as f:
+                self._pem_text = f.read()
+        return self._pem_text
+
+    def save(self, path: Path):
+        """Writes the key as a PEM file, which then backs this key."""
+        with open(path, "w") as f:
+            f.write(self.pem_text())
+        self.path = path
+
+    def secret_key(self) -> ValidatorSecretKey:
+        return ValidatorPEM.from_text(self.pem_text()).secret_key
+
+    def stake_signature(self, owner_pubkey: bytes) -> str:
+        """The hex proof of possession required by the stake transaction of an owner."""
+        if owner_pubkey not in self._stake_signatures:
+            signer = ValidatorSigner(self.secret_key())
+            self._stake_signatures[owner_pubkey] = signer.sign(owner_pubkey).hex()
+        return self._stake_signatures[owner_pubkey]
 
     def public_address(self) -> str:
-        f = open(self.path)
-        lines = f.readlines()
+        lines = self.pem_text().splitlines(keepends=True)
         for line in lines:
             if "BEGIN" in line:
                 line = line.split(" ")
@@ -30,7 +85,7 @@ class ValidatorKey:
             return None
         for key, status in key_status_pair.items():
             if key == self.public_address():
-                logger.info(f"Status: {status} for BLS Key: {key} ")
+                logger.info("Status: %s for BLS Key: %s ", status, key)
                 return status
 
     # is using /validator/statistics route
@@ -46,19 +101,21 @@ class ValidatorKey:
         key_data = general_statistics.get(self.public_address())
 
         if key_data is None:
-            logger.warning(f"No state data found for validator key: {key_data}")
+            logger.warning("No state data found for validator key: %s", key_data)
             return None
         else:
             status = key_data.get("validatorStatus")
-            logger.info(f"Validator status is: {status}")
+            logger.info("Validator status is: %s", status)
             return status
 
     # is using /validator/auction
     def get_auction_state(self):
-        logger.info(f"Resetting validator statistics before fetching auction state.")
+        logger.info("Resetting validator statistics before fetching auction state.")
         force_reset_validator_statistics()
 
-        logger.info(f"Requesting auction state from {OBSERVER_META}/validator/auction.")
+        logger.info(
+            "Requesting auction state from %s/validator/auction.", OBSERVER_META
+        )
         response = requests.get(f"{OBSERVER_META}/validator/auction")
         response.raise_for_status()
         parsed = response.json()
@@ -73,17 +130,19 @@ class ValidatorKey:
                     state = node_list.get("qualified")
                     if state:
                         logger.info(
-                            f"BLS key {self.public_address()} is qualified in the auction."
+                            "BLS key %s is qualified in the auction.",
+                            self.public_address(),
                         )
                         return "qualified"
                     else:
                         logger.info(
-                            f"BLS key {self.public_address()} is unqualified in the auction."
+                            "BLS key %s is unqualified in the auction.",
+                            self.public_address(),
                         )
                         return "unqualified"
                 else:
                     logger.info(
-                        f"No auction data found for BLS key {self.public_address()}."
+                        "No auction data found for BLS key %s.", self.public_address()
                     )
                     return None
 
@@ -91,21 +150,20 @@ class ValidatorKey:
     def belongs_to(self, address: str) -> bool:
         owner = get_owner([self.public_address()])
         if owner == address:
-            logger.info(f"Checked ownership: True for address: {address}")
+            logger.info("Checked ownership: True for address: %s", address)
             return True
         else:
-            logger.info(f"Checked ownership: False for address: {address}")
+            logger.info("Checked ownership: False for address: %s", address)
             return False
 
     def get_private_key(self) -> str:
         private_key = ""
 
-        f = open(self.path)
-        lines = f.readlines()
+        lines = self.pem_text().splitlines(keepends=True)
         for line in lines:
             if not "BEGIN" in line and not "END" in line:
                 private_key += line
         if "\n" in private_key:
             private_key = private_key.replace("\n", "")
-        logger.debug(f"Private key retrieved for {self.path}")
+        logger.debug("Private key retrieved for %s", self.path or "in-memory key")
         return private_key
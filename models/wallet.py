@@ -1,19 +1,28 @@
+import hashlib
 import json
+import os
+import tempfile
 from pathlib import Path
 
 import requests
 from multiversx_sdk.core.address import Address
+from multiversx_sdk.wallet.user_keys import UserSecretKey
+from multiversx_sdk.wallet.user_pem import UserPEM
 from multiversx_sdk.wallet.user_signer import UserSigner
 
 from config.config import DEFAULT_PROXY, proxy_default
-from utils.logger import logger
+from core.get_address_info import get_balance, get_nonce
+from utils.logger import get_logger
+from utils.read_cache import invalidate_read_cache
+
+logger = get_logger(__name__)
 
 
 class Wallet:
     def __init__(self, path: Path) -> None:
         self.path = path
         self.nonce = None
-        logger.info(f"Wallet initialized with path: {self.path}")
+        logger.info("Wallet initialized with path: %s", self.path)
 
     def public_address(self) -> str:
         with open(self.path) as f:
@@ -27,26 +36,22 @@ class Wallet:
 
     def get_balance(self) -> int:
         address = self.public_address()
-        logger.info(f"Fetching balance for address: {address}")
-        response = requests.get(f"{DEFAULT_PROXY}/address/{address}/balance")
-        response.raise_for_status()
-        parsed = response.json()
-
-        general_data = parsed.get("data")
-        balance = general_data.get("balance")
-        logger.info(f"Retrieved balance: {balance} for address: {address}")
+        logger.info("Fetching balance for address: %s", address)
+        balance = get_balance(address)
+        logger.info("Retrieved balance: %s for address: %s", balance, address)
 
         return balance
 
     def set_balance(self, egld_amount):
         address = self.public_address()
-        logger.info(f"Setting balance for address: {address} to {egld_amount}")
+        logger.info("Setting balance for address: %s to %s", address, egld_amount)
         details = {"address": address, "balance": egld_amount}
 
         details_list = [details]
         json_structure = json.dumps(details_list)
         req = requests.post(f"{DEFAULT_PROXY}/simulator/set-state", data=json_structure)
-        logger.info(f"Set balance request status: {req.status_code}")
+        invalidate_read_cache("set-state")
+        logger.info("Set balance request status: %s", req.status_code)
 
         return req.text
 
@@ -60,7 +65,7 @@ class Wallet:
 
     def get_account(self):
         account = proxy_default.get_account(self.get_address())
-        logger.info(f"Retrieved account details for: {account.address.to_bech32()}")
+        logger.info("Retrieved account details for: %s", account.address.to_bech32())
         return account
 
     def get_pem_path(self) -> str:
@@ -70,7 +75,7 @@ class Wallet:
         Returns:
             str: Full PEM Path
         """
-        logger.info(f"Returned wallet path: {self.path}")
+        logger.info("Returned wallet path: %s", self.path)
         return self.path
 
     def fetch_nonce_from_server(self) -> int:
@@ -80,13 +85,7 @@ class Wallet:
         Returns:
             int: The nonce of the wallet's address.
         """
-        address = self.public_address()
-        logger.info(f"Checking Nonce for Address: {address}")
-        response = requests.get(f"{DEFAULT_PROXY}/address/{address}/nonce")
-        response.raise_for_status()
-        nonce = response.json()["data"]["nonce"]
-        logger.info(f"Address Nonce: {nonce}")
-        return nonce
+        return get_nonce(self.public_address())
 
     def get_nonce(self) -> int:
         """
@@ -95,12 +94,7 @@ class Wallet:
         Returns:
             int: The nonce of the address.
         """
-        address = self.public_address()
-        logger.info(f"Checking Nonce for Address: {address}")
-        response = requests.get(f"{DEFAULT_PROXY}/address/{address}/nonce")
-        response.raise_for_status()
-        self.nonce = response.json()["data"]["nonce"]
-        logger.info(f"Address Nonce: {self.nonce}")
+        self.nonce = get_nonce(self.public_address())
         return self.nonce
 
     def get_nonce_and_increment(self) -> int:
@@ -114,9 +108,52 @@ class Wallet:
         current_nonce = self.nonce
         self.nonce += 1
         logger.info(
-            f"Current nonce for address {self.public_address()}: {current_nonce}"
+            "Current nonce for address %s: %s", self.public_address(), current_nonce
         )
         logger.info(
-            f"Incremented nonce for address {self.public_address()}: {self.nonce}"
+            "Incremented nonce for address %s: %s", self.public_address(), self.nonce
         )
         return current_nonce
+
+
+def generate_wallets(count: int, seed: int = 0, output_dir: str = None) -> list[Wallet]:
+    """
+    Generates wallets from a seed and saves them as PEM files, the same on every run.
+
+    Args:
+        count (int): How many wallets to generate.
+        seed (int): Same seed, same wallets.
+        output_dir (str, optional): Folder of the PEM files, a new temporary folder by default.
+
+    Returns:
+        list[Wallet]: The wallets.
+    """
+    output_dir = output_dir or tempfile.mkdtemp(prefix="wallets_")
+    os.makedirs(output_dir, exist_ok=True)
+    logger.info("Generating %s wallets with seed %s in %s", count, seed, output_dir)
+    wallets = []
+    for index in range(count):
+        path = Path(output_dir) / f"wallet_{seed}_{index}.pem"
+        if not path.is_file():
+            secret_key = UserSecretKey(
+                hashlib.sha256(f"user:{seed}:{index}".encode()).digest()
+            )
+            address = secret_key.generate_public_key().to_address("erd")
+            UserPEM(address.to_bech32(), secret_key).save(path)
+        wallets.append(Wallet(path))
+    return wallets
+
+
+def set_balances(wallets: list[Wallet], egld_amount) -> str:
+    """Sets the balance of many wallets with one set-state request."""
+    logger.info("Setting balance of %s wallets to %s", len(wallets), egld_amount)
+    details_list = [
+        {"address": wallet.public_address(), "balance": str(egld_amount)}
+        for wallet in wallets
+    ]
+    req = requests.post(
+        f"{DEFAULT_PROXY}/simulator/set-state", data=json.dumps(details_list)
+    )
+    invalidate_read_cache("set-state")
+    req.raise_for_status()
+    return req.text
@@ -0,0 +1,50 @@
+import os
+import re
+import time
+
+import pytest
+
+from config.constants import CASSETTES_FOLDER
+from utils.cassette import RECORD, REPLAY, Cassette
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("cassettes", "record/replay of simulator HTTP traffic")
+    group.addoption(
+        "--cassette-mode",
+        choices=["off", RECORD, REPLAY],
+        default=os.getenv("CASSETTE_MODE", "off"),
+        help="Record every proxy/observer interaction per test, or replay them without a running simulator.",
+    )
+    group.addoption(
+        "--cassette-dir",
+        default=os.getenv("CASSETTE_DIR", CASSETTES_FOLDER),
+        help="Folder holding the cassettes, one per test id.",
+    )
+
+
+def is_replaying(config) -> bool:
+    return config.getoption("--cassette-mode") == REPLAY
+
+
+def cassette_path(config, nodeid: str) -> str:
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_")
+    return os.path.join(config.getoption("--cassette-dir"), f"{name}.jsonl.gz")
+
+
+@pytest.fixture(autouse=True)
+def cassette(request, monkeypatch):
+    mode = request.config.getoption("--cassette-mode")
+    if mode == "off":
+        yield None
+        return
+
+    path = cassette_path(request.config, request.node.nodeid)
+    if mode == REPLAY:
+        if not os.path.exists(path):
+            pytest.skip(f"No cassette recorded for this test: {path}")
+        # nothing to wait for when the responses are already known
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+    with Cassette(path, mode) as recording:
+        yield recording
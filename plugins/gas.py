@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from config.settings import settings
+from utils.duration_history import file_hash, git_revision
+from utils.gas_profile import DEFAULT_DB_PATH, GasHistory, gas_profiler
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("gas profile", "gas and fees per transaction type")
+    group.addoption(
+        "--gas-profile",
+        action="store_true",
+        default=os.getenv("GAS_PROFILE", "") == "1",
+        help="Record gas limit, gas used, fee and data size of every confirmed "
+        "transaction and compare their percentiles with previous runs.",
+    )
+    group.addoption(
+        "--gas-db",
+        default=os.getenv("GAS_DB", DEFAULT_DB_PATH),
+        help="SQLite file keeping the profiled transactions of every run.",
+    )
+
+
+def _enabled(config) -> bool:
+    return config.getoption("--gas-profile")
+
+
+def pytest_sessionstart(session):
+    if _enabled(session.config):
+        gas_profiler.reset()
+        gas_profiler.enable()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield
+    # the chain simulator is stopped in the fixture teardown, fetch the costs before
+    if _enabled(item.config):
+        gas_profiler.collect()
+
+
+def _simulator_hash() -> str:
+    try:
+        folder = settings.chain_simulator_folder
+    except ValueError:
+        return None
+    return file_hash(os.path.join(folder, "chainsimulator"))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if not _enabled(config):
+        return
+    gas_profiler.disable()
+    if not gas_profiler.rows:
+        return
+
+    history = GasHistory(config.getoption("--gas-db"))
+    run_id = history.start_run(
+        git_revision=git_revision(),
+        simulator_hash=_simulator_hash(),
+        network=settings.network,
+    )
+    history.record(run_id, gas_profiler.rows)
+    config._gas_report = gas_profiler.report()
+    config._gas_changes = history.compare(run_id)
+    history.close()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    report = getattr(config, "_gas_report", None)
+    if not report:
+        return
+    terminalreporter.section("gas profile")
+    for key, entry in report.items():
+        terminalreporter.write_line(
+            f"{key}: {entry['count']} txs, {entry['failed']} failed, "
+            f"gas limits {entry['gas_limits']}, gas used p50 {entry['gas_used_p50']} "
+            f"p95 {entry['gas_used_p95']}, suggested limit {entry['suggested_gas_limit']}"
+        )
+    for change in getattr(config, "_gas_changes", []):
+        terminalreporter.write_line(f"changed: {change}")
@@ -0,0 +1,125 @@
+import os
+
+from config.settings import settings
+from config.topology import get_topology
+from plugins.scheduler import required_topology
+from plugins.timing import timing_reports
+from utils.duration_history import (
+    DEFAULT_DB_PATH,
+    HELPER,
+    STEP,
+    TEST,
+    DurationHistory,
+    file_hash,
+    git_revision,
+)
+
+_tests = {}
+# chain simulator layout of every test, e.g. "10-10-6-6-50"
+_topologies = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("duration history", "durations stored across runs")
+    group.addoption(
+        "--no-duration-history",
+        action="store_true",
+        default=os.getenv("DURATION_HISTORY", "1") == "0",
+        help="Do not store the durations of this run.",
+    )
+    group.addoption(
+        "--duration-db",
+        default=os.getenv("DURATION_DB", DEFAULT_DB_PATH),
+        help="SQLite file keeping the durations of every run.",
+    )
+
+
+def _split_nodeid(nodeid: str) -> tuple[str, str]:
+    # "test_48.py::test_48[EPOCH-4]" -> ("test_48.py::test_48", "EPOCH-4")
+    test_id, _, params = nodeid.partition("[")
+    return test_id, params.rstrip("]")
+
+
+def _simulator_hash() -> str:
+    try:
+        folder = settings.chain_simulator_folder
+    except ValueError:
+        return None
+    return file_hash(os.path.join(folder, "chainsimulator"))
+
+
+def pytest_runtest_setup(item):
+    layout = get_topology(required_topology(item)).key()
+    _topologies[item.nodeid] = "-".join(str(value) for value in layout)
+
+
+def pytest_runtest_logreport(report):
+    test = _tests.setdefault(report.nodeid, {"duration": 0.0, "outcome": "passed"})
+    test["duration"] += report.duration
+    if report.failed:
+        test["outcome"] = "failed"
+    elif report.skipped and test["outcome"] == "passed":
+        test["outcome"] = "skipped"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if config.getoption("--no-duration-history") or not _tests:
+        return
+
+    rows = []
+    for nodeid, test in _tests.items():
+        if test["outcome"] == "skipped":
+            continue
+        test_id, params = _split_nodeid(nodeid)
+        rows.append(
+            (
+                test_id,
+                params,
+                TEST,
+                "total",
+                test["duration"],
+                test["outcome"],
+                _topologies.get(nodeid),
+            )
+        )
+    outcomes = {nodeid: test["outcome"] for nodeid, test in _tests.items()}
+    for report in timing_reports():
+        test_id, params = _split_nodeid(report["test"])
+        outcome = outcomes.get(report["test"])
+        topology = _topologies.get(report["test"])
+        for kind, table in ((STEP, report["steps"]), (HELPER, report["helpers"])):
+            for name, counters in table.items():
+                rows.append(
+                    (
+                        test_id,
+                        params,
+                        kind,
+                        name,
+                        counters["wall_time"],
+                        outcome,
+                        topology,
+                    )
+                )
+    if not rows:
+        return
+
+    history = DurationHistory(config.getoption("--duration-db"))
+    run_id = history.start_run(
+        git_revision=git_revision(),
+        simulator_hash=_simulator_hash(),
+        network=settings.network,
+        topology=settings.topology,
+    )
+    history.record(run_id, rows)
+    config._duration_regressions = history.compare(run_id)
+    history.close()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    regressions = getattr(config, "_duration_regressions", None)
+    if not regressions:
+        return
+    terminalreporter.section("duration regressions")
+    for regression in regressions:
+        terminalreporter.write_line(str(regression))
@@ -0,0 +1,62 @@
+import json
+import os
+
+import pytest
+
+from config.constants import PROJECT_FOLDER
+from utils.http_metrics import metrics
+
+_tests = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("http metrics", "per-endpoint metrics of HTTP traffic")
+    group.addoption(
+        "--no-http-metrics",
+        action="store_true",
+        default=os.getenv("HTTP_METRICS", "1") == "0",
+        help="Do not collect per-endpoint request counters and latency histograms.",
+    )
+    group.addoption(
+        "--metrics-dir",
+        default=os.getenv(
+            "HTTP_METRICS_DIR", os.path.join(PROJECT_FOLDER, "reports", "metrics")
+        ),
+        help="Folder for the metrics.prom and metrics.json files written at session end.",
+    )
+
+
+def _enabled(config) -> bool:
+    return not config.getoption("--no-http-metrics")
+
+
+def pytest_sessionstart(session):
+    if _enabled(session.config):
+        metrics.reset()
+        metrics.enable()
+
+
+@pytest.fixture(autouse=True)
+def http_metrics(request):
+    if not _enabled(request.config):
+        yield None
+        return
+    requests_before, time_before = metrics.totals()
+    yield metrics
+    requests_after, time_after = metrics.totals()
+    _tests[request.node.nodeid] = {
+        "requests": requests_after - requests_before,
+        "http_time": round(time_after - time_before, 6),
+    }
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _enabled(session.config):
+        return
+    metrics.disable()
+    metrics_dir = session.config.getoption("--metrics-dir")
+    os.makedirs(metrics_dir, exist_ok=True)
+    with open(os.path.join(metrics_dir, "metrics.prom"), "w") as f:
+        f.write(metrics.to_prometheus())
+    with open(os.path.join(metrics_dir, "metrics.json"), "w") as f:
+        json.dump({"endpoints": metrics.to_json(), "tests": _tests}, f, indent=2)
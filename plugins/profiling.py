@@ -0,0 +1,58 @@
+import os
+import re
+
+import pytest
+
+from config.constants import PROJECT_FOLDER
+from utils.logger import get_logger
+from utils.profiling import CPROFILE, SAMPLING, PerTestProfiler
+
+logger = get_logger(__name__)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("profiling", "per-test profiling")
+    group.addoption(
+        "--profile",
+        choices=["off", CPROFILE, SAMPLING],
+        default=os.getenv("PROFILE_MODE", "off"),
+        help="Profile every test with cProfile or with the stack sampler (collapsed stacks for flamegraphs).",
+    )
+    group.addoption(
+        "--profile-interval",
+        type=float,
+        default=float(os.getenv("PROFILE_INTERVAL", "0.005")),
+        help="Seconds between two stack samples in sampling mode.",
+    )
+    group.addoption(
+        "--profile-dir",
+        default=os.getenv(
+            "PROFILE_DIR", os.path.join(PROJECT_FOLDER, "reports", "profiles")
+        ),
+        help="Folder for the per-test profiles.",
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    mode = item.config.getoption("--profile")
+    if mode == "off":
+        yield
+        return
+
+    profiler = PerTestProfiler(mode, item.config.getoption("--profile-interval"))
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", item.nodeid).strip("_")
+        report = profiler.write(item.config.getoption("--profile-dir"), name)
+        logger.info(
+            "Profiled %s: wall %ss, cpu %ss, sleep %ss, network wait %ss",
+            item.nodeid,
+            report["wall_time"],
+            report["cpu_time"],
+            report["sleep_time"],
+            report["network_wait"],
+        )
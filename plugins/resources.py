@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+from config.constants import PROJECT_FOLDER
+from utils.resource_monitor import ResourceMonitor
+
+RESOURCES_FILE = "resources.jsonl"
+SUMMARY_FILE = "resources_summary.json"
+
+_summaries = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("resources", "chain simulator resource monitor")
+    group.addoption(
+        "--resource-interval",
+        type=float,
+        default=float(os.getenv("RESOURCE_MONITOR_INTERVAL", "0")),
+        help="Seconds between two samples of the simulator RSS, CPU, fds and data dir size (0 = off).",
+    )
+    group.addoption(
+        "--resource-dir",
+        default=os.getenv(
+            "RESOURCE_MONITOR_DIR", os.path.join(PROJECT_FOLDER, "reports", "resources")
+        ),
+        help="Folder for the resource time series and summary.",
+    )
+    group.addoption(
+        "--resource-rss-mb",
+        type=float,
+        default=float(os.getenv("RESOURCE_RSS_MB", "0")),
+        help="Warn when the simulator RSS exceeds this many MB.",
+    )
+    group.addoption(
+        "--resource-fds",
+        type=int,
+        default=int(os.getenv("RESOURCE_FDS", "0")),
+        help="Warn when the simulator has more open file descriptors.",
+    )
+    group.addoption(
+        "--resource-data-dir-mb",
+        type=float,
+        default=float(os.getenv("RESOURCE_DATA_DIR_MB", "0")),
+        help="Warn when the simulator data dir exceeds this many MB.",
+    )
+
+
+def _enabled(config) -> bool:
+    return config.getoption("--resource-interval") > 0
+
+
+def pytest_sessionstart(session):
+    if _enabled(session.config):
+        resource_dir = session.config.getoption("--resource-dir")
+        os.makedirs(resource_dir, exist_ok=True)
+        open(os.path.join(resource_dir, RESOURCES_FILE), "w").close()
+
+
+@pytest.fixture
+def simulator_resources(request):
+    """
+    Returns watch(chain_simulator), which samples the started simulator until
+    the end of the test when --resource-interval is set, and does nothing otherwise.
+    """
+    monitors = []
+    config = request.config
+
+    def watch(chain_simulator):
+        if not _enabled(config) or chain_simulator.process is None:
+            return None
+        monitor = ResourceMonitor(
+            chain_simulator.process.pid,
+            data_dir=chain_simulator.path,
+            interval=config.getoption("--resource-interval"),
+            output_path=os.path.join(
+                config.getoption("--resource-dir"), RESOURCES_FILE
+            ),
+            thresholds={
+                "rss_mb": config.getoption("--resource-rss-mb"),
+                "open_fds": config.getoption("--resource-fds"),
+                "data_dir_mb": config.getoption("--resource-data-dir-mb"),
+            },
+        )
+        monitor.start()
+        monitors.append(monitor)
+        return monitor
+
+    yield watch
+    for monitor in monitors:
+        monitor.stop()
+        _summaries[request.node.nodeid] = monitor.summary()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _summaries:
+        return
+    path = os.path.join(session.config.getoption("--resource-dir"), SUMMARY_FILE)
+    with open(path, "w") as f:
+        json.dump(_summaries, f, indent=2)
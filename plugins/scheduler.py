@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from config.settings import settings
+from config.topology import get_topology
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("scheduler", "epoch-grouped test scheduling")
+    group.addoption(
+        "--epoch-grouping",
+        action="store_true",
+        default=os.getenv("EPOCH_GROUPING", "") == "1",
+        help="Order tests by topology and required epoch, and run tests marked "
+        "shared_chain on one chain that only moves forward.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "shared_chain: the test only uses its own accounts and keys, so it can run on "
+        "a chain that earlier tests already advanced",
+    )
+    config.addinivalue_line(
+        "markers",
+        "epoch(n): the epoch the test needs, when it is not an epoch parameter",
+    )
+
+
+def epoch_grouping(config) -> bool:
+    return config.getoption("--epoch-grouping")
+
+
+def required_epoch(item) -> int:
+    """The epoch a test needs: its "epoch" parameter or @pytest.mark.epoch(n), else None."""
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None and "epoch" in callspec.params:
+        return int(callspec.params["epoch"])
+    marker = item.get_closest_marker("epoch")
+    return int(marker.args[0]) if marker else None
+
+
+def required_topology(item) -> str:
+    marker = item.get_closest_marker("topology")
+    return marker.args[0] if marker else settings.topology
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    if not epoch_grouping(config):
+        return
+    # stable sort: within a topology, shared-chain tests run in ascending epoch
+    # order, and tests needing a fresh chain keep their relative order
+    items.sort(
+        key=lambda item: (
+            required_topology(item),
+            item.get_closest_marker("shared_chain") is None,
+            required_epoch(item) or 0,
+        )
+    )
+
+
+@pytest.fixture(scope="session")
+def chain_pool():
+    # imported here: plugins load before --network is applied, and core modules
+    # read the proxy url when imported
+    from models.chain_pool import ChainPool
+
+    pool = ChainPool(settings.chain_simulator_folder)
+    yield pool
+    pool.release()
+
+
+def on_shared_chain(request) -> bool:
+    """Whether the test runs on the pooled chain, next to the state of earlier tests."""
+    return (
+        epoch_grouping(request.config)
+        and request.node.get_closest_marker("shared_chain") is not None
+    )
+
+
+def shared_chain(request):
+    """
+    Returns the pooled chain for a shared_chain test when grouping is on, else
+    None. For other tests the pooled chain is stopped, so they can start their own.
+    """
+    if not epoch_grouping(request.config):
+        return None
+    pool = request.getfixturevalue("chain_pool")
+    if request.node.get_closest_marker("shared_chain") is None:
+        pool.release()
+        return None
+    return pool.acquire(
+        get_topology(required_topology(request.node)), required_epoch(request.node)
+    )
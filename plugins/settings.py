@@ -0,0 +1,47 @@
+import pytest
+
+from config.settings import settings
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("settings", "network and simulator settings")
+    group.addoption(
+        "--network",
+        default=None,
+        help="Network profile: simulator, testnet, devnet, do-ams, ovh-p03, ovh-p04, ovh-p06, mvx-fra "
+        "or one defined in settings.json. Overrides NETWORK.",
+    )
+    group.addoption("--proxy-url", default=None, help="Overrides the proxy url.")
+    group.addoption("--observer-url", default=None, help="Overrides the observer url.")
+    group.addoption(
+        "--topology",
+        default=None,
+        help="Default chain simulator topology: minimal, staking-v4-realistic or large-auction. "
+        "Tests can pick their own with @pytest.mark.topology. Overrides TOPOLOGY.",
+    )
+    group.addoption(
+        "--chain-simulator-path",
+        default=None,
+        help="Chain simulator build folder. Overrides CHAIN_SIMULATOR_BUILD_PATH.",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_load_initial_conftests(early_config, parser, args):
+    # conftests import core modules, which read the urls, so apply the
+    # command line before they are loaded
+    options = early_config.known_args_namespace
+    settings.configure(
+        network=options.network,
+        proxy_url=options.proxy_url,
+        observer_url=options.observer_url,
+        chain_simulator_build_path=options.chain_simulator_path,
+        topology=options.topology,
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "topology(name): start the chain simulator with the named topology profile",
+    )
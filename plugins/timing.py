@@ -0,0 +1,99 @@
+import html
+import json
+import os
+import re
+import time
+
+import pytest
+
+from config.constants import PROJECT_FOLDER
+from utils.timing import record_sleep, start_recording, stop_recording
+
+SUMMARY_TOP_HELPERS = 15
+
+_session_reports = []
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("timing", "per-step timing instrumentation")
+    group.addoption(
+        "--timing",
+        action="store_true",
+        default=os.getenv("TIMING_REPORT", "") == "1",
+        help="Record wall time, HTTP calls, generated blocks and sleep time per step and core helper.",
+    )
+    group.addoption(
+        "--timing-dir",
+        default=os.getenv(
+            "TIMING_REPORT_DIR", os.path.join(PROJECT_FOLDER, "reports", "timing")
+        ),
+        help="Folder for the per-test JSON timing reports.",
+    )
+
+
+def _report_path(config, nodeid: str) -> str:
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_")
+    return os.path.join(config.getoption("--timing-dir"), f"{name}.json")
+
+
+@pytest.fixture(autouse=True)
+def timing_recorder(request, monkeypatch):
+    if not request.config.getoption("--timing"):
+        yield None
+        return
+
+    sleep = time.sleep
+
+    def measured_sleep(seconds):
+        started = time.perf_counter()
+        sleep(seconds)
+        record_sleep(time.perf_counter() - started)
+
+    monkeypatch.setattr(time, "sleep", measured_sleep)
+    recorder = start_recording(request.node.nodeid)
+    try:
+        yield recorder
+    finally:
+        report = stop_recording()
+        path = _report_path(request.config, request.node.nodeid)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        _session_reports.append(report)
+
+
+def timing_reports() -> list[dict]:
+    """The reports of the tests recorded so far in this session."""
+    return list(_session_reports)
+
+
+def aggregate_helpers(reports: list[dict]) -> dict:
+    totals = {}
+    for report in reports:
+        for name, counters in report["helpers"].items():
+            total = totals.setdefault(name, dict.fromkeys(counters, 0))
+            for key, value in counters.items():
+                total[key] += value
+    return dict(
+        sorted(totals.items(), key=lambda item: item[1]["wall_time"], reverse=True)
+    )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    if not _session_reports:
+        return
+    helpers = list(aggregate_helpers(_session_reports).items())[:SUMMARY_TOP_HELPERS]
+    total_wall = sum(report["total"]["wall_time"] for report in _session_reports)
+    rows = "".join(
+        f"<tr><td>{html.escape(name)}</td><td>{c['calls']}</td>"
+        f"<td>{c['wall_time']:.2f}</td><td>{c['http_calls']}</td>"
+        f"<td>{c['blocks_generated']}</td><td>{c['sleep_time']:.2f}</td></tr>"
+        for name, c in helpers
+    )
+    postfix.append(
+        f"<h2>Timing</h2><p>{len(_session_reports)} tests, {total_wall:.2f}s total</p>"
+        "<table><tr><th>Helper</th><th>Calls</th><th>Wall time (s)</th>"
+        "<th>HTTP calls</th><th>Blocks</th><th>Sleep (s)</th></tr>"
+        f"{rows}</table>"
+    )
@@ -4,18 +4,119 @@ from multiversx_sdk.core.transactions_factories.transactions_factory_config impo
 )
 
 from config.config import CHAIN_ID
-from config.constants import CHAIN_SIMULATOR_FOLDER
+from config.settings import settings
+from config.topology import active_topology, get_topology, set_active_topology
 from models.chain_simulator import ChainSimulator
+from models.delegation_topology import (
+    PLAIN,
+    SnapshotEpochMismatch,
+    build_delegation_topology,
+)
+from models.mock_proxy import MockProxy
+from plugins.cassettes import is_replaying
+from plugins.scheduler import on_shared_chain, required_topology, shared_chain
+from utils.http_client import set_redirects
+from utils.logger import get_logger, log_context
+from utils.timing import step
+
+logger = get_logger(__name__)
 
 config = TransactionsFactoryConfig(CHAIN_ID)
 
 
+@pytest.fixture(autouse=True)
+def log_test_id(request):
+    with log_context(test_id=request.node.nodeid, step=None):
+        yield
+
+
+def topology_for(request):
+    """The topology of @pytest.mark.topology("<profile>"), or the configured default."""
+    return get_topology(required_topology(request.node))
+
+
 @pytest.fixture(scope="function")
-def blockchain():
-    chain_simulator = ChainSimulator(CHAIN_SIMULATOR_FOLDER)
-    chain_simulator.start()
+def blockchain(request, simulator_resources):
+    if is_replaying(request.config):
+        # responses come from the cassette, no simulator is needed
+        set_active_topology(topology_for(request))
+        yield None
+        return
+    pooled_chain = shared_chain(request)
+    if pooled_chain is not None:
+        # started and stopped by the pool, sampled while this test runs
+        simulator_resources(pooled_chain)
+        yield pooled_chain
+        return
+    chain_simulator = ChainSimulator(
+        settings.chain_simulator_folder, topology_for(request)
+    )
+    with step("chain start"):
+        chain_simulator.start()
+    simulator_resources(chain_simulator)
     yield chain_simulator
-    chain_simulator.stop()
+    with step("chain stop"):
+        chain_simulator.stop()
+
+
+@pytest.fixture(scope="function")
+def mock_proxy(request):
+    set_active_topology(topology_for(request))
+    proxy = MockProxy()
+    proxy.start()
+    # modules keep the urls they imported (DEFAULT_PROXY, OBSERVER_META), so
+    # requests to those are sent to the mock as well
+    set_redirects(
+        {settings.proxy_url: proxy.proxy_url, settings.observer_url: proxy.observer_url}
+    )
+    try:
+        with settings.overridden(
+            proxy_url=proxy.proxy_url, observer_url=proxy.observer_url
+        ):
+            yield proxy
+    finally:
+        set_redirects({})
+        proxy.stop()
+
+
+@pytest.fixture(scope="session")
+def delegation_snapshots():
+    """Delegation topologies built so far in the session, with their snapshots."""
+    return {}
+
+
+@pytest.fixture
+def delegation_topology(request, blockchain, delegation_snapshots):
+    """
+    Returns get(kind, num_keys=1, seed=0), which builds the delegation topology
+    on the first use in the session and restores its snapshot afterwards, or
+    builds it again when the chain is already past the snapshot epoch.
+
+    Snapshots are not restored on the pooled chain of shared_chain tests, where
+    they would overwrite accounts that earlier tests left behind.
+    """
+
+    def get(kind: str = PLAIN, num_keys: int = 1, seed: int = 0):
+        key = (active_topology().key(), kind, num_keys, seed)
+        topology = delegation_snapshots.get(key)
+        if topology is not None:
+            if on_shared_chain(request):
+                raise RuntimeError(
+                    f"The {kind} delegation (seed {seed}) was built earlier in the session "
+                    "and its snapshot is not restored on the shared chain; use another "
+                    "seed or drop the shared_chain marker"
+                )
+            try:
+                with step(f"restore {kind} delegation"):
+                    topology.restore()
+                return topology
+            except SnapshotEpochMismatch as error:
+                logger.info("Building the delegation again: %s", error)
+        topology = build_delegation_topology(kind, num_keys, seed)
+        delegation_snapshots[key] = topology
+        return topology
+
+    return get
 
 
 @pytest.fixture
@@ -0,0 +1,49 @@
+import pytest
+from multiversx_sdk.core import Transaction, TransactionComputer
+
+import core.chain_commander
+from config.config import CHAIN_ID
+from config.constants import GAS_PRICE
+from models.wallet import generate_wallets, set_balances
+
+# these tests run against the mock proxy, see the mock_proxy fixture
+BALANCE = 10 * 10**18
+
+transaction_computer = TransactionComputer()
+
+
+@pytest.fixture(autouse=True)
+def no_api_wait(monkeypatch):
+    # the mock proxy executes transactions while generating the block
+    monkeypatch.setattr(core.chain_commander, "WAIT_UNTIL_API_REQUEST_IN_SEC", 0)
+
+
+@pytest.fixture
+def wallets(mock_proxy, tmp_path):
+    """Three seeded wallets funded with BALANCE on the mock proxy."""
+    funded = generate_wallets(3, seed=31, output_dir=str(tmp_path))
+    set_balances(funded, BALANCE)
+    return funded
+
+
+@pytest.fixture
+def transfer():
+    """Returns transfer(sender, receiver, value, nonce, ...), a signed EGLD transfer."""
+
+    def sign(sender, receiver, value, nonce, gas_limit=50000, data=b""):
+        tx = Transaction(
+            sender=sender.public_address(),
+            receiver=receiver.public_address(),
+            gas_limit=gas_limit,
+            gas_price=GAS_PRICE,
+            chain_id=CHAIN_ID,
+            value=value,
+            nonce=nonce,
+            data=data,
+        )
+        tx.signature = sender.get_signer().sign(
+            transaction_computer.compute_bytes_for_signing(tx)
+        )
+        return tx
+
+    return sign
@@ -0,0 +1,59 @@
+import requests
+
+from config.constants import NODE_PRICE
+from core.get_validator_info import get_keys_from_validator_auction
+from utils.auction_model import (
+    AuctionOwner,
+    owners_from_validator_auction,
+    select_auction_nodes,
+)
+
+
+def _key(index: int) -> str:
+    return f"{index:02x}" * 96
+
+
+def _auction_entry(owner: str, keys: list[str], top_up: int, qualified: int) -> dict:
+    return {
+        "owner": owner,
+        "numStakedNodes": len(keys),
+        "totalTopUp": str(top_up),
+        "nodes": [
+            {"blsKey": key, "qualified": index < qualified}
+            for index, key in enumerate(keys)
+        ],
+    }
+
+
+def test_auction_model_matches_the_auction_list(mock_proxy):
+    rich, poor = [_key(1), _key(2)], [_key(3), _key(4)]
+    mock_proxy.state.auction_list = [
+        _auction_entry("rich", rich, 1000 * 10**18, qualified=2),
+        _auction_entry("poor", poor, 10 * 10**18, qualified=0),
+    ]
+
+    qualified = get_keys_from_validator_auction(isQualified=True)
+    response = requests.get(f"{mock_proxy.observer_url}/validator/auction")
+    auction_list = response.json()["data"]["auctionList"]
+    result = select_auction_nodes(
+        owners_from_validator_auction(auction_list), available_slots=2
+    )
+
+    assert sorted(result.qualified) == sorted(qualified) == sorted(rich)
+    assert sorted(result.unqualified) == sorted(poor)
+    assert result.qualified_nodes["rich"] == 2
+
+
+def test_auction_ranks_by_top_up_per_node():
+    owners = [
+        AuctionOwner("a", 2 * NODE_PRICE + 100 * 10**18, 2, [_key(1), _key(2)]),
+        AuctionOwner("b", NODE_PRICE + 80 * 10**18, 1, [_key(3)]),
+        AuctionOwner("c", NODE_PRICE, 1, [_key(4)]),
+    ]
+
+    result = select_auction_nodes(owners, available_slots=3)
+
+    # b has 80 EGLD top-up per node, a has 50 per node, c has none
+    assert result.qualified[0] == _key(3)
+    assert set(result.qualified) == {_key(1), _key(2), _key(3)}
+    assert result.unqualified == [_key(4)]
@@ -0,0 +1,65 @@
+from core.create_relayed_v3_transaction import (
+    send_transactions,
+    send_transactions_and_wait_for_execution,
+)
+from core.get_address_info import get_balance, get_nonce
+
+
+def test_bulk_send_confirms_all_transactions(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+    transactions = [transfer(sender, receiver, 10**18, nonce) for nonce in range(5)]
+
+    results = send_transactions_and_wait_for_execution(transactions, batch_size=2)
+
+    # aligned with the transactions, one status per hash
+    assert [status for _, status in results] == ["success"] * 5
+    assert len({tx_hash for tx_hash, _ in results}) == 5
+    assert get_nonce(sender.public_address()) == 5
+    assert int(get_balance(receiver.public_address())) == 15 * 10**18
+
+
+def test_bulk_send_posts_batches(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+    transactions = [transfer(sender, receiver, 1, nonce) for nonce in range(7)]
+
+    tx_hashes = send_transactions(transactions, batch_size=3)
+
+    assert len(tx_hashes) == 7 and None not in tx_hashes
+    assert len(mock_proxy.state.pending) == 7
+
+
+def test_bulk_send_reports_failed_transactions(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+    # the second transfer cannot be paid once the first one went through
+    transactions = [
+        transfer(sender, receiver, 6 * 10**18, 0),
+        transfer(sender, receiver, 6 * 10**18, 1),
+    ]
+
+    results = send_transactions_and_wait_for_execution(transactions)
+
+    assert [status for _, status in results] == ["success", "fail"]
+
+
+def test_bulk_send_skips_transactions_after_a_rejected_one(
+    mock_proxy, wallets, transfer
+):
+    sender, receiver, other = wallets
+    transactions = [
+        # below the gas of its data, the proxy rejects it
+        transfer(sender, receiver, 1, 0, gas_limit=50000, data=b"memo"),
+        transfer(sender, receiver, 1, 1),
+        transfer(other, receiver, 1, 0),
+    ]
+
+    sender.nonce, other.nonce = 2, 1
+
+    results = send_transactions_and_wait_for_execution(
+        transactions, wallets=[sender, sender, other]
+    )
+
+    # the second transaction waits behind the missing nonce and is not waited for
+    assert [status for _, status in results] == ["rejected", "skipped", "success"]
+    assert results[0][0] is None and results[1][0] is not None
+    assert get_nonce(sender.public_address()) == 0
+    assert sender.nonce is None and other.nonce == 1
@@ -0,0 +1,26 @@
+import pytest
+
+from core.get_address_info import get_address_details
+from utils.cassette import RECORD, REPLAY, Cassette, CassetteDivergence
+
+
+def test_recorded_interactions_are_replayed_without_the_network(
+    mock_proxy, wallets, tmp_path
+):
+    path = str(tmp_path / "test.jsonl.gz")
+    first, second, _ = wallets
+    with Cassette(path, RECORD):
+        recorded = [get_address_details(first.public_address()) for _ in range(2)]
+        mock_proxy.state.get_account(first.public_address())["balance"] = "1"
+        recorded.append(get_address_details(first.public_address()))
+
+    mock_proxy.stop()
+    with Cassette(path, REPLAY) as cassette:
+        # identical requests are answered in the recorded order
+        replayed = [get_address_details(first.public_address()) for _ in range(3)]
+        assert cassette.unplayed() == 0
+        with pytest.raises(CassetteDivergence):
+            get_address_details(second.public_address())
+
+    assert replayed == recorded
+    assert replayed[-1]["data"]["account"]["balance"] == "1"
@@ -0,0 +1,47 @@
+import base64
+
+from multiversx_sdk.core.address import Address
+
+from models.delegation_load import DELEGATE, DelegationLoad
+
+DELEGATION_SC = Address.from_hex(
+    "00" * 8 + "0001" + "00" * 20 + "02ff", "erd"
+).to_bech32()
+EGLD = 10**18
+
+
+def test_run_wave_reports_and_tracks_stakes(mock_proxy, wallets):
+    first, second, _ = wallets
+    load = DelegationLoad(DELEGATION_SC, [first, second])
+    mock_proxy.reject_transaction(first.public_address(), 0)
+
+    report = load.run_wave(
+        [(first, DELEGATE, EGLD), (first, DELEGATE, EGLD), (second, DELEGATE, 2 * EGLD)]
+    )
+
+    stats = report["operations"][DELEGATE]
+    counts = {name: stats[name] for name in ("count", "success", "rejected", "skipped")}
+    assert counts == {"count": 3, "success": 1, "rejected": 1, "skipped": 1}
+    assert stats["avg_gas_used"] == stats["gas_used"] > 0
+    assert report["success"] == 1
+    assert load.expected_active_stake == {
+        first.public_address(): 0,
+        second.public_address(): 2 * EGLD,
+    }
+    # the first delegator's nonces are fetched again on next use
+    assert first.nonce is None and second.nonce == 1
+
+
+def test_verify_stakes_reports_mismatches(mock_proxy, wallets):
+    first, second, _ = wallets
+    load = DelegationLoad(DELEGATION_SC, [first, second])
+    load.run_wave([(first, DELEGATE, EGLD), (second, DELEGATE, EGLD)])
+    for wallet, stake in ((first, EGLD), (second, EGLD // 2)):
+        mock_proxy.set_vm_query_response(
+            DELEGATION_SC,
+            "getUserActiveStake",
+            [base64.b64encode(stake.to_bytes(8, "big")).decode()],
+            args=[wallet.get_address().to_hex()],
+        )
+
+    assert load.verify_stakes() == {second.public_address(): (EGLD, EGLD // 2)}
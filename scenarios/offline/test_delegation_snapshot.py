@@ -0,0 +1,47 @@
+import pytest
+from multiversx_sdk.core.address import Address
+
+from core.chain_commander import add_blocks_until_epoch_reached
+from core.get_address_info import get_balance
+from models.delegation_topology import PLAIN, DelegationTopology, SnapshotEpochMismatch
+from models.wallet import set_balances
+
+DELEGATION_SC = Address.from_hex(
+    "00" * 8 + "0001" + "00" * 20 + "03ff", "erd"
+).to_bech32()
+
+
+@pytest.fixture
+def topology(mock_proxy, wallets):
+    owner = wallets[0]
+    mock_proxy.state.set_state(
+        [{"address": DELEGATION_SC, "balance": 5, "keys": {"6f776e6572": "01"}}]
+    )
+    add_blocks_until_epoch_reached(2)
+    built = DelegationTopology(PLAIN, DELEGATION_SC, [owner], [], epoch=2)
+    built.snapshot()
+    return built
+
+
+def test_snapshot_is_restored_at_its_epoch(mock_proxy, topology):
+    owner = topology.owners[0]
+    balance = get_balance(owner.public_address())
+    # a later test starts a fresh chain and changes the accounts
+    mock_proxy.state.block_nonce = 0
+    set_balances([owner], 1)
+    mock_proxy.state.get_account(DELEGATION_SC)["keys"]["6f776e6572"] = "02"
+    owner.nonce = 7
+
+    topology.restore()
+
+    assert mock_proxy.state.epoch == 2
+    assert get_balance(owner.public_address()) == balance
+    assert mock_proxy.state.get_account(DELEGATION_SC)["keys"] == {"6f776e6572": "01"}
+    assert owner.nonce is None
+
+
+def test_restore_refuses_a_chain_past_the_snapshot_epoch(mock_proxy, topology):
+    add_blocks_until_epoch_reached(3)
+
+    with pytest.raises(SnapshotEpochMismatch, match="taken in epoch 2.*in epoch 3"):
+        topology.restore()
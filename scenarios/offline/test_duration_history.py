@@ -0,0 +1,47 @@
+from utils.duration_history import HELPER, TEST, DurationHistory
+
+BASELINE = {
+    (TEST, "total"): [10.0, 10.2, 9.8],
+    (HELPER, "sign"): [0.001, 0.0011, 0.0009],
+}
+
+
+def _row(kind: str, name: str, duration: float, outcome: str = "passed") -> tuple:
+    return ("test_x.py::test_x", "", kind, name, duration, outcome, "10-10-6-6-50")
+
+
+def _history(tmp_path, current: list[tuple]) -> DurationHistory:
+    history = DurationHistory(str(tmp_path / "durations.sqlite"))
+    for index in range(3):
+        run_id = history.start_run(network="simulator")
+        history.record(
+            run_id,
+            [
+                _row(kind, name, durations[index])
+                for (kind, name), durations in BASELINE.items()
+            ],
+        )
+    history.record(history.start_run(network="simulator"), current)
+    return history
+
+
+def test_flags_significant_slowdowns(tmp_path):
+    history = _history(tmp_path, [_row(TEST, "total", 13.0)])
+
+    [regression] = history.compare()
+
+    assert (regression.name, regression.duration) == ("total", 13.0)
+
+
+def test_ignores_tiny_absolute_slowdowns(tmp_path):
+    # three times slower, but only by two milliseconds
+    history = _history(tmp_path, [_row(HELPER, "sign", 0.003)])
+
+    assert history.compare() == []
+    assert len(history.compare(min_delta_seconds=0)) == 1
+
+
+def test_ignores_tests_that_did_not_pass(tmp_path):
+    history = _history(tmp_path, [_row(TEST, "total", 60.0, "failed")])
+
+    assert history.compare() == []
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from core.chain_commander import add_blocks
+from models.esdt_holdings import get_esdt_holdings, iter_esdt_entries
+
+ESDTS = {
+    "NFT-abcdef-0a": {"tokenIdentifier": "NFT-abcdef-0a", "balance": "1", "nonce": 10},
+    "TKN-123456": {"tokenIdentifier": "TKN-123456", "balance": "1000"},
+    "NFT-abcdef-02": {"tokenIdentifier": "NFT-abcdef-02", "balance": "1", "nonce": 2},
+}
+
+
+def _chunked(text: str, size: int):
+    return [text[start : start + size] for start in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_streamed_entries_match_the_document(chunk_size):
+    body = json.dumps(
+        {"data": {"blockInfo": {"nonce": 3}, "esdts": ESDTS}, "code": "ok"}
+    )
+
+    assert dict(iter_esdt_entries(_chunked(body, chunk_size))) == ESDTS
+
+
+def test_streamed_entries_of_empty_and_malformed_responses():
+    assert list(iter_esdt_entries(['{"data": {"esdts": null}}'])) == []
+    assert list(iter_esdt_entries(['{"data": {}}'])) == []
+    with pytest.raises(ValueError, match="unexpected end"):
+        list(iter_esdt_entries(['{"data": {"esdts": {"TKN-123456": {}']))
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_holdings_are_indexed_and_refreshed_when_stale(mock_proxy, wallets, stream):
+    address = wallets[0].public_address()
+    mock_proxy.state.get_account(address)["esdts"] = dict(ESDTS)
+
+    holdings = get_esdt_holdings(address, stream=stream)
+
+    assert holdings.get("TKN-123456")["balance"] == "1000"
+    assert [token["nonce"] for token in holdings.get_collection("NFT-abcdef")] == [
+        2,
+        10,
+    ]
+    assert holdings.get_nft("NFT-abcdef", 10)["tokenIdentifier"] == "NFT-abcdef-0a"
+
+    # unchanged block and address nonce: the snapshot is reused
+    mock_proxy.state.get_account(address)["esdts"] = {}
+    assert get_esdt_holdings(address, stream=stream) is holdings
+    assert holdings.identifiers()
+
+    add_blocks(1)
+    assert holdings.is_stale()
+    assert get_esdt_holdings(address, stream=stream).identifiers() == []
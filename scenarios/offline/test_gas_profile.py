@@ -0,0 +1,57 @@
+from core.create_relayed_v3_transaction import send_transactions_and_wait_for_execution
+from models.mock_proxy import GAS_PER_DATA_BYTE, MIN_GAS_LIMIT
+from utils.gas_profile import TRANSFER, GasProfiler, aggregate, percentile
+
+BUILDER = "core.create_relayed_v3_transaction.send_transactions_and_wait_for_execution"
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 95) == 7
+    assert percentile([], 50) == 0
+
+
+def test_aggregate_skips_failed_transactions_in_percentiles():
+    rows = [
+        ("stake", "stake", "success", 200, 100, "1000", 10),
+        ("stake", "stake", "success", 200, 150, "1500", 12),
+        ("stake", "stake", "fail", 300, 300, "3000", 12),
+        ("delegate", "delegate", "success", 100, 80, "800", 8),
+    ]
+
+    report = aggregate(rows)
+
+    stake = report["stake stake"]
+    assert (stake["count"], stake["failed"]) == (3, 1)
+    assert stake["gas_limits"] == [200, 300]
+    assert (stake["gas_used_p50"], stake["gas_used_max"]) == (100, 150)
+    assert stake["suggested_gas_limit"] == 165
+    assert report["delegate delegate"]["fee_p99"] == 800
+
+
+def test_profiler_records_confirmed_transactions(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+    profiler = GasProfiler()
+    profiler.enable()
+    try:
+        send_transactions_and_wait_for_execution(
+            [
+                transfer(sender, receiver, 1, 0),
+                transfer(sender, receiver, 1, 1, gas_limit=100000, data=b"memo"),
+            ]
+        )
+        assert profiler.collect() == 2
+    finally:
+        profiler.disable()
+
+    report = aggregate(profiler.rows)
+    # grouped by the helper that sent them and the called function
+    assert set(report) == {f"{BUILDER} {TRANSFER}", f"{BUILDER} memo"}
+    assert report[f"{BUILDER} {TRANSFER}"]["gas_used_max"] == MIN_GAS_LIMIT
+    assert (
+        report[f"{BUILDER} memo"]["gas_used_max"]
+        == MIN_GAS_LIMIT + 4 * GAS_PER_DATA_BYTE
+    )
@@ -0,0 +1,33 @@
+import requests
+
+from config.constants import VALIDATOR_CONTRACT
+from core.get_address_info import get_address_details
+from core.vm_query import VmQuery, run_vm_queries
+from utils.http_metrics import HttpMetrics
+
+
+def test_requests_are_counted_per_endpoint_template(mock_proxy, wallets):
+    metrics = HttpMetrics()
+    metrics.enable()
+    try:
+        for wallet in wallets:
+            get_address_details(wallet.public_address())
+        run_vm_queries(
+            [VmQuery(VALIDATOR_CONTRACT, "getOwner", ["01"])], use_cache=False
+        )
+        requests.get(f"{mock_proxy.proxy_url}/transaction/{'ab' * 32}")
+    finally:
+        metrics.disable()
+
+    report = metrics.to_json()
+    address = report["GET /address/{address}"]
+    assert address["count"] == 3 and address["errors"] == 0
+    assert address["latency_buckets"]["+Inf"] == 3
+    assert address["response_bytes"] > 0
+    assert report["POST /vm-values/query:getOwner"]["request_bytes"] > 0
+    assert report["GET /transaction/{hash}"]["status_codes"] == {"404": 1}
+    assert metrics.totals()[0] == 5
+    assert (
+        'simulator_http_requests_total{method="GET",endpoint="/address/{address}"} 3'
+        in metrics.to_prometheus()
+    )
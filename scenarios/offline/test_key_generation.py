@@ -0,0 +1,40 @@
+import os
+
+from models.key_management import add_key, generate_validator_keys
+from utils.http_client import add_observer, remove_observer
+
+
+def test_same_seed_gives_the_same_keys(tmp_path):
+    owner_pubkey = bytes(32)
+    keys = generate_validator_keys(4, seed=43, owner_pubkey=owner_pubkey, workers=2)
+    saved = generate_validator_keys(4, seed=43, output_dir=str(tmp_path))
+    other = generate_validator_keys(4, seed=44)
+
+    addresses = [key.public_address() for key in keys]
+    assert len(set(addresses)) == 4
+    assert [key.public_address() for key in saved] == addresses
+    assert not set(addresses) & {key.public_address() for key in other}
+    assert len(os.listdir(tmp_path)) == 4
+    # saved keys are loaded instead of generated again
+    reloaded = generate_validator_keys(4, seed=43, output_dir=str(tmp_path))
+    assert [key.path for key in reloaded] == [key.path for key in saved]
+    assert [key.public_address() for key in reloaded] == addresses
+    assert keys[0].stake_signature(owner_pubkey) == saved[0].stake_signature(
+        owner_pubkey
+    )
+
+
+def test_keys_are_added_in_batches(mock_proxy):
+    keys = generate_validator_keys(5, seed=43)
+    urls = []
+
+    def observer(request, response, elapsed):
+        urls.append(request.path_url)
+
+    add_observer(observer)
+    try:
+        add_key(keys, batch_size=2)
+    finally:
+        remove_observer(observer)
+
+    assert urls == ["/simulator/add-keys"] * 3
@@ -0,0 +1,41 @@
+import json
+import logging
+
+from utils.logger import (
+    JsonFormatter,
+    flush_logs,
+    get_log_context,
+    get_logger,
+    log_context,
+)
+
+logger = get_logger("offline.logging")
+
+
+class _Unprintable:
+    def __str__(self):
+        raise AssertionError("formatted a record below the logger level")
+
+
+def test_records_below_the_level_are_not_formatted(caplog):
+    caplog.set_level(logging.WARNING, logger=logger.name)
+
+    logger.info("value %s", _Unprintable())
+    flush_logs()
+
+    assert not caplog.records
+
+
+def test_records_carry_the_log_context_as_json(caplog):
+    caplog.set_level(logging.INFO, logger=logger.name)
+
+    with log_context(test_id="test_x.py::test_x", step="STEP 1"):
+        logger.info("sent %s transactions", 3)
+        assert get_log_context()["step"] == "STEP 1"
+    assert get_log_context()["step"] is None
+
+    [record] = caplog.records
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "sent 3 transactions"
+    assert (entry["test_id"], entry["step"]) == ("test_x.py::test_x", "STEP 1")
+    assert entry["logger"] == "chain_simulator.offline.logging"
@@ -0,0 +1,19 @@
+from config.config import PROXY_CHAIN_SIMULATOR
+from config.settings import settings
+from core.get_address_info import get_address_details
+
+
+def test_listens_on_ephemeral_ports_and_settings_follow(mock_proxy):
+    assert not mock_proxy.proxy_url.startswith(PROXY_CHAIN_SIMULATOR)
+    assert mock_proxy.proxy_url != mock_proxy.observer_url
+    assert settings.proxy_url == mock_proxy.proxy_url
+    assert settings.observer_url == mock_proxy.observer_url
+
+
+def test_serves_requests_made_to_imported_urls(wallets):
+    # core modules imported DEFAULT_PROXY before the mock proxy was started
+    # the wallets fixture funds them with 10 EGLD
+    details = get_address_details(wallets[0].public_address())
+    assert details["data"]["account"]["balance"] == str(10 * 10**18)
+    account = settings.provider().get_account(wallets[0].get_address())
+    assert account.balance == 10 * 10**18
@@ -0,0 +1,87 @@
+import pytest
+import requests
+
+from core.create_relayed_v3_transaction import send_transaction_and_check_for_fail
+from core.transaction_preflight import (
+    check_for_fail_without_execution,
+    fit_gas_limit,
+    fit_gas_limits,
+    preflight_transactions,
+)
+from models.mock_proxy import GAS_PER_DATA_BYTE, MIN_GAS_LIMIT
+from utils.http_client import set_interceptor
+
+OVERDRAFT = 11 * 10**18
+
+
+def test_preflight_predicts_status_and_gas(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+    results = preflight_transactions(
+        [
+            transfer(sender, receiver, 10**18, 0, data=b"hello"),
+            transfer(sender, receiver, OVERDRAFT, 0),
+        ]
+    )
+
+    assert [result.status for result in results] == ["success", "fail"]
+    assert results[0].gas_units == MIN_GAS_LIMIT + 5 * GAS_PER_DATA_BYTE
+    assert "insufficient funds" in results[1].error
+    # nothing was sent
+    assert not mock_proxy.state.transactions
+
+
+def test_fit_gas_limits(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+    transaction = transfer(sender, receiver, 1, 0, gas_limit=10**7, data=b"ab")
+
+    [gas_limit] = fit_gas_limits([transaction])
+
+    assert gas_limit == fit_gas_limit(MIN_GAS_LIMIT + 2 * GAS_PER_DATA_BYTE)
+    assert MIN_GAS_LIMIT < gas_limit < transaction.gas_limit
+
+
+def test_check_for_fail_without_execution(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+    # nothing is sent, so there is no hash
+    assert (
+        send_transaction_and_check_for_fail(
+            transfer(sender, receiver, OVERDRAFT, 0),
+            preflight=True,
+            error="insufficient funds",
+        )
+        is None
+    )
+    assert mock_proxy.state.block_nonce == 0
+    assert not mock_proxy.state.transactions
+    with pytest.raises(AssertionError):
+        send_transaction_and_check_for_fail(
+            transfer(sender, receiver, OVERDRAFT, 0), preflight=True, error="gas"
+        )
+    with pytest.raises(AssertionError, match="would not fail"):
+        check_for_fail_without_execution(transfer(sender, receiver, 1, 0))
+
+
+def test_rejected_transaction_is_not_a_fail(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+    mock_proxy.state.get_account(sender.public_address())["nonce"] = 3
+
+    with pytest.raises(AssertionError, match="rejected: lowerNonceInTransaction"):
+        check_for_fail_without_execution(transfer(sender, receiver, OVERDRAFT, 0))
+
+
+def test_non_json_error_body_is_reported(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+
+    def bad_gateway(request):
+        response = requests.Response()
+        response.status_code = 502
+        response._content = b"<html>502 Bad Gateway</html>"
+        response.url = request.url
+        return response
+
+    set_interceptor(bad_gateway)
+    try:
+        with pytest.raises(requests.HTTPError, match="502"):
+            preflight_transactions([transfer(sender, receiver, 1, 0)])
+    finally:
+        set_interceptor(None)
@@ -0,0 +1,40 @@
+import json
+import time
+
+import pytest
+
+from core.get_address_info import get_address_details
+from utils.profiling import CPROFILE, SAMPLING, PerTestProfiler
+
+
+def _wait_for_chain():
+    time.sleep(0.05)
+
+
+def _workload(address: str):
+    _wait_for_chain()
+    get_address_details(address)
+
+
+@pytest.mark.parametrize("mode", [CPROFILE, SAMPLING])
+def test_profiles_and_attributes_time(mock_proxy, wallets, tmp_path, mode):
+    profiler = PerTestProfiler(mode, interval=0.001)
+    profiler.start()
+    try:
+        _workload(wallets[0].public_address())
+    finally:
+        profiler.stop()
+
+    report = profiler.write(str(tmp_path), "test")
+
+    [(site, seconds)] = report["sleep_by_caller"].items()
+    assert site.endswith("._wait_for_chain") and seconds >= 0.05
+    assert report["network_calls"] == 1
+    assert report["network_wait"] == report["network_total"] > 0
+    with open(tmp_path / "test.attribution.json") as f:
+        assert json.load(f) == report
+    if mode == CPROFILE:
+        assert (tmp_path / "test.prof").exists()
+        assert "_workload" in (tmp_path / "test.txt").read_text()
+    else:
+        assert "_wait_for_chain" in (tmp_path / "test.collapsed").read_text()
@@ -0,0 +1,45 @@
+from config.settings import settings
+from core.chain_commander import add_blocks
+from core.get_address_info import get_balance
+from utils.read_cache import (
+    cached_read,
+    invalidate_read_cache,
+    read_generation,
+    store_cached,
+)
+
+
+def test_reads_are_cached_until_a_block_is_generated(mock_proxy, wallets):
+    address = wallets[0].public_address()
+    balance = get_balance(address)
+
+    # changed behind the proxy: the cached value is still served
+    mock_proxy.state.get_account(address)["balance"] = "1"
+    assert get_balance(address) == balance
+
+    add_blocks(1)
+    assert get_balance(address) == "1"
+
+
+def test_stale_fetches_are_not_stored():
+    invalidate_read_cache("test")
+
+    def fetch_during_invalidation():
+        invalidate_read_cache("concurrent block")
+        return "stale"
+
+    assert cached_read("test/stale", (), fetch_during_invalidation) == "stale"
+    assert cached_read("test/stale", (), lambda: "fresh") == "fresh"
+
+    generation = read_generation()
+    invalidate_read_cache("concurrent block")
+    store_cached("test/batch", (), "stale", generation)
+    assert cached_read("test/batch", (), lambda: "fresh") == "fresh"
+
+
+def test_reads_bypass_the_cache_outside_of_the_simulator(mock_proxy, wallets):
+    address = wallets[0].public_address()
+    with settings.overridden(network="devnet"):
+        get_balance(address)
+        mock_proxy.state.get_account(address)["balance"] = "1"
+        assert get_balance(address) == "1"
@@ -0,0 +1,50 @@
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+from utils.logger import log_context
+from utils.resource_monitor import ResourceMonitor, process_group
+
+
+@pytest.fixture
+def process():
+    # its own session, so the process group holds only this process
+    child = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(30)"], start_new_session=True
+    )
+    yield child
+    child.kill()
+    child.wait()
+
+
+def test_samples_are_tagged_and_thresholds_warn_once(process, tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "db").write_bytes(b"0" * 2**20)
+    output_path = tmp_path / "resources.jsonl"
+    monitor = ResourceMonitor(
+        process.pid,
+        data_dir=str(tmp_path / "data"),
+        output_path=str(output_path),
+        interval=0.01,
+        thresholds={"rss_mb": 0.5, "open_fds": None},
+    )
+
+    assert process_group(process.pid) == [process.pid]
+    with log_context(test_id="test_x.py::test_x", step="STEP 1"):
+        monitor.start()
+        while len(monitor.samples) < 2:
+            time.sleep(0.01)
+        monitor.stop()
+    first, second = monitor.samples[:2]
+
+    assert first["processes"] == 1 and first["rss_mb"] > 0.5
+    assert first["cpu_percent"] is None and second["cpu_percent"] is not None
+    assert first["data_dir_mb"] == 1.0
+    assert (first["test_id"], first["step"]) == ("test_x.py::test_x", "STEP 1")
+    assert len(monitor.warnings) == 1 and "rss_mb" in monitor.warnings[0]
+    lines = output_path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == monitor.samples
+    assert monitor.summary()["samples"] == len(monitor.samples)
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import pytest
+
+from config.settings import settings
+from config.topology import LARGE_AUCTION, MINIMAL, STAKING_V4_REALISTIC
+from plugins.scheduler import pytest_collection_modifyitems, required_epoch
+
+
+class _Item:
+    def __init__(self, name: str, *marks, epoch: int = None) -> None:
+        self.name = name
+        self.marks = {mark.mark.name: mark.mark for mark in marks}
+        if epoch is not None:
+            self.callspec = SimpleNamespace(params={"epoch": epoch})
+
+    def get_closest_marker(self, name: str):
+        return self.marks.get(name)
+
+
+def _config(grouping: bool):
+    return SimpleNamespace(getoption=lambda name: grouping)
+
+
+def _items():
+    return [
+        _Item("fresh_a"),
+        _Item("shared_epoch_5", pytest.mark.shared_chain, epoch=5),
+        _Item(
+            "large_shared",
+            pytest.mark.shared_chain,
+            pytest.mark.topology(LARGE_AUCTION),
+        ),
+        _Item("shared_marked_3", pytest.mark.shared_chain, pytest.mark.epoch(3)),
+        _Item("fresh_b", epoch=1),
+        _Item("minimal_fresh", pytest.mark.topology(MINIMAL)),
+        _Item("shared_no_epoch", pytest.mark.shared_chain),
+    ]
+
+
+def test_epoch_comes_from_the_parameter_or_the_marker():
+    items = {item.name: item for item in _items()}
+
+    assert required_epoch(items["shared_epoch_5"]) == 5
+    assert required_epoch(items["shared_marked_3"]) == 3
+    assert required_epoch(items["fresh_a"]) is None
+
+
+def test_items_are_grouped_by_topology_then_shared_chain_epoch():
+    items = _items()
+
+    with settings.overridden(topology=STAKING_V4_REALISTIC):
+        pytest_collection_modifyitems(None, _config(True), items)
+
+    assert [item.name for item in items] == [
+        "large_shared",
+        "minimal_fresh",
+        "shared_no_epoch",
+        "shared_marked_3",
+        "shared_epoch_5",
+        "fresh_a",
+        "fresh_b",
+    ]
+
+
+def test_items_keep_their_order_without_grouping():
+    items = _items()
+
+    pytest_collection_modifyitems(None, _config(False), items)
+
+    assert [item.name for item in items] == [item.name for item in _items()]
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import config.config
+from config.settings import NETWORK_PROFILES, Settings, settings
+
+
+@pytest.fixture
+def settings_file(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    monkeypatch.setenv("SETTINGS_FILE", str(path))
+    for variable in ("NETWORK", "PROXY_URL", "OBSERVER_URL", "CHAIN_ID", "TOPOLOGY"):
+        monkeypatch.delenv(variable, raising=False)
+    return path
+
+
+def test_sources_are_applied_by_priority(settings_file, monkeypatch):
+    settings_file.write_text(
+        json.dumps(
+            {
+                "network": "local",
+                "chain_id": "L",
+                "networks": {
+                    "local": {
+                        "proxy_url": "http://127.0.0.1:7950",
+                        "observer_url": "http://127.0.0.1:7951",
+                        "chain_id": "localnet",
+                    }
+                },
+            }
+        )
+    )
+    monkeypatch.setenv("OBSERVER_URL", "http://127.0.0.1:9000")
+    resolved = Settings()
+
+    # profile < file < environment < configure()
+    assert resolved.proxy_url == "http://127.0.0.1:7950"
+    assert resolved.chain_id == "L"
+    assert resolved.observer_url == "http://127.0.0.1:9000"
+    resolved.configure(network="devnet", chain_id="X")
+    assert resolved.proxy_url == NETWORK_PROFILES["devnet"].proxy_url
+    assert resolved.chain_id == "X"
+
+
+def test_nothing_is_resolved_until_read(settings_file):
+    resolved = Settings()
+    resolved.configure(network="unknown")
+
+    with pytest.raises(ValueError, match="Unknown network profile 'unknown'"):
+        resolved.network
+
+
+def test_overrides_are_restored_and_followed_by_config(mock_proxy):
+    with settings.overridden(proxy_url="http://127.0.0.1:1"):
+        assert config.config.DEFAULT_PROXY == "http://127.0.0.1:1"
+    assert config.config.DEFAULT_PROXY == mock_proxy.proxy_url
@@ -0,0 +1,23 @@
+from core.get_address_info import get_nonce
+from core.staking import stake_wave
+from models.key_management import seeded_secret_key
+from models.validatorKey import ValidatorKey
+from models.wallet import set_balances
+
+
+def test_stake_wave_skips_the_owner_after_a_rejected_stake(mock_proxy, wallets):
+    owner, other, _ = wallets
+    set_balances(wallets, 10**4 * 10**18)
+    keys = [
+        ValidatorKey.from_secret_key(seeded_secret_key(44, index)) for index in range(3)
+    ]
+    mock_proxy.reject_transaction(owner.public_address(), 0)
+
+    table = stake_wave(
+        [(owner, keys[:1], 0), (owner, keys[1:2], 0), (other, keys[2:], 0)]
+    )
+
+    assert [row["status"] for row in table] == ["rejected", "skipped", "success"]
+    assert get_nonce(owner.public_address()) == 0
+    # the owner's nonces are fetched again on next use
+    assert owner.nonce is None and other.nonce == 1
@@ -0,0 +1,50 @@
+from dataclasses import asdict
+
+from multiversx_sdk.core.address import Address
+
+from models.staking_fuzzer import (
+    DELEGATION_OPERATIONS,
+    STAKING_OPERATIONS,
+    StakingFuzzer,
+)
+from models.wallet import generate_wallets
+
+# a delegation contract address, calls to it are only accounted by the mock proxy
+DELEGATION_SC = Address.from_hex(
+    "00" * 8 + "0001" + "00" * 20 + "01ff", "erd"
+).to_bech32()
+
+
+def _corpus(seed: int, tmp_path, operations) -> list[dict]:
+    senders = generate_wallets(2, seed=seed, output_dir=str(tmp_path))
+    fuzzer = StakingFuzzer(senders, seed=seed, delegation_sc_address=DELEGATION_SC)
+    return [asdict(case) for case in fuzzer.generate(12, operations)]
+
+
+def test_same_seed_gives_the_same_corpus(tmp_path):
+    operations = STAKING_OPERATIONS + DELEGATION_OPERATIONS
+    corpus = _corpus(7, tmp_path / "a", operations)
+
+    assert corpus == _corpus(7, tmp_path / "b", operations)
+    assert corpus != _corpus(8, tmp_path / "c", operations)
+    assert all(case["mutations"] for case in corpus)
+
+
+def test_cases_run_once_per_sender_and_round(mock_proxy, tmp_path):
+    fuzzer = StakingFuzzer.provision(
+        2, seed=7, delegation_sc_address=DELEGATION_SC, output_dir=str(tmp_path)
+    )
+    cases = fuzzer.generate(5, DELEGATION_OPERATIONS)
+
+    outcomes = fuzzer.run(cases, workers=1)
+
+    assert len(outcomes) == len(cases)
+    assert all(outcome.status in ("success", "fail") for outcome in outcomes)
+    # every sender's transactions were executed in nonce order
+    assert (
+        mock_proxy.state.get_account(fuzzer.senders[0].public_address())["nonce"] == 3
+    )
+    assert (
+        mock_proxy.state.get_account(fuzzer.senders[1].public_address())["nonce"] == 2
+    )
+    assert fuzzer.interesting(cases, outcomes)
@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from core.chain_commander import add_blocks, get_block
+from utils.timing import record_sleep, start_recording, step, stop_recording, timed
+
+ADD_BLOCKS = "core.chain_commander.add_blocks"
+
+
+@timed(name="fan_out")
+def _fan_out():
+    # requests of a pool inside a helper are counted for the helper
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda _: get_block(), range(2)))
+
+
+def test_counters_are_split_per_step_and_helper(mock_proxy):
+    start_recording("test_timing")
+    try:
+        with step("generate"):
+            add_blocks(2)
+            record_sleep(0.25)
+        with step("query"):
+            _fan_out()
+    finally:
+        report = stop_recording()
+
+    generate, query = report["steps"]["generate"], report["steps"]["query"]
+    assert generate["blocks_generated"] == 2 and generate["sleep_time"] == 0.25
+    assert report["helpers"][ADD_BLOCKS]["blocks_generated"] == 2
+    assert query["blocks_generated"] == 0
+    assert report["helpers"]["fan_out"]["http_calls"] == query["http_calls"] > 0
+    assert report["total"]["http_calls"] == generate["http_calls"] + query["http_calls"]
+    assert report["total"]["wall_time"] >= generate["wall_time"] + query["wall_time"]
@@ -0,0 +1,24 @@
+import pytest
+
+from config.topology import MINIMAL, active_topology, get_topology
+from core.chain_commander import add_blocks, get_epoch
+
+
+def test_profiles_are_validated_and_rendered_as_flags():
+    minimal = get_topology(MINIMAL)
+
+    assert "--rounds-per-epoch 20" in minimal.command_flags()
+    assert "-num-validators-meta 1" in minimal.command_flags()
+    assert minimal.key() == (1, 1, 0, 0, 20)
+    with pytest.raises(ValueError, match="Unknown topology profile 'huge'"):
+        get_topology("huge")
+
+
+@pytest.mark.topology(MINIMAL)
+def test_marked_topology_is_active_for_the_test(mock_proxy):
+    assert active_topology().name == MINIMAL
+
+    add_blocks(20)
+
+    # epochs of the minimal profile are 20 rounds long
+    assert get_epoch() == 1
@@ -0,0 +1,59 @@
+import base64
+
+from core.create_relayed_v3_transaction import send_transactions
+from core.get_transaction_info import (
+    get_token_identifier_from_esdt_tx,
+    get_transaction_events,
+)
+
+
+def _event(identifier: str, *topics: bytes) -> dict:
+    return {
+        "identifier": identifier,
+        "address": "",
+        "topics": [base64.b64encode(topic).decode() for topic in topics],
+        "data": "",
+    }
+
+
+def _sent_with_events(mock_proxy, sender, receiver, transfer, logs, scrs=()) -> str:
+    [tx_hash] = send_transactions([transfer(sender, receiver, 0, 0)])
+    mock_proxy.state.transactions[tx_hash]["logs"] = {"events": logs}
+    mock_proxy.state.transactions[tx_hash]["smartContractResults"] = [
+        {"hash": f"scr{index}", "logs": {"events": events}}
+        for index, events in enumerate(scrs)
+    ]
+    return tx_hash
+
+
+def test_token_identifier_prefers_the_nft_issue_event(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+    tx_hash = _sent_with_events(
+        mock_proxy,
+        sender,
+        receiver,
+        transfer,
+        [_event("issue", b"TKN-111111"), _event("issueNonFungible", b"NFT-222222")],
+    )
+
+    assert get_token_identifier_from_esdt_tx(tx_hash) == "NFT-222222"
+
+
+def test_events_are_decoded_and_indexed(mock_proxy, wallets, transfer):
+    sender, receiver, _ = wallets
+    tx_hash = _sent_with_events(
+        mock_proxy,
+        sender,
+        receiver,
+        transfer,
+        [_event("issue", b"TKN-111111", b"Token", b"TKN", b"FungibleESDT")],
+        scrs=[[_event("ESDTNFTCreate", b"NFT-222222", (7).to_bytes(1, "big"))]],
+    )
+
+    events = get_transaction_events(tx_hash)
+
+    assert get_token_identifier_from_esdt_tx(tx_hash) == "TKN-111111"
+    [create] = events.get("ESDTNFTCreate")
+    assert create.source == "scr0"
+    assert create.fields["token_nonce"] == 7
+    assert events.first("unknown", "issue").fields["token_ticker"] == "TKN"
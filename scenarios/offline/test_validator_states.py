@@ -0,0 +1,59 @@
+import base64
+
+from config.constants import STAKING_CONTRACT, VALIDATOR_CONTRACT
+from core.get_validator_info import (
+    get_validator_states,
+    validator_state_inconsistencies,
+)
+
+KEYS = [f"{index:02x}" * 96 for index in range(4)]
+
+
+def _b64(value: bytes) -> str:
+    return base64.b64encode(value).decode()
+
+
+def test_sources_are_joined_and_contradictions_listed(mock_proxy, wallets):
+    owner = wallets[0]
+    for key in (KEYS[0], KEYS[1], KEYS[3]):
+        mock_proxy.set_vm_query_response(
+            STAKING_CONTRACT, "getOwner", [_b64(owner.get_address().pubkey)], args=[key]
+        )
+    mock_proxy.set_vm_query_response(
+        VALIDATOR_CONTRACT,
+        "getBlsKeysStatus",
+        [
+            _b64(bytes.fromhex(KEYS[0])),
+            _b64(b"staked"),
+            _b64(bytes.fromhex(KEYS[1])),
+            _b64(b"queued"),
+            _b64(bytes.fromhex(KEYS[3])),
+            _b64(b"staked"),
+        ],
+        args=[owner.get_address().to_hex()],
+    )
+    mock_proxy.state.validator_statistics = {
+        KEYS[0]: {"validatorStatus": "eligible"},
+        KEYS[1]: {"validatorStatus": "waiting"},
+        KEYS[2]: {"validatorStatus": "auction"},
+        KEYS[3]: {"validatorStatus": "auction"},
+    }
+    mock_proxy.state.auction_list = [
+        {
+            "owner": owner.public_address(),
+            "nodes": [{"blsKey": KEYS[3], "qualified": True}],
+        }
+    ]
+
+    # the statistics reset waits a second for the simulator, the mock needs none
+    states = get_validator_states(KEYS, reset=False)
+
+    assert states[KEYS[0]].owner == owner.public_address()
+    assert (states[KEYS[0]].status, states[KEYS[0]].state) == ("staked", "eligible")
+    assert states[KEYS[2]].owner is None and states[KEYS[2]].status is None
+    assert states[KEYS[3]].in_auction and states[KEYS[3]].qualified
+    assert validator_state_inconsistencies(states) == [
+        f"{KEYS[1]}: queued in the validator contract but waiting",
+        f"{KEYS[2]}: auction in the statistics but not in the auction list",
+        f"{KEYS[2]}: auction in the statistics but has no owner",
+    ]
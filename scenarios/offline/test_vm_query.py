@@ -0,0 +1,69 @@
+import base64
+
+from config.constants import VALIDATOR_CONTRACT
+from config.settings import settings
+from core.chain_commander import add_blocks
+from core.vm_query import VmQuery, run_vm_queries
+from utils.http_client import add_observer, remove_observer
+
+
+def _b64(value: bytes) -> str:
+    return base64.b64encode(value).decode()
+
+
+def test_vm_queries_decode_and_align(mock_proxy):
+    mock_proxy.set_vm_query_response(
+        VALIDATOR_CONTRACT, "getTotalStaked", [_b64((5000).to_bytes(2, "big"))]
+    )
+    mock_proxy.set_vm_query_response(
+        VALIDATOR_CONTRACT, "getBlsKeysStatus", [_b64(b"aa"), _b64(b"staked")]
+    )
+    queries = [
+        VmQuery(VALIDATOR_CONTRACT, "getTotalStaked", ["01"], returns=["bigint"]),
+        VmQuery(
+            VALIDATOR_CONTRACT, "getBlsKeysStatus", ["02"], ("pairs", "hex", "string")
+        ),
+        VmQuery(VALIDATOR_CONTRACT, "getOwner", ["03"]),
+    ]
+
+    results = run_vm_queries(queries, use_cache=False)
+
+    assert [result.query for result in results] == queries
+    assert results[0].value() == 5000
+    assert results[1].values == {"6161": "staked"}
+    assert results[2].value() is None and not results[2].has_data
+
+
+def test_vm_queries_are_cached_per_block(mock_proxy):
+    query = VmQuery(VALIDATOR_CONTRACT, "getTotalStaked", ["01"], returns=["string"])
+    mock_proxy.set_vm_query_response(VALIDATOR_CONTRACT, "getTotalStaked", [_b64(b"1")])
+    [first] = run_vm_queries([query])
+
+    # same block: served from the cache
+    mock_proxy.set_vm_query_response(VALIDATOR_CONTRACT, "getTotalStaked", [_b64(b"2")])
+    [cached] = run_vm_queries([query])
+    assert (first.value(), cached.value()) == ("1", "1")
+
+    add_blocks(1)
+    [fresh] = run_vm_queries([query])
+    assert fresh.value() == "2"
+
+
+def test_vm_queries_skip_the_block_nonce_outside_of_the_simulator(mock_proxy):
+    query = VmQuery(VALIDATOR_CONTRACT, "getTotalStaked", ["01"], returns=["string"])
+    mock_proxy.set_vm_query_response(VALIDATOR_CONTRACT, "getTotalStaked", [_b64(b"1")])
+    urls = []
+
+    def observer(request, response, elapsed):
+        urls.append(request.url)
+
+    add_observer(observer)
+    try:
+        with settings.overridden(network="devnet"):
+            [result] = run_vm_queries([query])
+    finally:
+        remove_observer(observer)
+
+    assert result.value() == "1"
+    assert [url for url in urls if "/network/status" in url] == []
+    assert len(urls) == 1
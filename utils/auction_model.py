@@ -0,0 +1,230 @@
+from dataclasses import dataclass, field
+
+from config.constants import (
+    NODE_PRICE,
+    SOFT_AUCTION_MAX_ITERATIONS,
+    SOFT_AUCTION_MAX_TOP_UP,
+    SOFT_AUCTION_MIN_TOP_UP,
+    SOFT_AUCTION_TOP_UP_STEP,
+)
+
+
+@dataclass(frozen=True)
+class SoftAuctionConfig:
+    step: int = SOFT_AUCTION_TOP_UP_STEP
+    min_top_up: int = SOFT_AUCTION_MIN_TOP_UP
+    max_top_up: int = SOFT_AUCTION_MAX_TOP_UP
+    max_iterations: int = SOFT_AUCTION_MAX_ITERATIONS
+
+
+@dataclass
+class AuctionOwner:
+    """
+    An owner taking part in the auction.
+
+    Args:
+        address (str): The owner address.
+        total_stake (int): Everything the owner staked, in denominated units.
+        num_staked_nodes (int): All staked nodes of the owner, active ones included.
+        auction_keys (list[str]): Hex BLS keys of the owner's nodes in the auction
+            list; synthetic ids are fine when sweeping auction spaces.
+    """
+
+    address: str
+    total_stake: int
+    num_staked_nodes: int
+    auction_keys: list[str] = field(default_factory=list)
+
+    @property
+    def total_top_up(self) -> int:
+        return max(0, self.total_stake - self.num_staked_nodes * NODE_PRICE)
+
+
+@dataclass
+class AuctionResult:
+    qualified: list[str]
+    unqualified: list[str]
+    # the lowest top-up per node among the qualified nodes
+    min_top_up: int
+    # the soft auction top-up the per-owner node counts were computed with
+    threshold: int
+    # owner -> number of qualified nodes and the top-up per node they get
+    qualified_nodes: dict[str, int]
+    qualified_top_up_per_node: dict[str, int]
+
+
+def owners_from_validator_auction(auction_list: list[dict]) -> list[AuctionOwner]:
+    """
+    Builds the model input from the auctionList of /validator/auction, e.g. to
+    check the model against the chain.
+    """
+    owners = []
+    for entry in auction_list:
+        num_staked_nodes = int(entry["numStakedNodes"])
+        owners.append(
+            AuctionOwner(
+                address=entry["owner"],
+                total_stake=num_staked_nodes * NODE_PRICE + int(entry["totalTopUp"]),
+                num_staked_nodes=num_staked_nodes,
+                auction_keys=[node["blsKey"] for node in entry.get("nodes", [])],
+            )
+        )
+    return owners
+
+
+def _xor_key(key: str, randomness: bytes) -> bytes:
+    key_bytes = bytes.fromhex(key)
+    return bytes(a ^ b for a, b in zip(key_bytes, randomness))
+
+
+def _qualified_counts(
+    top_up: int,
+    total_top_ups: list[int],
+    active_nodes: list[int],
+    auction_nodes: list[int],
+) -> list[int]:
+    """Per-owner qualified nodes at a soft auction top-up, 0 for owners dropping out."""
+    counts = []
+    for total, active, auction in zip(total_top_ups, active_nodes, auction_nodes):
+        left_for_auction = total - top_up * active
+        if left_for_auction < top_up:
+            counts.append(0)
+        else:
+            counts.append(min(auction, left_for_auction // top_up))
+    return counts
+
+
+def select_auction_nodes(
+    owners: list[AuctionOwner],
+    available_slots: int,
+    randomness: bytes = b"",
+    config: SoftAuctionConfig = SoftAuctionConfig(),
+) -> AuctionResult:
+    """
+    Predicts the staking v4 auction selection.
+
+    Follows the auction list selector of the protocol: the owners' top-up is
+    spread over their nodes, then a soft auction raises the required top-up
+    per node step by step, dropping nodes of owners that can no longer cover
+    it, until fewer nodes than available slots are left. The configuration of
+    the step before is kept, and its nodes are ranked by top-up per node.
+
+    The protocol walks the steps one by one; since the number of qualifying
+    nodes never grows with the required top-up, the same step is found here
+    with a binary search, so the cost is a few passes over the owners.
+
+    Args:
+        owners (list[AuctionOwner]): The owners with nodes in the auction list.
+        available_slots (int): Free slots in the waiting list for auction nodes.
+        randomness (bytes): The epoch start randomness. Nodes with equal top-up
+            are ranked by their key XOR-ed with it; without it, ties keep the
+            input order.
+        config (SoftAuctionConfig): The soft auction parameters.
+
+    Returns:
+        AuctionResult: Qualified keys in ranking order, unqualified keys and
+            the per-owner configuration.
+    """
+    owners = [owner for owner in owners if owner.auction_keys]
+    if not owners or available_slots <= 0:
+        return AuctionResult(
+            [], [key for owner in owners for key in owner.auction_keys], 0, 0, {}, {}
+        )
+
+    # one column per owner attribute
+    total_top_ups = [owner.total_top_up for owner in owners]
+    auction_nodes = [len(owner.auction_keys) for owner in owners]
+    staked_nodes = [
+        max(owner.num_staked_nodes, count)
+        for owner, count in zip(owners, auction_nodes)
+    ]
+    active_nodes = [
+        staked - auction for staked, auction in zip(staked_nodes, auction_nodes)
+    ]
+    top_up_per_node = [
+        total // staked for total, staked in zip(total_top_ups, staked_nodes)
+    ]
+    slots = min(available_slots, sum(auction_nodes))
+
+    min_top_up = max(min(min(top_up_per_node), config.max_top_up), config.min_top_up)
+    max_top_up = max(
+        total // (active + 1) for total, active in zip(total_top_ups, active_nodes)
+    )
+
+    # steps min_top_up + k * step, k < steps, as walked by the protocol
+    steps = 0
+    if min_top_up < max_top_up:
+        steps = -(-(max_top_up - min_top_up) // config.step)
+    steps = min(steps, config.max_iterations)
+
+    def qualifying(k: int) -> int:
+        top_up = min_top_up + k * config.step
+        return sum(
+            _qualified_counts(top_up, total_top_ups, active_nodes, auction_nodes)
+        )
+
+    # first step with fewer qualifying nodes than slots, or steps if none is found
+    low, high = 0, steps
+    while low < high:
+        middle = (low + high) // 2
+        if qualifying(middle) < slots:
+            high = middle
+        else:
+            low = middle + 1
+    # the protocol keeps the configuration before the last step it walked
+    kept = low - 1 if low < steps else steps - 2
+
+    if kept < 0:
+        threshold = 0
+        counts = list(auction_nodes)
+        per_node = list(top_up_per_node)
+    else:
+        threshold = min_top_up + kept * config.step
+        counts = _qualified_counts(
+            threshold, total_top_ups, active_nodes, auction_nodes
+        )
+        per_node = []
+        for count, auction, total, active, initial in zip(
+            counts, auction_nodes, total_top_ups, active_nodes, top_up_per_node
+        ):
+            # owners that could still cover all their nodes keep the initial top-up
+            if count >= auction:
+                per_node.append(initial)
+            elif count:
+                per_node.append(total // (active + count))
+            else:
+                per_node.append(0)
+
+    # each owner puts forward its keys in descending order
+    candidates = []
+    for owner, count, top_up in zip(owners, counts, per_node):
+        for key in sorted(owner.auction_keys, reverse=True)[:count]:
+            candidates.append((key, top_up))
+    if randomness:
+        candidates.sort(key=lambda c: _xor_key(c[0], randomness), reverse=True)
+    candidates.sort(key=lambda c: c[1], reverse=True)
+
+    selected = candidates[:slots]
+    qualified = [key for key, _ in selected]
+    qualified_set = set(qualified)
+    qualified_nodes = {}
+    qualified_top_up_per_node = {}
+    for owner, top_up in zip(owners, per_node):
+        count = sum(key in qualified_set for key in owner.auction_keys)
+        if count:
+            qualified_nodes[owner.address] = count
+            qualified_top_up_per_node[owner.address] = top_up
+
+    return AuctionResult(
+        qualified=qualified,
+        unqualified=[
+            key
+            for owner in owners
+            for key in owner.auction_keys
+            if key not in qualified_set
+        ],
+        min_top_up=selected[-1][1] if selected else 0,
+        threshold=threshold,
+        qualified_nodes=qualified_nodes,
+        qualified_top_up_per_node=qualified_top_up_per_node,
+    )
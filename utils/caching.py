@@ -4,9 +4,13 @@ import requests
 
 from config.config import DEFAULT_PROXY
 from core.chain_commander import add_blocks
-from utils.logger import logger
+from utils.logger import get_logger
+from utils.timing import timed
 
+logger = get_logger(__name__)
 
+
+@timed
 def force_reset_validator_statistics():
     route = f"{DEFAULT_PROXY}/simulator/force-reset-validator-statistics"
     response = requests.post(route)
@@ -0,0 +1,135 @@
+import gzip
+import json
+import os
+import threading
+from collections import deque
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from utils.http_client import add_observer, remove_observer, set_interceptor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteDivergence(Exception):
+    pass
+
+
+def _normalize_body(body) -> str:
+    if body is None:
+        return ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return body
+
+
+def _interaction_key(method: str, url: str, body: str) -> tuple:
+    return method.upper(), url, body
+
+
+class Cassette:
+    """
+    Recording of HTTP interactions, stored as gzip-compressed JSON lines.
+
+    In record mode every request and response passing through the HTTP layer
+    is appended. In replay mode requests are answered from the recording and
+    no network call is made. Identical requests are replayed in the order they
+    were recorded. Any request that was not recorded raises
+    CassetteDivergence immediately.
+    """
+
+    def __init__(self, path: str, mode: str) -> None:
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.interactions = []
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Cassette":
+        if self.mode == REPLAY:
+            self.load()
+            set_interceptor(self._replay)
+        else:
+            add_observer(self._record)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.mode == REPLAY:
+            set_interceptor(None)
+        else:
+            remove_observer(self._record)
+            if exc_type is None:
+                self.save()
+        return False
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            self.interactions = [json.loads(line) for line in f if line.strip()]
+        self._queues = {}
+        for interaction in self.interactions:
+            key = _interaction_key(
+                interaction["method"], interaction["url"], interaction["body"]
+            )
+            self._queues.setdefault(key, deque()).append(interaction)
+        logger.info(
+            "Loaded cassette %s with %s interactions", self.path, len(self.interactions)
+        )
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+        logger.info(
+            "Saved cassette %s with %s interactions", self.path, len(self.interactions)
+        )
+
+    def unplayed(self) -> int:
+        """Returns how many recorded interactions were not requested during replay."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _record(self, request, response, elapsed):
+        interaction = {
+            "method": request.method,
+            "url": request.url,
+            "body": _normalize_body(request.body),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", ""),
+            "response": response.content.decode("utf-8", errors="replace"),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def _replay(self, request):
+        key = _interaction_key(
+            request.method, request.url, _normalize_body(request.body)
+        )
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise CassetteDivergence(
+                    f"Request not in cassette {self.path}: {request.method} {request.url} {key[2][:200]}"
+                )
+            interaction = queue.popleft()
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": interaction["content_type"]}
+        )
+        response._content = interaction["response"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        return response
@@ -0,0 +1,318 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import time
+
+from config.constants import PROJECT_FOLDER
+
+DEFAULT_DB_PATH = os.path.join(PROJECT_FOLDER, "reports", "durations.sqlite")
+FILE_HASH_CACHE_PATH = os.path.join(PROJECT_FOLDER, "reports", "file_hashes.json")
+DEFAULT_BASELINE_RUNS = 10
+MIN_BASELINE_SAMPLES = 3
+DEFAULT_MAX_P_VALUE = 0.01
+DEFAULT_MIN_SLOWDOWN = 1.1
+DEFAULT_MIN_DELTA_SECONDS = 0.05
+
+TEST = "test"
+STEP = "step"
+HELPER = "helper"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    git_revision TEXT,
+    simulator_hash TEXT,
+    network TEXT,
+    topology TEXT
+);
+CREATE TABLE IF NOT EXISTS durations (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id TEXT NOT NULL,
+    params TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    duration REAL NOT NULL,
+    outcome TEXT,
+    topology TEXT
+);
+CREATE INDEX IF NOT EXISTS durations_key
+    ON durations (test_id, params, kind, name, run_id);
+"""
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=PROJECT_FOLDER,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def file_hash(path: str, cache_path: str = FILE_HASH_CACHE_PATH) -> str:
+    """
+    Returns the sha256 of a file, e.g. the chainsimulator binary, or None if it is missing.
+
+    Hashes are kept in cache_path by path, modification time and size, so an
+    unchanged binary is not read again on every run.
+    """
+    if not path or not os.path.isfile(path):
+        return None
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(path)
+    if entry and entry.get("stamp") == stamp:
+        return entry["sha256"]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    cache[path] = {"stamp": stamp, "sha256": digest.hexdigest()}
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, indent=2)
+    except OSError:
+        pass
+    return cache[path]["sha256"]
+
+
+class Regression:
+    def __init__(
+        self,
+        test_id: str,
+        params: str,
+        kind: str,
+        name: str,
+        duration: float,
+        baseline: list[float],
+        p_value: float,
+    ) -> None:
+        self.test_id = test_id
+        self.params = params
+        self.kind = kind
+        self.name = name
+        self.duration = duration
+        self.baseline_mean = statistics.fmean(baseline)
+        self.baseline_samples = len(baseline)
+        self.p_value = p_value
+
+    @property
+    def slowdown(self) -> float:
+        return (
+            self.duration / self.baseline_mean if self.baseline_mean else float("inf")
+        )
+
+    def __str__(self) -> str:
+        params = f"[{self.params}]" if self.params else ""
+        return (
+            f"{self.test_id}{params} {self.kind} {self.name}: {self.duration:.2f}s vs "
+            f"{self.baseline_mean:.2f}s over {self.baseline_samples} runs "
+            f"(x{self.slowdown:.2f}, p={self.p_value:.4f})"
+        )
+
+
+class DurationHistory:
+    """
+    SQLite store of test, step and helper durations per run, keyed by test id,
+    parametrization, chain simulator topology, network, chain simulator binary
+    hash and git revision.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+        columns = {
+            row[1] for row in self.connection.execute("PRAGMA table_info(durations)")
+        }
+        if "topology" not in columns:
+            # databases created before durations were keyed by topology
+            with self.connection:
+                self.connection.execute(
+                    "ALTER TABLE durations ADD COLUMN topology TEXT"
+                )
+
+    def close(self):
+        self.connection.close()
+
+    def start_run(
+        self,
+        git_revision: str = None,
+        simulator_hash: str = None,
+        network: str = None,
+        topology: str = None,
+    ) -> int:
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, git_revision, simulator_hash, network, topology) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (time.time(), git_revision, simulator_hash, network, topology),
+            )
+        return cursor.lastrowid
+
+    def record(self, run_id: int, rows: list[tuple]):
+        """
+        Stores durations of a run.
+
+        Args:
+            run_id (int): The run returned by start_run.
+            rows (list[tuple]): (test_id, params, kind, name, duration, outcome, topology)
+                tuples, kind being "test", "step" or "helper" and topology the key of
+                the chain simulator layout the test ran on.
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO durations "
+                "(run_id, test_id, params, kind, name, duration, outcome, topology) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in rows],
+            )
+
+    def latest_run(self) -> int:
+        row = self.connection.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+
+    def compare(
+        self,
+        run_id: int = None,
+        baseline_runs: int = DEFAULT_BASELINE_RUNS,
+        max_p_value: float = DEFAULT_MAX_P_VALUE,
+        min_slowdown: float = DEFAULT_MIN_SLOWDOWN,
+        same_simulator: bool = False,
+        min_delta_seconds: float = DEFAULT_MIN_DELTA_SECONDS,
+    ) -> list[Regression]:
+        """
+        Compares the durations of a run against the previous runs on the same
+        network, each test against the runs that used the same topology.
+
+        Only durations of passed tests are checked. A duration is a regression
+        when it is at least min_slowdown times and min_delta_seconds more than
+        the baseline mean and, assuming the baseline durations are normally
+        distributed, a duration at least this long has a one-sided probability
+        below max_p_value.
+
+        Args:
+            run_id (int, optional): The run to check, the latest one by default.
+            baseline_runs (int): How many previous runs form the baseline window.
+            max_p_value (float): Significance level.
+            min_slowdown (float): Minimum ratio to the baseline mean, so tiny but
+                stable helpers don't get flagged for noise.
+            same_simulator (bool): Only compare with runs of the same simulator binary,
+                to separate suite regressions from simulator regressions.
+            min_delta_seconds (float): Minimum absolute slowdown, so millisecond
+                helpers don't get flagged for a large ratio of a tiny duration.
+
+        Returns:
+            list[Regression]: The regressions, slowest first.
+        """
+        run_id = run_id or self.latest_run()
+        if run_id is None:
+            return []
+        query = (
+            "SELECT id FROM runs WHERE id < ? "
+            "AND network IS (SELECT network FROM runs WHERE id = ?)"
+        )
+        args = [run_id, run_id]
+        if same_simulator:
+            query += (
+                " AND simulator_hash IS (SELECT simulator_hash FROM runs WHERE id = ?)"
+            )
+            args.append(run_id)
+        query += " ORDER BY id DESC LIMIT ?"
+        args.append(baseline_runs)
+        baseline_ids = [row[0] for row in self.connection.execute(query, args)]
+        if not baseline_ids:
+            return []
+
+        baselines = {}
+        placeholders = ",".join("?" * len(baseline_ids))
+        for *key, duration in self.connection.execute(
+            "SELECT test_id, params, kind, name, topology, duration FROM durations "
+            f"WHERE run_id IN ({placeholders}) AND (outcome IS NULL OR outcome = 'passed')",
+            baseline_ids,
+        ):
+            baselines.setdefault(tuple(key), []).append(duration)
+
+        regressions = []
+        for test_id, params, kind, name, topology, duration in self.connection.execute(
+            "SELECT test_id, params, kind, name, topology, duration FROM durations "
+            "WHERE run_id = ? AND (outcome IS NULL OR outcome = 'passed')",
+            (run_id,),
+        ):
+            baseline = baselines.get((test_id, params, kind, name, topology), [])
+            if len(baseline) < MIN_BASELINE_SAMPLES:
+                continue
+            mean = statistics.fmean(baseline)
+            if duration < mean * min_slowdown or duration - mean < min_delta_seconds:
+                continue
+            deviation = statistics.stdev(baseline)
+            if deviation == 0:
+                p_value = 0.0
+            else:
+                p_value = 1 - statistics.NormalDist(mean, deviation).cdf(duration)
+            if p_value <= max_p_value:
+                regressions.append(
+                    Regression(test_id, params, kind, name, duration, baseline, p_value)
+                )
+        return sorted(regressions, key=lambda r: r.slowdown, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Flag duration regressions of a test run against previous runs."
+    )
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--run", type=int, help="Run id, the latest by default.")
+    parser.add_argument("--baseline-runs", type=int, default=DEFAULT_BASELINE_RUNS)
+    parser.add_argument("--max-p-value", type=float, default=DEFAULT_MAX_P_VALUE)
+    parser.add_argument("--min-slowdown", type=float, default=DEFAULT_MIN_SLOWDOWN)
+    parser.add_argument(
+        "--min-delta-seconds",
+        type=float,
+        default=DEFAULT_MIN_DELTA_SECONDS,
+        help="Minimum slowdown in seconds over the baseline mean.",
+    )
+    parser.add_argument(
+        "--same-simulator",
+        action="store_true",
+        help="Only compare with runs of the same chain simulator binary.",
+    )
+    args = parser.parse_args()
+
+    history = DurationHistory(args.db)
+    regressions = history.compare(
+        args.run,
+        args.baseline_runs,
+        args.max_p_value,
+        args.min_slowdown,
+        args.same_simulator,
+        args.min_delta_seconds,
+    )
+    history.close()
+    for regression in regressions:
+        print(regression)
+    if not regressions:
+        print("No duration regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,7 +5,9 @@ from utils.helpers import (
     string_to_base64,
     string_to_hex,
 )
-from utils.logger import logger
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 def convert_esdt_props_to_hex(
@@ -77,7 +79,7 @@ def convert_esdt_props_to_hex(
         + can_add_special_roles_hex
     )
 
-    logger.info(f"Converted ESDT hex string: {hex_string}")
+    logger.info("Converted ESDT hex string: %s", hex_string)
 
     return hex_string
 
@@ -174,7 +176,7 @@ def convert_esdt_nft_props_to_hex(
         + can_add_special_roles_hex
     )
 
-    logger.info(f"Converted ESDT hex string: {hex_string}")
+    logger.info("Converted ESDT hex string: %s", hex_string)
 
     return hex_string
 
@@ -268,7 +270,7 @@ def convert_esdt_nft_transfer_to_hex(
         + destination_address
     )
 
-    logger.info(f"Converted ESDTNFTTransfer hex string: {hex_string}")
+    logger.info("Converted ESDTNFTTransfer hex string: %s", hex_string)
 
     return hex_string
 
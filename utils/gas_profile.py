@@ -0,0 +1,401 @@
+import argparse
+import base64
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from config.constants import GAS_LIMIT_MARGIN, MAX_CONCURRENT_REQUESTS, PROJECT_FOLDER
+from utils.http_client import add_observer, remove_observer
+from utils.logger import get_logger
+from utils.timing import current_helper, set_helper_tracking
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(PROJECT_FOLDER, "reports", "gas.sqlite")
+DEFAULT_BASELINE_RUNS = 5
+# relative change of a percentile reported as a regression
+DEFAULT_MAX_CHANGE = 0.05
+PERCENTILES = (50, 95, 99)
+
+RELAYED_V3 = "relayedV3"
+TRANSFER = "transfer"
+
+_PROCESS_STATUS_ROUTE = re.compile(r"/transaction/([0-9a-fA-F]{64})/process-status$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    git_revision TEXT,
+    simulator_hash TEXT,
+    network TEXT
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    builder TEXT NOT NULL,
+    function TEXT NOT NULL,
+    status TEXT NOT NULL,
+    gas_limit INTEGER NOT NULL,
+    gas_used INTEGER NOT NULL,
+    fee TEXT NOT NULL,
+    data_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_key
+    ON transactions (builder, function, run_id);
+"""
+
+
+def transaction_function(payload: dict) -> str:
+    """The transaction type of a sent transaction: the called function, relayedV3 or transfer."""
+    if payload.get("innerTransactions"):
+        return RELAYED_V3
+    data = base64.b64decode(payload.get("data") or "")
+    return data.split(b"@", 1)[0].decode("utf-8", errors="replace") or TRANSFER
+
+
+def percentile(values: list, percent: float) -> int:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[rank - 1]
+
+
+def aggregate(rows: list[tuple]) -> dict:
+    """
+    Aggregates transaction rows per (builder, function).
+
+    Args:
+        rows (list[tuple]): (builder, function, status, gas_limit, gas_used, fee,
+            data_size) tuples.
+
+    Returns:
+        dict: Per "builder function" key: count, failed, the gas limits used,
+            gas used, fee and data size percentiles of the successful
+            transactions, and the gas limit suggested by the largest gas used.
+    """
+    groups = {}
+    for builder, function, status, gas_limit, gas_used, fee, data_size in rows:
+        group = groups.setdefault(
+            f"{builder} {function}",
+            {
+                "count": 0,
+                "failed": 0,
+                "limits": set(),
+                "used": [],
+                "fee": [],
+                "size": [],
+            },
+        )
+        group["count"] += 1
+        group["limits"].add(gas_limit)
+        if status != "success":
+            group["failed"] += 1
+            continue
+        group["used"].append(gas_used)
+        group["fee"].append(int(fee))
+        group["size"].append(data_size)
+
+    report = {}
+    for key, group in sorted(groups.items()):
+        used, fees, sizes = (
+            sorted(group["used"]),
+            sorted(group["fee"]),
+            sorted(group["size"]),
+        )
+        entry = {
+            "count": group["count"],
+            "failed": group["failed"],
+            "gas_limits": sorted(group["limits"]),
+        }
+        for percent in PERCENTILES:
+            entry[f"gas_used_p{percent}"] = percentile(used, percent)
+            entry[f"fee_p{percent}"] = percentile(fees, percent)
+        entry["gas_used_max"] = used[-1] if used else 0
+        entry["data_size_p50"] = percentile(sizes, 50)
+        entry["data_size_max"] = sizes[-1] if sizes else 0
+        entry["suggested_gas_limit"] = (
+            math.ceil(used[-1] * GAS_LIMIT_MARGIN) if used else None
+        )
+        report[key] = entry
+    return report
+
+
+class GasProfiler:
+    """
+    Records gas limit, gas used, fee and data-field size of every confirmed
+    transaction of the process, grouped by the helper that sent it and the
+    called function.
+
+    Sent transactions are taken from /transaction/send and send-multiple
+    requests, and confirmed when their process status is read as final, so
+    every helper is covered without changes. Gas used and fee are fetched by
+    collect(), which must run while the chain is still up.
+    """
+
+    def __init__(self) -> None:
+        self.sent = {}
+        self.confirmed = {}
+        self.rows = []
+        self._lock = threading.Lock()
+        self._enabled = False
+
+    def enable(self):
+        if not self._enabled:
+            set_helper_tracking(True)
+            add_observer(self.observe)
+            self._enabled = True
+
+    def disable(self):
+        if self._enabled:
+            remove_observer(self.observe)
+            set_helper_tracking(False)
+            self._enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.sent, self.confirmed, self.rows = {}, {}, []
+
+    def observe(self, request, response, elapsed: float):
+        try:
+            self._observe(request, response)
+        except ValueError:
+            # not a JSON response, e.g. an error page
+            pass
+
+    def _observe(self, request, response):
+        path = urlsplit(request.url).path
+        if request.method == "POST" and path.endswith("/transaction/send"):
+            payloads = [json.loads(request.body)]
+            hashes = [(response.json().get("data") or {}).get("txHash")]
+        elif request.method == "POST" and path.endswith("/transaction/send-multiple"):
+            payloads = json.loads(request.body)
+            sent = (response.json().get("data") or {}).get("txsHashes") or {}
+            hashes = [sent.get(str(index)) for index in range(len(payloads))]
+        else:
+            match = _PROCESS_STATUS_ROUTE.search(path)
+            if match and match.group(1) in self.sent:
+                status = (response.json().get("data") or {}).get("status")
+                if status not in (None, "pending"):
+                    with self._lock:
+                        self.confirmed[match.group(1)] = status
+            return
+
+        builder = current_helper() or "unknown"
+        with self._lock:
+            for payload, tx_hash in zip(payloads, hashes):
+                if tx_hash is None:
+                    continue
+                self.sent[tx_hash] = (
+                    builder,
+                    transaction_function(payload),
+                    int(payload.get("gasLimit") or 0),
+                    len(base64.b64decode(payload.get("data") or "")),
+                )
+
+    def collect(self) -> int:
+        """Fetches gas used and fee of the transactions confirmed since the last call."""
+        with self._lock:
+            confirmed, self.confirmed = self.confirmed, {}
+            sent = {tx_hash: self.sent.pop(tx_hash) for tx_hash in confirmed}
+        if not confirmed:
+            return 0
+        # imported here: this module is loaded by plugins.gas before --proxy-url and
+        # --network are applied, and core modules read the proxy url when imported
+        from core.get_transaction_info import get_transaction_cost
+
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+                costs = list(executor.map(get_transaction_cost, confirmed))
+        except Exception as e:
+            logger.warning(
+                "Could not fetch the cost of %s transactions: %s", len(confirmed), e
+            )
+            return 0
+
+        rows = []
+        for (tx_hash, status), (gas_used, fee) in zip(confirmed.items(), costs):
+            builder, function, gas_limit, data_size = sent[tx_hash]
+            rows.append(
+                (builder, function, status, gas_limit, gas_used, str(fee), data_size)
+            )
+        with self._lock:
+            self.rows.extend(rows)
+        return len(rows)
+
+    def report(self) -> dict:
+        with self._lock:
+            return aggregate(self.rows)
+
+
+class GasChange:
+    def __init__(self, key: str, metric: str, value: int, baseline: int) -> None:
+        self.key = key
+        self.metric = metric
+        self.value = value
+        self.baseline = baseline
+
+    @property
+    def change(self) -> float:
+        return self.value / self.baseline - 1 if self.baseline else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.key} {self.metric}: {self.value} vs {self.baseline} "
+            f"({self.change:+.1%})"
+        )
+
+
+class GasHistory:
+    """
+    SQLite store of the profiled transactions of every run, keyed by git
+    revision and chain simulator binary hash, with percentile comparisons
+    against previous runs.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def start_run(
+        self, git_revision: str = None, simulator_hash: str = None, network: str = None
+    ) -> int:
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, git_revision, simulator_hash, network) "
+                "VALUES (?, ?, ?, ?)",
+                (time.time(), git_revision, simulator_hash, network),
+            )
+        return cursor.lastrowid
+
+    def record(self, run_id: int, rows: list[tuple]):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO transactions (run_id, builder, function, status, "
+                "gas_limit, gas_used, fee, data_size) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in rows],
+            )
+
+    def latest_run(self) -> int:
+        return self.connection.execute("SELECT MAX(id) FROM runs").fetchone()[0]
+
+    def rows(self, run_ids: list[int]) -> list[tuple]:
+        placeholders = ",".join("?" * len(run_ids))
+        return self.connection.execute(
+            "SELECT builder, function, status, gas_limit, gas_used, fee, data_size "
+            f"FROM transactions WHERE run_id IN ({placeholders})",
+            run_ids,
+        ).fetchall()
+
+    def compare(
+        self,
+        run_id: int = None,
+        baseline_runs: int = DEFAULT_BASELINE_RUNS,
+        max_change: float = DEFAULT_MAX_CHANGE,
+        same_simulator: bool = False,
+    ) -> list[GasChange]:
+        """
+        Compares the gas used and fee percentiles of a run against the
+        transactions of the previous runs on the same network taken together.
+
+        Args:
+            run_id (int, optional): The run to check, the latest one by default.
+            baseline_runs (int): How many previous runs form the baseline.
+            max_change (float): Relative change of a percentile, in either
+                direction, that is reported.
+            same_simulator (bool): Only compare with runs of the same simulator
+                binary, to separate suite changes from simulator changes.
+
+        Returns:
+            list[GasChange]: The changed percentiles, largest change first.
+        """
+        run_id = run_id or self.latest_run()
+        if run_id is None:
+            return []
+        query = (
+            "SELECT id FROM runs WHERE id < ? "
+            "AND network IS (SELECT network FROM runs WHERE id = ?)"
+        )
+        args = [run_id, run_id]
+        if same_simulator:
+            query += (
+                " AND simulator_hash IS (SELECT simulator_hash FROM runs WHERE id = ?)"
+            )
+            args.append(run_id)
+        query += " ORDER BY id DESC LIMIT ?"
+        args.append(baseline_runs)
+        baseline_ids = [row[0] for row in self.connection.execute(query, args)]
+        if not baseline_ids:
+            return []
+
+        current = aggregate(self.rows([run_id]))
+        baseline = aggregate(self.rows(baseline_ids))
+        metrics = [
+            f"{name}_p{percent}"
+            for name in ("gas_used", "fee")
+            for percent in PERCENTILES
+        ]
+        changes = []
+        for key, entry in current.items():
+            if key not in baseline:
+                continue
+            for metric in metrics:
+                value, previous = entry[metric], baseline[key][metric]
+                if value == previous or not (value or previous):
+                    continue
+                change = GasChange(key, metric, value, previous)
+                if abs(change.change) > max_change:
+                    changes.append(change)
+        return sorted(changes, key=lambda c: abs(c.change), reverse=True)
+
+
+gas_profiler = GasProfiler()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Show gas and fee percentiles per transaction type and flag changes "
+        "against previous runs."
+    )
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--run", type=int, help="Run id, the latest by default.")
+    parser.add_argument("--baseline-runs", type=int, default=DEFAULT_BASELINE_RUNS)
+    parser.add_argument("--max-change", type=float, default=DEFAULT_MAX_CHANGE)
+    parser.add_argument(
+        "--same-simulator",
+        action="store_true",
+        help="Only compare with runs of the same chain simulator binary.",
+    )
+    args = parser.parse_args()
+
+    history = GasHistory(args.db)
+    run_id = args.run or history.latest_run()
+    if run_id is None:
+        print("No profiled runs")
+        history.close()
+        return 0
+    print(json.dumps(aggregate(history.rows([run_id])), indent=2))
+    changes = history.compare(
+        run_id, args.baseline_runs, args.max_change, args.same_simulator
+    )
+    history.close()
+    for change in changes:
+        print(change)
+    if not changes:
+        print("No gas changes")
+    return 1 if changes else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
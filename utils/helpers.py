@@ -1,10 +1,13 @@
 import base64
+import logging
 import random
 import string
 
 from multiversx_sdk.converters.transactions_converter import TransactionsConverter
 
-from utils.logger import logger
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 def base64_to_decimal(b):
@@ -46,9 +49,12 @@ def replace_random_data_with_another_random_data(input_string: str) -> str:
 
 
 def log_transaction(transaction, message):
+    # converting the whole transaction is expensive, skip it when nobody reads it
+    if not logger.isEnabledFor(logging.INFO):
+        return
     transaction_converter = TransactionsConverter()
     transaction_dict = transaction_converter.transaction_to_dictionary(transaction)
-    logger.info(f"{message}: {transaction_dict}")
+    logger.info("%s: %s", message, transaction_dict)
 
 
 def flag_to_hex(flag_name: str, flag_value: str) -> str:
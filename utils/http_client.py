@@ -0,0 +1,94 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.constants import MAX_CONCURRENT_REQUESTS
+
+_original_send = HTTPAdapter.send
+_observers = []
+_interceptor = None
+_redirects = {}
+_hooks_lock = threading.Lock()
+
+
+def create_session() -> requests.Session:
+    """
+    Creates a requests session with a connection pool large enough for the
+    concurrent helpers, so parallel requests reuse keep-alive connections.
+    """
+    new_session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS, pool_block=True
+    )
+    new_session.mount("http://", adapter)
+    new_session.mount("https://", adapter)
+    return new_session
+
+
+def _hooked_send(adapter, request, **kwargs):
+    started = time.perf_counter()
+    for prefix, target in _redirects.items():
+        if request.url.startswith(prefix):
+            request.url = target + request.url[len(prefix) :]
+            break
+    interceptor = _interceptor
+    response = interceptor(request) if interceptor is not None else None
+    if response is None:
+        response = _original_send(adapter, request, **kwargs)
+    elapsed = time.perf_counter() - started
+    for observer in list(_observers):
+        observer(request, response, elapsed)
+    return response
+
+
+def _install_hooks():
+    # every request goes through an HTTPAdapter, including the ones made by the
+    # sdk network providers and the module-level requests.get/post calls
+    with _hooks_lock:
+        if HTTPAdapter.send is not _hooked_send:
+            HTTPAdapter.send = _hooked_send
+
+
+def add_observer(observer):
+    """
+    Registers a callable(request, response, elapsed_seconds) that is notified
+    after every HTTP request made by the process.
+    """
+    _install_hooks()
+    with _hooks_lock:
+        _observers.append(observer)
+
+
+def remove_observer(observer):
+    with _hooks_lock:
+        if observer in _observers:
+            _observers.remove(observer)
+
+
+def set_interceptor(interceptor):
+    """
+    Sets a callable(request) that may answer requests instead of the network.
+    It returns a requests.Response, or None to let the request through.
+    Pass None to remove the interceptor.
+    """
+    global _interceptor
+    _install_hooks()
+    _interceptor = interceptor
+
+
+def set_redirects(redirects: dict):
+    """
+    Sends requests whose url starts with one of the keys of redirects to the
+    url mapped to it instead, e.g. {"http://localhost:8085": mock_url}. Pass
+    an empty dict to remove the redirects.
+    """
+    global _redirects
+    _install_hooks()
+    _redirects = {
+        prefix: target for prefix, target in redirects.items() if prefix != target
+    }
+
+
+session = create_session()
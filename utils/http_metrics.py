@@ -0,0 +1,240 @@
+import bisect
+import json
+import re
+import threading
+from urllib.parse import urlsplit
+
+from utils.http_client import add_observer, remove_observer
+
+# upper bounds in seconds, the implicit last bucket is +Inf
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+_segment_templates = [
+    (re.compile(r"erd1[02-9ac-hj-np-z]{58}"), "{address}"),
+    (re.compile(r"[0-9a-fA-F]{64}"), "{hash}"),
+    (re.compile(r"[0-9a-fA-F]{16,}"), "{hex}"),
+    (re.compile(r"\d+"), "{n}"),
+    (re.compile(r"[A-Z0-9]{3,10}-[0-9a-f]{6}(-[0-9a-f]+)?"), "{token}"),
+]
+_VM_QUERY_PATH = "/vm-values/query"
+
+
+def _template_segment(segment: str) -> str:
+    for pattern, placeholder in _segment_templates:
+        if pattern.fullmatch(segment):
+            return placeholder
+    return segment
+
+
+def endpoint_template(request) -> str:
+    """
+    Returns the endpoint template of a request, e.g. "/transaction/{hash}".
+    VM queries are split per function, e.g. "/vm-values/query:getOwner".
+    """
+    path = urlsplit(request.url).path
+    template = "/".join(_template_segment(segment) for segment in path.split("/"))
+    if template == _VM_QUERY_PATH and request.body:
+        try:
+            func_name = json.loads(request.body).get("funcName")
+        except (ValueError, AttributeError):
+            func_name = None
+        if func_name:
+            template = f"{template}:{func_name}"
+    return template
+
+
+def _body_size(body) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if isinstance(body, bytes):
+        return len(body)
+    return 0
+
+
+def _response_size(response) -> int:
+    # the body is usually not read yet when the observer runs, so avoid forcing
+    # it (that would break streamed responses); chunked bodies count only once read
+    content_length = response.headers.get("Content-Length")
+    if content_length is not None:
+        return int(content_length)
+    if getattr(response, "_content_consumed", False) and response._content:
+        return len(response._content)
+    return 0
+
+
+class EndpointStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.status_codes = {}
+
+    def observe(self, status: int, elapsed: float, sent: int, received: int):
+        self.count += 1
+        if status >= 400:
+            self.errors += 1
+        self.latency_sum += elapsed
+        self.latency_max = max(self.latency_max, elapsed)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        self.request_bytes += sent
+        self.response_bytes += received
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+
+    def to_dict(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), self.buckets):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "latency_sum": round(self.latency_sum, 6),
+            "latency_avg": round(self.latency_sum / self.count, 6) if self.count else 0,
+            "latency_max": round(self.latency_max, 6),
+            "latency_buckets": buckets,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "status_codes": {str(code): n for code, n in self.status_codes.items()},
+        }
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class HttpMetrics:
+    """
+    Per-endpoint request counters, latency histograms and byte counts of all
+    HTTP traffic of the process, keyed by (method, endpoint template).
+
+    Observing a request costs a template lookup and a few additions, so the
+    metrics can stay enabled in every run.
+    """
+
+    def __init__(self) -> None:
+        self.endpoints = {}
+        self._lock = threading.Lock()
+        self._enabled = False
+
+    def enable(self):
+        if not self._enabled:
+            add_observer(self.observe)
+            self._enabled = True
+
+    def disable(self):
+        if self._enabled:
+            remove_observer(self.observe)
+            self._enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+
+    def observe(self, request, response, elapsed: float):
+        key = (request.method, endpoint_template(request))
+        sent = _body_size(request.body)
+        received = _response_size(response)
+        with self._lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = EndpointStats()
+            stats.observe(response.status_code, elapsed, sent, received)
+
+    def totals(self) -> tuple[int, float]:
+        """Returns the number of requests and the time spent in them so far."""
+        with self._lock:
+            return (
+                sum(stats.count for stats in self.endpoints.values()),
+                sum(stats.latency_sum for stats in self.endpoints.values()),
+            )
+
+    def to_json(self) -> dict:
+        with self._lock:
+            return {
+                f"{method} {endpoint}": stats.to_dict()
+                for (method, endpoint), stats in sorted(self.endpoints.items())
+            }
+
+    def to_prometheus(self, prefix: str = "simulator_http") -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        requests_lines = []
+        errors_lines = []
+        duration_lines = []
+        sent_lines = []
+        received_lines = []
+        with self._lock:
+            for (method, endpoint), stats in sorted(self.endpoints.items()):
+                labels = (
+                    f'method="{_escape_label(method)}",'
+                    f'endpoint="{_escape_label(endpoint)}"'
+                )
+                requests_lines.append(
+                    f"{prefix}_requests_total{{{labels}}} {stats.count}"
+                )
+                errors_lines.append(f"{prefix}_errors_total{{{labels}}} {stats.errors}")
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                    cumulative += count
+                    duration_lines.append(
+                        f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                duration_lines.append(
+                    f"{prefix}_request_duration_seconds_sum{{{labels}}} {stats.latency_sum}"
+                )
+                duration_lines.append(
+                    f"{prefix}_request_duration_seconds_count{{{labels}}} {stats.count}"
+                )
+                sent_lines.append(
+                    f"{prefix}_request_bytes_total{{{labels}}} {stats.request_bytes}"
+                )
+                received_lines.append(
+                    f"{prefix}_response_bytes_total{{{labels}}} {stats.response_bytes}"
+                )
+
+        sections = [
+            ("requests_total", "counter", "HTTP requests sent", requests_lines),
+            (
+                "errors_total",
+                "counter",
+                "HTTP responses with status >= 400",
+                errors_lines,
+            ),
+            (
+                "request_duration_seconds",
+                "histogram",
+                "HTTP request latency",
+                duration_lines,
+            ),
+            ("request_bytes_total", "counter", "Request body bytes", sent_lines),
+            ("response_bytes_total", "counter", "Response body bytes", received_lines),
+        ]
+        output = []
+        for name, kind, description, lines in sections:
+            output.append(f"# HELP {prefix}_{name} {description}")
+            output.append(f"# TYPE {prefix}_{name} {kind}")
+            output.extend(lines)
+        return "\n".join(output) + "\n"
+
+
+metrics = HttpMetrics()
@@ -1,16 +1,127 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+from contextlib import contextmanager
+
+ROOT_LOGGER_NAME = "chain_simulator"
+TEXT_FORMAT = "[%(asctime)s] - [%(levelname)s] - %(message)s"
+
+# LOG_LEVEL: level of all project loggers (default DEBUG)
+# LOG_LEVELS: per-module levels, e.g. "core.chain_commander=WARNING,core.vm_query=DEBUG"
+# LOG_FORMAT: "text" (default) or "json"
+# LOG_FILE: optional file receiving the same records
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_FILE = os.getenv("LOG_FILE")
+
+_context = {"test_id": None, "step": None}
+_listener = None
+
+
+def set_log_context(**values):
+    """Sets correlation fields (test_id, step) attached to every following record."""
+    _context.update(values)
+
+
+def get_log_context() -> dict:
+    return dict(_context)
+
+
+@contextmanager
+def log_context(**values):
+    previous = {key: _context.get(key) for key in values}
+    _context.update(values)
+    try:
+        yield
+    finally:
+        _context.update(previous)
+
+
+class _ContextFilter(logging.Filter):
+    def filter(self, record):
+        record.test_id = _context["test_id"]
+        record.step = _context["step"]
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including the test and step correlation IDs."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "test_id": getattr(record, "test_id", None),
+            "step": getattr(record, "step", None),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _parse_levels(spec: str) -> list[tuple[str, str]]:
+    levels = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels.append((name.strip(), level.strip().upper()))
+    return levels
+
+
+def _configure() -> logging.Logger:
+    """
+    Sets up the project logger once: records are filtered by level in the
+    calling thread, then handed over to a queue and written by a background
+    listener, so slow streams never block the helpers.
+    """
+    global _listener
+    base = logging.getLogger(ROOT_LOGGER_NAME)
+    if base.handlers:  # Avoid adding multiple handlers to the same logger
+        return base
+
+    base.setLevel(LOG_LEVEL)
+    for name, level in _parse_levels(LOG_LEVELS):
+        logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}").setLevel(level)
+
+    formatter = (
+        JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+    )
+    handlers = [logging.StreamHandler()]
+    if LOG_FILE:
+        handlers.append(logging.FileHandler(LOG_FILE))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(_ContextFilter())
+    base.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return base
 
 
 def get_logger(name):
-    logger = logging.getLogger(name)
-    if not logger.handlers:  # Avoid adding multiple handlers to the same logger
-        logger.setLevel(logging.DEBUG)
-        ch = logging.StreamHandler()
-        ch.setFormatter(
-            logging.Formatter("[%(asctime)s] - [%(levelname)s] - %(message)s")
-        )
-        logger.addHandler(ch)
-    return logger
-
-
-logger = get_logger(__name__)
+    """
+    Returns the logger of a module, e.g. get_logger(__name__). Its level can be
+    set on its own through LOG_LEVELS.
+    """
+    base = _configure()
+    return base.getChild(name) if name else base
+
+
+def flush_logs():
+    """Waits until the background listener has written every queued record."""
+    if _listener is not None:
+        _listener.stop()
+        _listener.start()
+
+
+logger = get_logger(None)
@@ -0,0 +1,198 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+from utils.http_client import add_observer, remove_observer
+
+CPROFILE = "cprofile"
+SAMPLING = "sampling"
+DEFAULT_SAMPLE_INTERVAL = 0.005
+# modules whose time.sleep replacements forward to this one, skipped to find the caller
+_SLEEP_WRAPPER_MODULES = {__name__, "plugins.timing"}
+CPROFILE_THREAD_NOTE = (
+    "cProfile covers only the thread running the test: the worker threads of the "
+    "batched helpers are not included, use --profile=sampling to see them.\n\n"
+)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of all threads at a fixed interval and counts
+    them as collapsed stacks ("thread;outer;...;inner count"), the input format
+    of flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+class TimeAttribution:
+    """
+    Splits the wall time of a test into CPU time, time.sleep calls (per call
+    site) and time spent waiting on HTTP responses.
+
+    Network waits are counted twice: on the thread running the test, which is
+    what the test actually waits for, and over all threads, which includes the
+    concurrent requests of the batched helpers.
+    """
+
+    def __init__(self) -> None:
+        self.thread_id = threading.get_ident()
+        self.sleep_by_caller = Counter()
+        self.network_wait = 0.0
+        self.network_total = 0.0
+        self.network_calls = 0
+        self._lock = threading.Lock()
+        self._original_sleep = None
+
+    def start(self):
+        self._original_sleep = time.sleep
+        time.sleep = self._sleep
+        add_observer(self._on_http)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def stop(self):
+        self.wall = time.perf_counter() - self._wall_start
+        self.cpu = time.process_time() - self._cpu_start
+        remove_observer(self._on_http)
+        time.sleep = self._original_sleep
+
+    def _sleep(self, seconds):
+        caller = sys._getframe(1)
+        while (
+            caller.f_back is not None
+            and caller.f_globals.get("__name__") in _SLEEP_WRAPPER_MODULES
+        ):
+            caller = caller.f_back
+        site = f"{caller.f_globals.get('__name__', '?')}.{caller.f_code.co_name}"
+        started = time.perf_counter()
+        self._original_sleep(seconds)
+        with self._lock:
+            self.sleep_by_caller[site] += time.perf_counter() - started
+
+    def _on_http(self, request, response, elapsed):
+        with self._lock:
+            self.network_total += elapsed
+            self.network_calls += 1
+            if threading.get_ident() == self.thread_id:
+                self.network_wait += elapsed
+
+    def report(self) -> dict:
+        sleep = sum(self.sleep_by_caller.values())
+        return {
+            "wall_time": round(self.wall, 6),
+            "cpu_time": round(self.cpu, 6),
+            "sleep_time": round(sleep, 6),
+            "sleep_by_caller": {
+                site: round(seconds, 6)
+                for site, seconds in self.sleep_by_caller.most_common()
+            },
+            "network_wait": round(self.network_wait, 6),
+            "network_total": round(self.network_total, 6),
+            "network_calls": self.network_calls,
+            "unattributed": round(
+                max(0.0, self.wall - self.cpu - sleep - self.network_wait), 6
+            ),
+        }
+
+
+class PerTestProfiler:
+    """
+    Profiles one test with cProfile (deterministic) or with the stack sampler,
+    together with the time attribution.
+
+    Writes <name>.prof and <name>.txt (cProfile) or <name>.collapsed (sampling),
+    and <name>.attribution.json to the output folder. cProfile only sees the
+    thread running the test, the sampler sees all threads.
+    """
+
+    def __init__(self, mode: str, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        if mode not in (CPROFILE, SAMPLING):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.mode = mode
+        self.attribution = TimeAttribution()
+        self.profiler = cProfile.Profile() if mode == CPROFILE else None
+        self.sampler = StackSampler(interval) if mode == SAMPLING else None
+
+    def start(self):
+        self.attribution.start()
+        if self.profiler is not None:
+            self.profiler.enable()
+        else:
+            self.sampler.start()
+
+    def stop(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+        else:
+            self.sampler.stop()
+        self.attribution.stop()
+
+    def write(self, output_dir: str, name: str) -> dict:
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, name)
+        if self.profiler is not None:
+            self.profiler.dump_stats(f"{base}.prof")
+            text = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=text)
+            stats.sort_stats("cumulative").print_stats(40)
+            with open(f"{base}.txt", "w") as f:
+                f.write(CPROFILE_THREAD_NOTE)
+                f.write(text.getvalue())
+        else:
+            with open(f"{base}.collapsed", "w") as f:
+                f.write(self.sampler.collapsed())
+
+        report = self.attribution.report()
+        with open(f"{base}.attribution.json", "w") as f:
+            json.dump(report, f, indent=2)
+        return report
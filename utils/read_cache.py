@@ -0,0 +1,91 @@
+import threading
+
+from config.settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_entries = {}
+_lock = threading.Lock()
+# incremented by every invalidation, so that values fetched before it are not stored
+_generation = 0
+
+
+def read_cache_enabled() -> bool:
+    """Whether reads are cached, i.e. the run targets the chain simulator."""
+    # only the simulator changes state exclusively through requests of this process;
+    # on shared networks blocks are produced on their own and entries would go stale
+    return settings.network == "simulator"
+
+
+def read_generation() -> int:
+    """Returns the current invalidation generation, to be passed to store_cached."""
+    with _lock:
+        return _generation
+
+
+def cached_read(endpoint: str, args: tuple, fetch):
+    """
+    Read-through cache for chain queries whose result can only change when
+    the chain state changes.
+
+    Entries are keyed by (endpoint, args) and belong to the block nonce that
+    was current when they were read: they live until the next call of
+    invalidate_read_cache, which the chain commander helpers trigger on every
+    block generation and set-state request. A value whose fetch overlapped an
+    invalidation is returned but not stored. Outside of the simulator profile
+    every call is fetched.
+
+    Args:
+        endpoint (str): A name of the queried route, e.g. "address/balance".
+        args (tuple): The arguments that identify the query.
+        fetch: Called without arguments to obtain the value on a cache miss.
+
+    Returns:
+        The cached or freshly fetched value.
+    """
+    if not read_cache_enabled():
+        return fetch()
+
+    key = (endpoint, args)
+    with _lock:
+        if key in _entries:
+            logger.debug("Read cache hit for %s %s", endpoint, args)
+            return _entries[key]
+        generation = _generation
+
+    value = fetch()
+    store_cached(endpoint, args, value, generation)
+    return value
+
+
+def invalidate_read_cache(reason: str = ""):
+    global _generation
+    with _lock:
+        _entries.clear()
+        _generation += 1
+    logger.debug("Read cache invalidated: %s", reason)
+
+
+def get_cached(endpoint: str, args: tuple, default=None):
+    """Returns a cached value without fetching it on a miss."""
+    if not read_cache_enabled():
+        return default
+    with _lock:
+        return _entries.get((endpoint, args), default)
+
+
+def store_cached(endpoint: str, args: tuple, value, generation: int = None):
+    """
+    Stores a value fetched outside of cached_read, e.g. by a concurrent batch.
+
+    Pass the read_generation() taken before the fetch: the value is dropped
+    if the cache was invalidated in the meantime.
+    """
+    if not read_cache_enabled():
+        return
+    with _lock:
+        if generation is not None and generation != _generation:
+            logger.debug("Dropped stale read of %s %s", endpoint, args)
+            return
+        _entries[(endpoint, args)] = value
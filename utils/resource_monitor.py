@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+
+from utils.logger import get_log_context, get_logger
+
+logger = get_logger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _read_stat(pid: int) -> list[str]:
+    with open(f"/proc/{pid}/stat") as f:
+        stat = f.read()
+    # the command name is in parentheses and may contain spaces
+    return stat[stat.rindex(")") + 2 :].split()
+
+
+def process_group(pgid: int) -> list[int]:
+    """Returns the pids of the processes in a process group."""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            if int(_read_stat(int(entry))[2]) == pgid:
+                pids.append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+    return pids
+
+
+def _process_usage(pid: int) -> tuple[int, float, int]:
+    """Returns RSS in bytes, CPU time in seconds and open file descriptors of a process."""
+    fields = _read_stat(pid)
+    cpu_time = (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    rss = int(fields[21]) * _PAGE_SIZE
+    try:
+        open_fds = len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        open_fds = 0
+    return rss, cpu_time, open_fds
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+class ResourceMonitor:
+    """
+    Samples RSS, CPU time, open file descriptors and data directory size of
+    the chain simulator process group in a background thread.
+
+    Every sample is tagged with the current test id and step and appended as
+    one JSON line to the output file. A warning is logged the first time a
+    threshold is exceeded.
+
+    Reads /proc, so it only samples on Linux.
+    """
+
+    def __init__(
+        self,
+        pgid: int,
+        data_dir: str = None,
+        interval: float = 1.0,
+        output_path: str = None,
+        thresholds: dict = None,
+        dir_size_every: int = 10,
+    ) -> None:
+        self.pgid = pgid
+        self.data_dir = data_dir
+        self.interval = interval
+        self.output_path = output_path
+        self.thresholds = {
+            name: limit for name, limit in (thresholds or {}).items() if limit
+        }
+        self.dir_size_every = dir_size_every
+        self.samples = []
+        self.warnings = []
+        self._exceeded = set()
+        self._data_dir_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+        self._previous_cpu = None
+
+    def start(self):
+        if not os.path.isdir("/proc"):
+            logger.warning("Resource monitor needs /proc, not sampling")
+            return
+        self._started = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name="resource-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        self.sample()
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> dict:
+        pids = process_group(self.pgid)
+        if not pids:
+            return None
+        rss = cpu_time = open_fds = 0
+        for pid in pids:
+            try:
+                process_rss, process_cpu, process_fds = _process_usage(pid)
+            except (OSError, ValueError, IndexError):
+                continue  # exited between listing and reading
+            rss += process_rss
+            cpu_time += process_cpu
+            open_fds += process_fds
+
+        now = time.monotonic()
+        cpu_percent = None
+        if self._previous_cpu is not None:
+            previous_time, previous_cpu = self._previous_cpu
+            if now > previous_time:
+                cpu_percent = round(
+                    100 * (cpu_time - previous_cpu) / (now - previous_time), 1
+                )
+        self._previous_cpu = (now, cpu_time)
+
+        if self.data_dir and len(self.samples) % self.dir_size_every == 0:
+            self._data_dir_mb = round(directory_size(self.data_dir) / 2**20, 2)
+
+        context = get_log_context()
+        sample = {
+            "time": time.time(),
+            "elapsed": round(now - self._started, 3),
+            "test_id": context["test_id"],
+            "step": context["step"],
+            "processes": len(pids),
+            "rss_mb": round(rss / 2**20, 2),
+            "cpu_time": round(cpu_time, 3),
+            "cpu_percent": cpu_percent,
+            "open_fds": open_fds,
+            "data_dir_mb": self._data_dir_mb,
+        }
+        self.samples.append(sample)
+        self._check_thresholds(sample)
+        if self.output_path:
+            with open(self.output_path, "a") as f:
+                f.write(json.dumps(sample) + "\n")
+        return sample
+
+    def _check_thresholds(self, sample: dict):
+        for name, limit in self.thresholds.items():
+            value = sample.get(name)
+            if value is None or value <= limit or name in self._exceeded:
+                continue
+            self._exceeded.add(name)
+            message = (
+                f"Chain simulator {name} is {value}, above {limit} "
+                f"(test {sample['test_id']}, step {sample['step']})"
+            )
+            self.warnings.append(message)
+            logger.warning(message)
+
+    def summary(self) -> dict:
+        if not self.samples:
+            return {}
+        return {
+            "samples": len(self.samples),
+            "rss_mb_max": max(sample["rss_mb"] for sample in self.samples),
+            "rss_mb_growth": round(
+                self.samples[-1]["rss_mb"] - self.samples[0]["rss_mb"], 2
+            ),
+            "cpu_time": self.samples[-1]["cpu_time"],
+            "open_fds_max": max(sample["open_fds"] for sample in self.samples),
+            "data_dir_mb": self.samples[-1]["data_dir_mb"],
+            "warnings": self.warnings,
+        }
@@ -0,0 +1,208 @@
+import functools
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.http_client import add_observer, remove_observer
+from utils.logger import log_context
+
+_GENERATE_BLOCKS_ROUTE = re.compile(r"/simulator/generate-blocks/(\d+)")
+
+_recorder = None
+_lock = threading.Lock()
+# names of the running helpers per thread, kept only while tracking is enabled
+_helper_stacks = threading.local()
+_track_helpers = False
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall_time = 0.0
+        self.http_calls = 0
+        self.http_time = 0.0
+        self.blocks_generated = 0
+        self.sleep_time = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "wall_time": round(self.wall_time, 6),
+            "http_calls": self.http_calls,
+            "http_time": round(self.http_time, 6),
+            "blocks_generated": self.blocks_generated,
+            "sleep_time": round(self.sleep_time, 6),
+        }
+
+
+class TimingRecorder:
+    """
+    Collects wall time, HTTP calls, generated blocks and sleep time for one
+    test, split per step and per core helper.
+
+    Counters are inclusive: an HTTP call made inside a helper that runs within
+    a step is counted for the helper, the step and the whole test. Every thread
+    keeps its own stack of running steps and helpers; a worker thread starts
+    from the stack of the test thread, so calls made by a pool inside a helper
+    are still counted for that helper.
+    """
+
+    def __init__(self, test_id: str) -> None:
+        self.test_id = test_id
+        self.total = _Counters()
+        self.steps = {}
+        self.helpers = {}
+        self.main_stack = [self.total]
+        self._stacks = threading.local()
+        self._stacks.active = self.main_stack
+        self.started = None
+
+    @property
+    def active(self) -> list:
+        # stack of the calling thread, the test thread's one until it enters a frame
+        return getattr(self._stacks, "active", self.main_stack)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.total.calls = 1
+        add_observer(self.on_http)
+
+    def stop(self) -> dict:
+        remove_observer(self.on_http)
+        self.total.wall_time = time.perf_counter() - self.started
+        return self.report()
+
+    def report(self) -> dict:
+        return {
+            "test": self.test_id,
+            "total": self.total.to_dict(),
+            "steps": {name: c.to_dict() for name, c in self.steps.items()},
+            "helpers": {name: c.to_dict() for name, c in self.helpers.items()},
+        }
+
+    def enter(self, table: dict, name: str) -> _Counters:
+        with _lock:
+            counters = table.setdefault(name, _Counters())
+            counters.calls += 1
+            if not hasattr(self._stacks, "active"):
+                self._stacks.active = list(self.main_stack)
+            self._stacks.active.append(counters)
+        return counters
+
+    def leave(self, counters: _Counters, elapsed: float):
+        with _lock:
+            counters.wall_time += elapsed
+            active = self.active
+            # remove the most recent frame of these counters
+            for index in range(len(active) - 1, 0, -1):
+                if active[index] is counters:
+                    del active[index]
+                    break
+
+    def on_http(self, request, response, elapsed):
+        match = _GENERATE_BLOCKS_ROUTE.search(request.path_url)
+        blocks = int(match.group(1)) if match else 0
+        with _lock:
+            for counters in set(self.active):
+                counters.http_calls += 1
+                counters.http_time += elapsed
+                counters.blocks_generated += blocks
+
+    def on_sleep(self, elapsed: float):
+        with _lock:
+            for counters in set(self.active):
+                counters.sleep_time += elapsed
+
+
+def start_recording(test_id: str) -> TimingRecorder:
+    global _recorder
+    _recorder = TimingRecorder(test_id)
+    _recorder.start()
+    return _recorder
+
+
+def stop_recording() -> dict:
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder.stop() if recorder is not None else None
+
+
+def record_sleep(elapsed: float):
+    recorder = _recorder
+    if recorder is not None:
+        recorder.on_sleep(elapsed)
+
+
+@contextmanager
+def _measure(table_name: str, name: str):
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    counters = recorder.enter(getattr(recorder, table_name), name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.leave(counters, time.perf_counter() - started)
+
+
+@contextmanager
+def step(name: str):
+    """
+    Context manager measuring one scenario step, e.g. ``with step("STEP 1"):``.
+    The step name is attached to log records; timing is only recorded while a
+    test is being recorded.
+    """
+    with log_context(step=name), _measure("steps", name):
+        yield
+
+
+def set_helper_tracking(enabled: bool):
+    """Enables current_helper(), which costs a list append per helper call."""
+    global _track_helpers
+    _track_helpers = enabled
+
+
+def current_helper() -> str:
+    """
+    The outermost @timed helper running in the calling thread, e.g. the core
+    helper a test called, or None outside of helpers or when tracking is off.
+    """
+    stack = getattr(_helper_stacks, "names", None)
+    return stack[0] if stack else None
+
+
+@contextmanager
+def _helper_frame(name: str):
+    if not _track_helpers:
+        yield
+        return
+    stack = _helper_stacks.__dict__.setdefault("names", [])
+    stack.append(name)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+def timed(func=None, *, name: str = None):
+    """
+    Decorator measuring every call of a core helper.
+    Does nothing when no test is being recorded and helpers are not tracked.
+    """
+
+    def decorator(function):
+        helper_name = name or f"{function.__module__}.{function.__name__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _recorder is None and not _track_helpers:
+                return function(*args, **kwargs)
+            with _helper_frame(helper_name), _measure("helpers", helper_name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
@@ -0,0 +1,229 @@
+import base64
+from dataclasses import dataclass, field
+
+from multiversx_sdk.core.address import Address
+
+from config.constants import (
+    ESDT_CONTRACT,
+    STAKING_CONTRACT,
+    SYSTEM_DELEGATION_MANAGER_CONTRACT,
+    VALIDATOR_CONTRACT,
+)
+
+# system smart contracts live on the metachain: 8 zero bytes followed by the system VM type
+SYSTEM_SC_ADDRESS_PREFIX = "0000000000000000" + "0001"
+_SYSTEM_SC_PREFIX_BYTES = bytes.fromhex(SYSTEM_SC_ADDRESS_PREFIX)
+KNOWN_SYSTEM_CONTRACTS = {
+    ESDT_CONTRACT,
+    STAKING_CONTRACT,
+    SYSTEM_DELEGATION_MANAGER_CONTRACT,
+    VALIDATOR_CONTRACT,
+}
+
+_event_decoders = {}
+
+
+def register_event_decoder(identifier: str, fields: list[tuple[str, str]]):
+    """
+    Registers how the topics of an event type are decoded.
+
+    Args:
+        identifier (str): The event identifier, e.g. "issue" or "ESDTNFTCreate".
+        fields (list[tuple[str, str]]): One (name, kind) pair per topic position.
+            kind is one of "string", "bigint", "address" or "hex".
+    """
+    for name, kind in fields:
+        if kind not in _topic_converters:
+            raise ValueError(f"Unknown topic kind '{kind}' for field '{name}'")
+    _event_decoders[identifier] = list(fields)
+
+
+def _decode_address(raw: bytes):
+    if len(raw) != 32:
+        return None
+    return Address.from_hex(raw.hex(), "erd").to_bech32()
+
+
+_topic_converters = {
+    "string": lambda raw: raw.decode("utf-8", errors="replace"),
+    "bigint": lambda raw: int.from_bytes(raw, "big"),
+    "address": _decode_address,
+    "hex": lambda raw: raw.hex(),
+}
+
+
+@dataclass
+class TxEvent:
+    identifier: str
+    address: str
+    topics: list[bytes]
+    data: bytes
+    source: str
+    fields: dict = field(default_factory=dict)
+    topic_addresses: list[str] = field(default_factory=list)
+
+
+class TxEventIndex:
+    """
+    Flattened and decoded events of a transaction and of all its smart contract
+    results, indexed by identifier and by address.
+    """
+
+    def __init__(self, events: list[TxEvent]) -> None:
+        self.events = events
+        self.by_identifier = {}
+        self.by_address = {}
+        self.system_contract_addresses = []
+
+        for event in events:
+            self.by_identifier.setdefault(event.identifier, []).append(event)
+            self.by_address.setdefault(event.address, []).append(event)
+            for address in event.topic_addresses:
+                if address != event.address:
+                    self.by_address.setdefault(address, []).append(event)
+            # new system contracts, e.g. delegation contracts, only show up as
+            # raw topics; the prefix is specific enough to scan every topic
+            for topic in event.topics:
+                if len(topic) != 32 or not topic.startswith(_SYSTEM_SC_PREFIX_BYTES):
+                    continue
+                address = _decode_address(topic)
+                if (
+                    address not in KNOWN_SYSTEM_CONTRACTS
+                    and address not in self.system_contract_addresses
+                ):
+                    self.system_contract_addresses.append(address)
+
+    def first(self, *identifiers: str) -> TxEvent:
+        """
+        Returns the first event of the first identifier, in the given order, that
+        has events; None if none has.
+        """
+        for identifier in identifiers:
+            events = self.by_identifier.get(identifier)
+            if events:
+                return events[0]
+        return None
+
+    def get(self, identifier: str) -> list[TxEvent]:
+        return self.by_identifier.get(identifier, [])
+
+    def for_address(self, address: str) -> list[TxEvent]:
+        """Events emitted by the address or having it in a declared address topic."""
+        return self.by_address.get(address, [])
+
+    def mentioning(self, address: str) -> list[TxEvent]:
+        """
+        Events emitted by the address or having its public key as any topic,
+        for events whose topics have no registered decoder.
+        """
+        pubkey = Address.from_bech32(address).get_public_key()
+        return [
+            event
+            for event in self.events
+            if event.address == address or pubkey in event.topics
+        ]
+
+
+def decode_event(event: dict, source: str) -> TxEvent:
+    topics = [base64.b64decode(topic or "") for topic in event.get("topics") or []]
+    data = base64.b64decode(event.get("data") or "")
+    identifier = event.get("identifier", "")
+
+    fields = {}
+    for (name, kind), raw in zip(_event_decoders.get(identifier, []), topics):
+        fields[name] = _topic_converters[kind](raw)
+
+    # only topics declared as addresses, 32-byte amounts or hashes are not
+    topic_addresses = [
+        fields[name]
+        for name, kind in _event_decoders.get(identifier, [])
+        if kind == "address" and fields.get(name) is not None
+    ]
+    return TxEvent(
+        identifier=identifier,
+        address=event.get("address", ""),
+        topics=topics,
+        data=data,
+        source=source,
+        fields=fields,
+        topic_addresses=topic_addresses,
+    )
+
+
+def index_transaction_events(transaction: dict) -> TxEventIndex:
+    """
+    Builds the event index for a transaction as returned by /transaction/{hash}?withResults=true.
+
+    Events of the transaction itself come first, followed by the events of each
+    smart contract result in the order they are listed.
+
+    Args:
+        transaction (dict): The "transaction" object of the response.
+
+    Returns:
+        TxEventIndex: The decoded and indexed events.
+    """
+    events = [
+        decode_event(event, "logs")
+        for event in (transaction.get("logs") or {}).get("events") or []
+    ]
+    for scr in transaction.get("smartContractResults") or []:
+        source = scr.get("hash", "smartContractResult")
+        events.extend(
+            decode_event(event, source)
+            for event in (scr.get("logs") or {}).get("events") or []
+        )
+    return TxEventIndex(events)
+
+
+_ISSUE_FIELDS = [
+    ("token_identifier", "string"),
+    ("token_name", "string"),
+    ("token_ticker", "string"),
+    ("token_type", "string"),
+]
+_TRANSFER_FIELDS = [
+    ("token_identifier", "string"),
+    ("token_nonce", "bigint"),
+    ("amount", "bigint"),
+    ("receiver", "address"),
+]
+
+for _identifier in (
+    "issue",
+    "issueNonFungible",
+    "issueSemiFungible",
+    "registerMetaESDT",
+):
+    register_event_decoder(_identifier, _ISSUE_FIELDS)
+for _identifier in ("ESDTTransfer", "ESDTNFTTransfer"):
+    register_event_decoder(_identifier, _TRANSFER_FIELDS)
+register_event_decoder(
+    "ESDTNFTCreate",
+    [
+        ("token_identifier", "string"),
+        ("token_nonce", "bigint"),
+        ("quantity", "bigint"),
+        ("attributes", "hex"),
+    ],
+)
+for _identifier in (
+    "ESDTNFTBurn",
+    "ESDTNFTAddQuantity",
+    "ESDTLocalBurn",
+    "ESDTLocalMint",
+):
+    register_event_decoder(
+        _identifier,
+        [
+            ("token_identifier", "string"),
+            ("token_nonce", "bigint"),
+            ("quantity", "bigint"),
+        ],
+    )
+for _identifier in ("delegate", "unDelegate", "withdraw", "claimRewards"):
+    register_event_decoder(_identifier, [("amount", "bigint")])
+register_event_decoder("signalError", [("address", "address"), ("message", "string")])
+register_event_decoder(
+    "internalVMErrors", [("address", "address"), ("function", "string")]
+)